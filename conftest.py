@@ -3,19 +3,34 @@ Global pytest configuration and fixtures
 """
 import pytest
 import json
+import logging
 import os
+import re
 import shutil
 import subprocess
+import threading
 import time
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
 import requests
+from urllib3.util.retry import Retry
+from exchange_recorder import DEFAULT_CAPACITY, ExchangeRecorder
+from http_cassette import CASSETTE_MODES, Cassette, CassetteAdapter
+import duration_scheduler
+import impact_map
+import ndjson_report
+import request_timing
+import server_metrics
 from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Tuple
 
 # Project root directory
 PROJECT_ROOT = Path(__file__).parent
 MOCK_SERVER_DIR = PROJECT_ROOT / "mock_server"
 FIXTURES_DIR = PROJECT_ROOT / "tests" / "fixtures"
 REPORTS_DIR = PROJECT_ROOT / "reports"
+CASSETTES_DIR = PROJECT_ROOT / "tests" / "cassettes"
 
 # API configuration
 # Docker 환경에서는 qa-server:3000 사용
@@ -32,83 +47,359 @@ else:
     else:
         API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:3000")
 
+# pytest-xdist worker id ("gw0", "gw1", ...) or "master" for a serial run
+WORKER_ID = os.getenv("PYTEST_XDIST_WORKER", "master")
+DB_FILE_NAME = "db.json" if WORKER_ID == "master" else f"db.{WORKER_ID}.json"
+
+# Worker isolation: "process" starts one mock server per xdist worker,
+# "namespace" shares one running server and separates workers by namespace
+MOCK_SERVER_ISOLATION = os.getenv("MOCK_SERVER_ISOLATION", "process")
+SHARED_SERVER = (os.getenv("SKIP_SERVER_STARTUP") == "true"
+                 or MOCK_SERVER_ISOLATION == "namespace")
+
+# Persistent warm daemon (see mock_server_ctl.py): a running daemon is
+# always reused; MOCK_SERVER_DAEMON=1 starts one if none is running
+MOCK_SERVER_DAEMON = os.getenv("MOCK_SERVER_DAEMON") == "1"
+
+# Namespace header understood by mock_server/namespaces.js
+NAMESPACE_HEADER = "X-Test-Namespace"
+TEST_NAMESPACE = os.getenv("TEST_NAMESPACE") or (
+    WORKER_ID if WORKER_ID != "master" and SHARED_SERVER else ""
+)
+
+# HTTP client settings: (connect, read) timeouts and keep-alive pool size
+HTTP_TIMEOUT = (3.05, 10)
+HTTP_POOL_SIZE = 16
+
+class TimeoutHTTPAdapter(request_timing.TimingHTTPAdapter):
+    """HTTPAdapter that applies a default timeout to every request (and times it)"""
+    
+    def __init__(self, *args, timeout=HTTP_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+    
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+def create_http_adapter() -> TimeoutHTTPAdapter:
+    """Create a pooled keep-alive adapter with default timeouts"""
+    # Only retry failed connects (e.g. a stale keep-alive socket), never
+    # requests that may have reached the server
+    retries = Retry(total=2, connect=2, read=False, redirect=0, status=0)
+    return TimeoutHTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=retries
+    )
+
+def is_server_running(base_url: str, timeout: float = 1) -> bool:
+    """Check whether a mock server answers on the given base URL"""
+    # Try /config first, fallback to /users endpoint
+    for endpoint in ("config", "users"):
+        try:
+            response = requests.get(f"{base_url}/{endpoint}", timeout=timeout)
+            if response.status_code == 200:
+                return True
+        except requests.exceptions.RequestException:
+            pass
+    return False
+
+# Line server.js prints once it is listening
+SERVER_READY_PATTERN = re.compile(r"JSON Server is running on port (\d+)")
+SERVER_START_TIMEOUT = 30
+SERVER_LOG_MAX_BYTES = 5 * 1024 * 1024
+
+def drain_server_output(stream, log_path: Path, on_ready) -> threading.Thread:
+    """
+    Continuously drain the server's output into a rotating log file
+    
+    Keeps the pipe from filling up (which would block the server) and
+    reports the listening port as soon as the ready line appears.
+    
+    Args:
+        stream: Text stream of the server's combined stdout/stderr
+        log_path: Log file (rotated at SERVER_LOG_MAX_BYTES)
+        on_ready: Called with the port from the ready line
+        
+    Returns:
+        The started daemon thread
+    """
+    logger = logging.getLogger(f"mock_server.{log_path.stem}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False  # Keep server logs out of the pytest live log
+    handler = RotatingFileHandler(log_path, maxBytes=SERVER_LOG_MAX_BYTES,
+                                  backupCount=3, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(handler)
+    
+    def pump():
+        try:
+            for line in iter(stream.readline, ""):
+                line = line.rstrip()
+                logger.info(line)
+                match = SERVER_READY_PATTERN.search(line)
+                if match:
+                    on_ready(match.group(1))
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+    
+    thread = threading.Thread(target=pump, name=f"drain-{log_path.stem}", daemon=True)
+    thread.start()
+    return thread
+
+def start_mock_server(port_file: Path, env: Dict[str, str] = None,
+                      log_path: Path = None,
+                      timeout: float = SERVER_START_TIMEOUT) -> Tuple[subprocess.Popen, str]:
+    """
+    Start the mock server and wait until it answers requests
+    
+    Readiness is driven by the server's "running on port" log line (or its
+    port file), confirmed with short exponential-backoff probes.
+    
+    Args:
+        port_file: File the server writes its listening port to
+        env: Extra environment variables for the server process
+        log_path: File the server output is drained into
+        timeout: Seconds to wait for the server before giving up
+        
+    Returns:
+        Tuple of (server process, base URL)
+    """
+    # Remove a stale port file so we only trust the port of this process
+    if port_file.exists():
+        port_file.unlink()
+    log_path = log_path or REPORTS_DIR / "mock_server.log"
+    
+    process = subprocess.Popen(
+        ["npm", "start"],
+        cwd=MOCK_SERVER_DIR,
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="replace"
+    )
+    
+    announced = {}
+    ready = threading.Event()
+    
+    def on_ready(port):
+        announced["port"] = port
+        ready.set()
+    
+    drain_server_output(process.stdout, log_path, on_ready)
+    
+    # Wait for server to be ready
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(
+                f"JSON Server exited with code {process.returncode} (see {log_path})"
+            )
+        
+        port = announced.get("port") or (port_file.read_text().strip() if port_file.exists() else "")
+        if port:
+            base_url = f"http://localhost:{port}"
+            if is_server_running(base_url, timeout=0.5):
+                print(f"JSON Server is ready at {base_url}! (log: {log_path})")
+                return process, base_url
+        
+        # Sleep until the ready line arrives or the backoff delay elapses
+        ready.wait(delay)
+        ready.clear()
+        delay = min(delay * 2, 0.5)
+    
+    process.terminate()
+    raise RuntimeError(f"Failed to start JSON Server (see {log_path})")
+
+def discover_daemon() -> str:
+    """
+    Find (or start, with MOCK_SERVER_DAEMON=1) the warm mock server daemon
+    
+    Stale or outdated daemons are restarted by mock_server_ctl.
+    
+    Returns:
+        Base URL of the daemon, or None if no daemon is used
+    """
+    import mock_server_ctl
+    
+    try:
+        return mock_server_ctl.ensure_daemon(start=MOCK_SERVER_DAEMON)
+    except RuntimeError as e:
+        print(f"Mock server daemon unavailable: {e}")
+        return None
+
+def runs_offline(item) -> bool:
+    """Whether a test runs without the mock server (unit tests, offline UI tests with --ui-network=stub)"""
+    if item.get_closest_marker("unit") is not None:
+        return True
+    return (item.get_closest_marker("offline") is not None
+            and item.config.getoption("--ui-network") == "stub")
+
+@pytest.fixture
+def offline(request):
+    """True if the current test runs without the mock server"""
+    return runs_offline(request.node)
+
 @pytest.fixture(scope="session", autouse=True)
-def setup_test_environment():
-    """Setup test environment before all tests"""
+def setup_test_environment(request):
+    """Setup test environment before all tests, yields the mock server base URL"""
     print("\n=== Setting up test environment ===")
     
     # Create reports directory if not exists
     REPORTS_DIR.mkdir(exist_ok=True)
     
+    # Replayed tests are answered from cassettes, no server needed
+    if request.config.getoption("--cassette-mode") == "replay":
+        print("Replaying HTTP cassettes (no Mock Server)")
+        yield API_BASE_URL
+        return
+    
+    # Offline UI tests are served by the Playwright network stub
+    items = request.session.items
+    if items and all(runs_offline(item) for item in items):
+        print("All selected tests run offline (no Mock Server)")
+        yield API_BASE_URL
+        return
+    
     # Skip server startup if explicitly requested (Docker environment)
     if os.getenv('SKIP_SERVER_STARTUP') == 'true':
         print("Skipping server startup (Docker environment)")
-        yield
+        yield API_BASE_URL
         print("\n=== Test environment cleanup (Docker) ===")
         return
     
+    # Attach to the warm daemon instead of booting a server for this run;
+    # it is reset here and left running afterwards
+    daemon_url = None
+    if WORKER_ID == "master" or SHARED_SERVER:
+        daemon_url = discover_daemon()
+    if daemon_url:
+        print(f"Using Mock Server daemon at {daemon_url}"
+              + (f" (namespace: {TEST_NAMESPACE})" if TEST_NAMESPACE else ""))
+        # Page objects read the base URL from the environment
+        os.environ["API_BASE_URL"] = daemon_url
+        yield daemon_url
+        print("\n=== Test environment cleanup (daemon left running) ===")
+        return
+    
+    # Each pytest-xdist worker gets its own server, port and database file
+    # so parallel workers never see each other's registrations, unless
+    # workers are configured to share one running server by namespace
+    if WORKER_ID != "master" and not (SHARED_SERVER and is_server_running(API_BASE_URL)):
+        db_file = MOCK_SERVER_DIR / DB_FILE_NAME
+        port_file = MOCK_SERVER_DIR / f".port.{WORKER_ID}"
+        
+        print(f"Starting isolated JSON Server for worker {WORKER_ID}...")
+        process, base_url = start_mock_server(port_file, {
+            "PORT": "0",  # Let the OS pick a free port
+            "DB_FILE": db_file.name,
+            "PORT_FILE": port_file.name,
+        }, log_path=REPORTS_DIR / f"mock_server.{WORKER_ID}.log")
+        # Page objects read the base URL from the environment
+        os.environ["API_BASE_URL"] = base_url
+        
+        yield base_url
+        
+        print(f"\n=== Cleaning up test environment ({WORKER_ID}) ===")
+        process.terminate()
+        process.wait()
+        # (db.<worker>.json.log is the database with DB_STORAGE=log)
+        for path in (db_file, port_file, db_file.with_name(f"{db_file.name}.log")):
+            if path.exists():
+                path.unlink()
+        return
+    
     # Check if we're in Docker environment or server is already running
-    server_already_running = False
-    try:
-        response = requests.get(f"{API_BASE_URL}/config", timeout=1)
-        if response.status_code == 200:
-            server_already_running = True
-            print("Mock Server is already running!")
-    except:
-        pass
-    
-    if server_already_running:
+    if is_server_running(API_BASE_URL):
         # Server is already running (Docker or manually started)
-        print("Using existing Mock Server")
-        yield
+        print("Mock Server is already running!")
+        if TEST_NAMESPACE:
+            print(f"Using existing Mock Server (namespace: {TEST_NAMESPACE})")
+        else:
+            print("Using existing Mock Server")
+        yield API_BASE_URL
         print("\n=== Test environment cleanup (existing server) ===")
     else:
         # Start JSON Server locally
         print("Starting JSON Server...")
-        process = subprocess.Popen(
-            ["npm", "start"],
-            cwd=MOCK_SERVER_DIR,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
+        process, base_url = start_mock_server(MOCK_SERVER_DIR / ".port")
         
-        # Wait for server to be ready
-        max_retries = 30
-        for i in range(max_retries):
-            try:
-                # Try /config first, fallback to /users endpoint
-                try:
-                    response = requests.get(f"{API_BASE_URL}/config")
-                    if response.status_code == 200:
-                        print("JSON Server is ready! (config endpoint)")
-                        break
-                except:
-                    pass
-                
-                # Fallback to /users endpoint
-                response = requests.get(f"{API_BASE_URL}/users")
-                if response.status_code == 200:
-                    print("JSON Server is ready! (users endpoint)")
-                    break
-            except requests.exceptions.ConnectionError:
-                time.sleep(1)
-        else:
-            process.terminate()
-            raise RuntimeError("Failed to start JSON Server")
-        
-        yield
+        yield base_url
         
         # Cleanup
         print("\n=== Cleaning up test environment ===")
         process.terminate()
         process.wait()
 
+@pytest.fixture(scope="session")
+def api_base_url(setup_test_environment):
+    """Base URL of the mock server used by this session (or xdist worker)"""
+    return setup_test_environment
+
+@pytest.fixture(scope="session")
+def test_namespace():
+    """Mock server namespace of this worker (empty for the default database)"""
+    return TEST_NAMESPACE
+
+def reset_mock_server(base_url: str = None, namespace: str = TEST_NAMESPACE,
+                      session: requests.Session = None) -> bool:
+    """
+    Reset the mock server state through its admin endpoint
+    
+    Args:
+        base_url: Mock server base URL (defaults to API_BASE_URL)
+        namespace: Namespace to reset (default database if empty)
+        session: Session to send the request with (reuses its connections)
+        
+    Returns:
+        True if the server acknowledged the reset, False otherwise
+    """
+    headers = {NAMESPACE_HEADER: namespace} if namespace else {}
+    try:
+        response = (session or requests).post(f"{base_url or API_BASE_URL}/__admin/reset",
+                                              headers=headers, timeout=2)
+        return response.status_code == 200 and response.json().get("status") == "ok"
+    except (requests.exceptions.RequestException, ValueError):
+        return False
+
+@pytest.fixture(scope="session")
+def http_adapter():
+    """Session-wide connection pool shared by all HTTP clients"""
+    adapter = create_http_adapter()
+    yield adapter
+    adapter.close()
+
+@pytest.fixture(scope="session")
+def http_session(http_adapter):
+    """Session-wide client for fixture housekeeping (resets, cleanup)"""
+    session = requests.Session()
+    session.mount("http://", http_adapter)
+    session.mount("https://", http_adapter)
+    if TEST_NAMESPACE:
+        session.headers[NAMESPACE_HEADER] = TEST_NAMESPACE
+    return session
+
 @pytest.fixture(autouse=True)
-def reset_database():
-    """Reset database before each test"""
+def reset_database(request, api_base_url, http_session):
+    """
+    Reset database before each test
+
+    Yields True if the database was reset, False when there is no server to
+    reset (replay mode, offline tests)
+    """
+    if request.config.getoption("--cassette-mode") == "replay" or runs_offline(request.node):
+        yield False
+        return
+    
     # Always use paths relative to project structure
     backup_path = MOCK_SERVER_DIR / "db-backup.json"
-    db_path = MOCK_SERVER_DIR / "db.json"
+    db_path = MOCK_SERVER_DIR / DB_FILE_NAME
     
     # Create backup file if it doesn't exist
     if not backup_path.exists():
@@ -126,52 +417,285 @@ def reset_database():
         with open(backup_path, 'w', encoding='utf-8') as f:
             json.dump(default_db, f, indent=2)
     
-    # In Docker, these paths are also correct since we mount the entire app
-    shutil.copy(backup_path, db_path)
-    time.sleep(0.5)  # Wait for JSON Server to reload
+    # Fast path: ask the server to swap in its in-memory baseline and
+    # continue as soon as it acknowledges the reset
+    if not reset_mock_server(api_base_url, session=http_session):
+        # Fallback for servers without the admin endpoint
+        # In Docker, these paths are also correct since we mount the entire app
+        shutil.copy(backup_path, db_path)
+        time.sleep(0.5)  # Wait for JSON Server to reload
     
-    yield
+    yield True
     
     # Optional: Save test data for debugging failed tests
-    if hasattr(pytest, "test_failed") and pytest.test_failed:
+    if hasattr(pytest, "test_failed") and pytest.test_failed and db_path.exists():
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         debug_file = REPORTS_DIR / f"debug_db_{timestamp}.json"
         shutil.copy(db_path, debug_file)
 
+@pytest.fixture(autouse=True)
+def server_timing(request, reset_database, api_base_url, http_session):
+    """
+    --server-metrics: scrape the mock server's /metrics before and after
+    each test (after the database reset) and attach the server-side
+    latency the test caused, per route/outcome and per register stage
+    """
+    if (not request.config.getoption("--server-metrics")
+            or request.config.getoption("--cassette-mode") == "replay"
+            or runs_offline(request.node)):
+        yield
+        return
+    
+    before = server_metrics.scrape(api_base_url, TEST_NAMESPACE, session=http_session)
+    
+    yield
+    
+    after = server_metrics.scrape(api_base_url, TEST_NAMESPACE, session=http_session)
+    if before is None or after is None:
+        # Server without the metrics endpoint (an older daemon)
+        return
+    delta = server_metrics.delta(before, after)
+    request.node.user_properties.append(
+        ("server_seconds", round(server_metrics.total_seconds(delta), 6)))
+    server_metrics.attach(delta)
+
+@pytest.fixture
+def fault_profile(api_base_url, http_session):
+    """
+    Set the mock server's latency/fault profile for this test's namespace
+    (see mock_server/faults.js), cleared again after the test
+    
+    Usage:
+        fault_profile({"POST /api/register": {"delay": 300, "error_rate": 0.5}})
+    """
+    url = f"{api_base_url}/__admin/faults"
+    applied = []
+    
+    def apply(profile: Dict[str, Any]) -> Dict[str, Any]:
+        response = http_session.put(url, json=profile)
+        assert response.status_code == 200, f"Fault profile rejected: {response.text}"
+        applied.append(profile)
+        return response.json()
+    
+    yield apply
+    
+    if applied:
+        http_session.delete(url)
+
+@pytest.fixture
+def exchange_recorder(request):
+    """
+    Per-test ring buffer of HTTP exchanges, attached to Allure only when
+    the test fails (or always with --attach-exchanges=all)
+    """
+    recorder = ExchangeRecorder(request.config.getoption("--exchange-buffer"))
+    
+    yield recorder
+    
+    report = getattr(request.node, "rep_call", None)
+    failed = report is None or report.failed
+    if failed or request.config.getoption("--attach-exchanges") == "all":
+        recorder.attach()
+
+def cassette_path(item) -> Path:
+    """Cassette file of a test: tests/cassettes/<module path>/<test name>.json"""
+    module = Path(item.fspath).relative_to(PROJECT_ROOT / "tests").with_suffix("")
+    name = re.sub(r"[^\w.-]+", "_", item.name).strip("_")
+    if item.cls is not None:
+        name = f"{item.cls.__name__}.{name}"
+    return CASSETTES_DIR / module / f"{name}.json"
+
 @pytest.fixture
-def api_client():
-    """Provide configured requests session for API testing"""
+def http_cassette(request):
+    """
+    Per-test cassette for --cassette-mode record/replay/compare
+    
+    Yields None when cassettes are off.
+    """
+    mode = request.config.getoption("--cassette-mode")
+    if mode == "off":
+        yield None
+        return
+    
+    cassette = Cassette(cassette_path(request.node))
+    if mode != "record" and not cassette.load():
+        pytest.fail(f"No cassette at {cassette.path}, record it with --cassette-mode=record",
+                    pytrace=False)
+    
+    yield cassette
+    
+    if mode == "record":
+        cassette.save()
+    elif mode == "replay" and cassette.position < len(cassette.interactions):
+        report = getattr(request.node, "rep_call", None)
+        if report is not None and report.passed:
+            pytest.fail(f"{cassette.path.name}: only {cassette.position} of "
+                        f"{len(cassette.interactions)} recorded requests were made",
+                        pytrace=False)
+    elif mode == "compare":
+        if cassette.position < len(cassette.interactions):
+            cassette.divergences.append(
+                f"{cassette.path.name}: only {cassette.position} of "
+                f"{len(cassette.interactions)} recorded requests were made")
+        request.config._cassette_divergences.extend(cassette.divergences)
+
+@pytest.fixture
+def api_client(request, http_adapter, exchange_recorder, http_cassette):
+    """
+    Provide configured requests session for API testing
+    
+    Each test gets its own Session (headers, cookies) mounted on the
+    session-wide adapter, so connections stay warm across the whole run.
+    Responses are recorded by exchange_recorder, and go through the test's
+    cassette when --cassette-mode is set.
+    """
     session = requests.Session()
+    # --request-timing: first hook, so the body read is all that is added
+    timer = request_timing.get_timer(request.config)
+    if timer:
+        session.hooks["response"].append(timer.hook)
+    session.hooks["response"].append(exchange_recorder.hook)
+    adapter = http_adapter
+    if http_cassette is not None:
+        adapter = CassetteAdapter(http_cassette, request.config.getoption("--cassette-mode"),
+                                  http_adapter)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
     session.headers.update({
         "Content-Type": "application/json",
         "Accept": "application/json"
     })
+    # Keep this worker's data separate on a shared mock server
+    if TEST_NAMESPACE:
+        session.headers[NAMESPACE_HEADER] = TEST_NAMESPACE
+    # --impact=record: ask the server which validation branches ran
+    recorder = impact_map.get_recorder(request.config)
+    if recorder:
+        session.headers[impact_map.TRACE_HEADER] = "1"
+        session.hooks["response"].append(recorder.observe_response)
     return session
 
-@pytest.fixture
-def test_data():
-    """Load test data fixtures"""
-    fixtures = {}
-    fixtures_path = FIXTURES_DIR / "test_data.json"
+def freeze(value: Any) -> Any:
+    """Return a read-only view of parsed JSON (dicts -> mapping proxies, lists -> tuples)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def validate_test_data(data: Dict[str, Any], path: Path):
+    """
+    Validate the structure of a test data fixture file
     
-    if fixtures_path.exists():
-        with open(fixtures_path, 'r', encoding='utf-8') as f:
-            fixtures = json.load(f)
+    Raises:
+        ValueError: If a case family or case is malformed
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: top level must be an object")
+    for family, cases in data.items():
+        if not isinstance(cases, list):
+            raise ValueError(f"{path}: '{family}' must be a list of cases")
+        for index, case in enumerate(cases):
+            if not isinstance(case, dict):
+                raise ValueError(f"{path}: {family}[{index}] must be an object")
+            for field in ("email", "password"):
+                if not isinstance(case.get(field), str):
+                    raise ValueError(f"{path}: {family}[{index}].{field} must be a string")
+
+class FixtureCache:
+    """Parse-once cache of JSON fixture files, invalidated when a file changes"""
     
-    return fixtures
+    def __init__(self):
+        self._entries: Dict[Path, Tuple[Tuple[int, int], Mapping]] = {}
+    
+    def load(self, path: Path) -> Mapping:
+        """
+        Load, validate and freeze a fixture file, reusing the cached copy
+        while its mtime and size are unchanged
+        
+        Args:
+            path: JSON fixture file
+            
+        Returns:
+            Read-only view of the file contents (empty if the file is missing)
+        """
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._entries.pop(path, None)
+            return MappingProxyType({})
+        
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._entries.get(path)
+        if cached and cached[0] == version:
+            return cached[1]
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        validate_test_data(data, path)
+        
+        frozen = freeze(data)
+        self._entries[path] = (version, frozen)
+        return frozen
+
+FIXTURE_CACHE = FixtureCache()
+
+@pytest.fixture
+def test_data(request):
+    """Load test data fixtures (parsed once, shared as an immutable view)"""
+    data = FIXTURE_CACHE.load(FIXTURES_DIR / "test_data.json")
+    recorder = impact_map.get_recorder(request.config)
+    return recorder.track_cases(data) if recorder else data
 
 @pytest.fixture
-def api_endpoints():
+def api_endpoints(api_base_url):
     """API endpoints configuration"""
     return {
-        "register": f"{API_BASE_URL}/api/register",
-        "users": f"{API_BASE_URL}/users",
-        "config": f"{API_BASE_URL}/config",
+        "register": f"{api_base_url}/api/register",
+        "users": f"{api_base_url}/users",
+        "config": f"{api_base_url}/config",
     }
 
 # Pytest hooks for better reporting
+def pytest_addoption(parser):
+    """Register command line options"""
+    group = parser.getgroup("exchanges", "HTTP exchange recording")
+    group.addoption("--attach-exchanges", choices=["failed", "all"], default="failed",
+                    help="Attach recorded request/response exchanges to Allure for "
+                         "failed tests only (default) or for all tests")
+    group.addoption("--exchange-buffer", type=int, default=DEFAULT_CAPACITY,
+                    help=f"Exchanges kept per test (default {DEFAULT_CAPACITY})")
+    group = parser.getgroup("cassettes", "HTTP cassette record/replay")
+    group.addoption("--cassette-mode", choices=CASSETTE_MODES, default="off",
+                    help="record: save api_client exchanges to tests/cassettes, "
+                         "replay: answer from cassettes without a mock server, "
+                         "compare: report responses diverging from the cassettes")
+    group = parser.getgroup("metrics", "Mock server metrics")
+    group.addoption("--server-metrics", action="store_true", default=False,
+                    help="Attach the mock server's per-route and per-stage latency "
+                         "(/metrics delta) to each test")
+    group = parser.getgroup("ui", "Playwright UI suite")
+    group.addoption("--ui-contexts", choices=["fresh", "recycle"], default="fresh",
+                    help="fresh: new browser context per test (default), recycle: reuse "
+                         "warm contexts, resetting storage and the form DOM between tests")
+    group.addoption("--ui-context-pool", type=int, default=2,
+                    help="Warm contexts kept per worker with --ui-contexts=recycle (default 2)")
+    group.addoption("--ui-network", choices=["stub", "live"], default="live",
+                    help="live: run every UI test against the mock server (default), "
+                         "stub: serve tests marked offline through Playwright routing, "
+                         "e.g. for client-side-only CI runs")
+    duration_scheduler.add_options(parser)
+    impact_map.add_options(parser)
+    ndjson_report.add_options(parser)
+    request_timing.add_options(parser)
+
 def pytest_configure(config):
     """Configure pytest with custom settings"""
+    config._cassette_divergences = []
+    duration_scheduler.configure(config)
+    impact_map.configure(config)
+    ndjson_report.configure(config)
+    request_timing.configure(config)
     config._metadata = {
         "Project": "QA Automation - User Registration",
         "Test Framework": "pytest",
@@ -179,6 +703,29 @@ def pytest_configure(config):
         "UI Framework": "Playwright"
     }
 
+def pytest_collection_modifyitems(config, items):
+    """In replay mode, skip tests that talk to the server outside api_client"""
+    if config.getoption("--cassette-mode") != "replay":
+        return
+    skip = pytest.mark.skip(reason="needs a live mock server (not replayable)")
+    for item in items:
+        if "api_client" not in getattr(item, "fixturenames", ()) or item.get_closest_marker("live"):
+            item.add_marker(skip)
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report responses that diverged from the cassettes (compare mode)"""
+    divergences = config._cassette_divergences
+    if not divergences:
+        return
+    terminalreporter.section(f"cassette divergences ({len(divergences)})", red=True)
+    for divergence in divergences:
+        terminalreporter.line(divergence)
+
+def pytest_sessionfinish(session, exitstatus):
+    """Fail a compare run whose responses diverged from the cassettes"""
+    if session.config._cassette_divergences and exitstatus == 0:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
 # def pytest_html_report_title(report):
 #     """Set HTML report title"""
 #     report.title = "QA Automation Test Report"
@@ -188,6 +735,8 @@ def pytest_runtest_makereport(item, call):
     """Mark test as failed for fixture cleanup"""
     outcome = yield
     rep = outcome.get_result()
+    # Make the phase reports available to fixtures (e.g. exchange_recorder)
+    setattr(item, "rep_" + rep.when, rep)
     
     if rep.when == "call" and rep.failed:
         pytest.test_failed = True
@@ -0,0 +1,151 @@
+"""
+Test duration history
+테스트별 실행 시간 기록(최근 N회)을 보관하고, 이를 바탕으로 테스트를 워커에 분배
+
+Durations are kept per pytest nodeid as the last WINDOW samples, from
+which a rolling mean and p90 are derived. lpt_schedule() assigns tests to
+workers longest-processing-time first using those estimates.
+
+Usage:
+    python3 duration_history.py                            # slowest tests (mean / p90)
+    python3 duration_history.py --import test_results.json # seed from pytest-json-report
+"""
+import argparse
+import json
+import math
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+PROJECT_ROOT = Path(__file__).parent
+DEFAULT_HISTORY_PATH = PROJECT_ROOT / "reports" / "durations.json"
+
+# Samples kept per test
+WINDOW = 20
+# Estimate for tests without history, when no other test has any either
+DEFAULT_DURATION = 1.0
+
+T = TypeVar("T")
+
+
+class DurationHistory:
+    """Persistent per-test duration samples keyed by nodeid"""
+
+    def __init__(self, path: Path = DEFAULT_HISTORY_PATH, window: int = WINDOW):
+        self.path = Path(path)
+        self.window = window
+        self.samples: Dict[str, List[float]] = {}
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # A corrupt history only costs scheduling quality
+            return
+        self.samples = {nodeid: [float(value) for value in values][-self.window:]
+                        for nodeid, values in data.get("samples", {}).items()}
+
+    def save(self):
+        """Write the history atomically (safe with concurrent readers)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump({"window": self.window, "samples": self.samples}, f, separators=(",", ":"))
+        os.replace(temp, self.path)
+
+    def record(self, nodeid: str, seconds: float):
+        values = self.samples.setdefault(nodeid, [])
+        values.append(round(seconds, 4))
+        del values[:-self.window]
+
+    def import_json_report(self, path: Path) -> int:
+        """Add the test durations of a pytest-json-report file, returns the count"""
+        with open(path, 'r', encoding='utf-8') as f:
+            tests = json.load(f).get("tests", [])
+        for test in tests:
+            self.record(test["nodeid"], sum((test.get(phase) or {}).get("duration", 0)
+                                            for phase in ("setup", "call", "teardown")))
+        return len(tests)
+
+    def mean(self, nodeid: str) -> Optional[float]:
+        values = self.samples.get(nodeid)
+        return sum(values) / len(values) if values else None
+
+    def p90(self, nodeid: str) -> Optional[float]:
+        values = sorted(self.samples.get(nodeid) or ())
+        if not values:
+            return None
+        return values[max(0, math.ceil(0.9 * len(values)) - 1)]
+
+    def default(self) -> float:
+        """Estimate for unknown tests: median of the known means"""
+        means = sorted(sum(values) / len(values) for values in self.samples.values() if values)
+        return means[len(means) // 2] if means else DEFAULT_DURATION
+
+    def estimator(self) -> Callable[[str], float]:
+        """Return nodeid -> expected seconds (mean, or the default for new tests)"""
+        fallback = self.default()
+
+        def estimate(nodeid: str) -> float:
+            mean = self.mean(nodeid)
+            return fallback if mean is None else mean
+        return estimate
+
+
+def lpt_schedule(items: Iterable[T], workers: int,
+                 estimate: Callable[[T], float]) -> Tuple[List[List[T]], List[float]]:
+    """
+    Longest-processing-time-first assignment of items to workers
+
+    Args:
+        items: Work items (e.g. nodeids)
+        workers: Number of workers
+        estimate: Expected duration of an item
+
+    Returns:
+        Tuple of (items per worker, predicted load per worker); each
+        worker's items are ordered longest first
+    """
+    shards: List[List[T]] = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for item, cost in sorted(((item, estimate(item)) for item in items),
+                             key=lambda pair: pair[1], reverse=True):
+        worker = min(range(workers), key=loads.__getitem__)
+        shards[worker].append(item)
+        loads[worker] += cost
+    return shards, loads
+
+
+def makespan(loads: Sequence[float]) -> float:
+    return max(loads) if loads else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or seed the per-test duration history")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY_PATH,
+                        help=f"History file (default {DEFAULT_HISTORY_PATH})")
+    parser.add_argument("--import", dest="report", type=Path, metavar="JSON_REPORT",
+                        help="Add durations from a pytest-json-report file")
+    parser.add_argument("--top", type=int, default=20, help="Slowest tests to list")
+    args = parser.parse_args()
+
+    history = DurationHistory(args.history)
+    if args.report:
+        count = history.import_json_report(args.report)
+        history.save()
+        print(f"Imported {count} test durations into {args.history}")
+        return
+
+    slowest = sorted(history.samples, key=history.mean, reverse=True)[:args.top]
+    for nodeid in slowest:
+        print(f"{history.mean(nodeid):8.2f}s  p90 {history.p90(nodeid):8.2f}s  "
+              f"n={len(history.samples[nodeid]):<3} {nodeid}")
+    print(f"{len(history.samples)} tests in {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Duration-history-aware test scheduling
+테스트별 실행 시간 기록으로 xdist 워커에 긴 테스트부터 분배하는 pytest 플러그인
+
+Every run adds each test's setup + call + teardown time to the duration
+history (duration_history.py). Under pytest-xdist (--dist load, the
+default for -n) tests are then handed out longest first to whichever
+worker frees up next. That way slow UI and duplicate tests start early
+instead of piling up on one worker at the end. The terminal summary
+prints the predicted and actual makespan of the run.
+
+LPTScheduling drives LoadScheduling internals, so it is only used with
+pytest-xdist versions in SUPPORTED_XDIST that still have them; otherwise
+the run says so and falls back to the plain load scheduler.
+"""
+import re
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+import pytest
+
+from duration_history import DEFAULT_HISTORY_PATH, DurationHistory, lpt_schedule, makespan
+
+try:
+    import xdist
+    from xdist.scheduler import LoadScheduling
+except ImportError:  # pytest-xdist is optional
+    xdist = LoadScheduling = None
+
+# pytest-xdist versions (min inclusive, max exclusive) whose LoadScheduling
+# internals LPTScheduling relies on
+SUPPORTED_XDIST = ((3, 0), (4, 0))
+XDIST_INTERNALS = ("_check_nodes_have_same_collection", "_send_tests", "node2pending",
+                   "node2collection", "pending", "collection", "maxschedchunk")
+
+# Tests kept in flight per worker: the worker needs the next item before it
+# can finish the current one (fixture teardown depends on it)
+PREFETCH = 2
+
+
+def add_options(parser):
+    group = parser.getgroup("durations", "Duration history and scheduling")
+    group.addoption("--duration-history", default=str(DEFAULT_HISTORY_PATH),
+                    help=f"Per-test duration history file (default {DEFAULT_HISTORY_PATH})")
+    group.addoption("--duration-schedule", choices=["lpt", "off"], default="lpt",
+                    help="lpt: hand tests to xdist workers longest first (default), "
+                         "off: use the xdist load scheduler as is")
+    group.addoption("--no-duration-record", action="store_true",
+                    help="Do not add this run's durations to the history")
+
+
+if LoadScheduling is not None:
+    class LPTScheduling(LoadScheduling):
+        """
+        xdist load scheduling in longest-processing-time-first order
+
+        Pending tests are sorted by expected duration once the collection is
+        known, and each worker is topped up to PREFETCH tests from the head
+        of that list as it completes tests.
+        """
+
+        def __init__(self, config, log=None, estimate: Callable[[str], float] = None,
+                     on_plan: Callable[[List[str], int], None] = None):
+            super().__init__(config, log)
+            self.estimate = estimate
+            self.on_plan = on_plan
+
+        def schedule(self):
+            assert self.collection_is_completed
+            if self.collection is not None:
+                for node in self.nodes:
+                    self.check_schedule(node)
+                return
+
+            if not self._check_nodes_have_same_collection():
+                self.log("**Different tests collected, aborting run**")
+                return
+
+            self.collection = next(iter(self.node2collection.values()))
+            estimates = [self.estimate(nodeid) for nodeid in self.collection]
+            self.pending[:] = sorted(range(len(self.collection)),
+                                     key=estimates.__getitem__, reverse=True)
+            if self.on_plan:
+                self.on_plan(list(self.collection), len(self.nodes))
+            if not self.collection:
+                return
+
+            # Deal the longest tests round-robin so every worker starts on one
+            for _ in range(PREFETCH):
+                for node in self.nodes:
+                    self._send_tests(node, 1)
+            if not self.pending:
+                for node in self.nodes:
+                    node.shutdown()
+
+        def check_schedule(self, node, duration: float = 0):
+            if node.shutting_down:
+                return
+            if self.pending:
+                node_pending = len(self.node2pending[node])
+                missing = PREFETCH - node_pending
+                if missing > 0:
+                    # --maxschedchunk caps each send, but like LoadScheduling
+                    # keep at least 2 tests pending on the worker
+                    chunk = max(2 - node_pending, self.maxschedchunk or missing)
+                    self._send_tests(node, min(missing, chunk))
+            else:
+                node.shutdown()
+            self.log("num items waiting for node:", len(self.pending))
+
+
+class DurationScheduler:
+    """Records durations and schedules xdist workers from the history"""
+
+    def __init__(self, config):
+        self.config = config
+        self.history = DurationHistory(config.getoption("--duration-history"))
+        self.estimate = self.history.estimator()
+        self.record = not config.getoption("--no-duration-record")
+        self.predicted: Optional[float] = None
+        self.workers = 1
+        self.unknown = 0
+        # nodeid -> seconds of this run, worker -> summed seconds
+        self.durations: Dict[str, float] = defaultdict(float)
+        self.loads: Dict[str, float] = defaultdict(float)
+        self.started = time.perf_counter()
+        # Why LPT scheduling could not be used with the installed xdist
+        self.unsupported: Optional[str] = None
+
+    def plan(self, nodeids: List[str], workers: int):
+        """Remember the predicted makespan of an LPT assignment"""
+        self.workers = max(workers, 1)
+        _, loads = lpt_schedule(nodeids, self.workers, self.estimate)
+        self.predicted = makespan(loads)
+        self.unknown = sum(nodeid not in self.history.samples for nodeid in nodeids)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        if config.getoption("--duration-schedule") != "lpt" or config.getvalue("dist") != "load":
+            return None
+        scheduler = LPTScheduling(config, log, estimate=self.estimate, on_plan=self.plan)
+        self.unsupported = unsupported_xdist(scheduler)
+        if self.unsupported:
+            # Returning None makes xdist use its own LoadScheduling
+            config.pluginmanager.get_plugin("terminalreporter").write_line(
+                f"duration schedule: {self.unsupported}, using the xdist load scheduler",
+                yellow=True)
+            return None
+        return scheduler
+
+    def pytest_collection_finish(self, session):
+        # Serial run (xdist workers and the controller plan in the scheduler)
+        if self.predicted is None and not self.is_distributed():
+            self.plan([item.nodeid for item in session.items], 1)
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] += report.duration
+        node = getattr(report, "node", None)
+        self.loads[node.gateway.id if node else "master"] += report.duration
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.durations:
+            return
+        actual = makespan(list(self.loads.values()))
+        wall = time.perf_counter() - self.started
+        predicted = "n/a" if self.predicted is None else f"{self.predicted:.1f}s"
+        terminalreporter.section("duration schedule")
+        terminalreporter.line(
+            f"{len(self.durations)} tests on {max(self.workers, len(self.loads))} worker(s): "
+            f"predicted makespan {predicted}, actual {actual:.1f}s "
+            f"(wall {wall:.1f}s)"
+            + (f", {self.unknown} without history" if self.unknown else "")
+        )
+        if len(self.loads) > 1:
+            terminalreporter.line("  " + "  ".join(
+                f"{worker}={load:.1f}s" for worker, load in sorted(self.loads.items())))
+        if self.unsupported:
+            terminalreporter.line(f"  LPT scheduling disabled: {self.unsupported}", yellow=True)
+
+    def pytest_sessionfinish(self, session):
+        if not self.record or not self.durations:
+            return
+        for nodeid, seconds in self.durations.items():
+            self.history.record(nodeid, seconds)
+        self.history.save()
+
+    def is_distributed(self) -> bool:
+        return self.config.pluginmanager.hasplugin("dsession")
+
+
+def unsupported_xdist(scheduler) -> Optional[str]:
+    """Why LPTScheduling cannot drive the installed pytest-xdist, or None"""
+    version = tuple(int(part) for part in re.findall(r"\d+", xdist.__version__)[:2])
+    low, high = SUPPORTED_XDIST
+    if not low <= version < high:
+        return (f"pytest-xdist {xdist.__version__} is not supported "
+                f"(>={'.'.join(map(str, low))},<{'.'.join(map(str, high))})")
+    missing = [name for name in XDIST_INTERNALS if not hasattr(scheduler, name)]
+    if missing:
+        return f"pytest-xdist {xdist.__version__} has no LoadScheduling.{', '.join(missing)}"
+    return None
+
+
+def configure(config):
+    """Register the scheduler on the controller (or a serial run)"""
+    if hasattr(config, "workerinput"):
+        return
+    config.pluginmanager.register(DurationScheduler(config), "duration_scheduler")
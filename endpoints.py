@@ -0,0 +1,18 @@
+"""
+Endpoint keys
+요청 method/URL 을 "POST /api/register" 형태의 엔드포인트 키로 정규화
+
+Ids in the path (numbers, uuids) become ":id", so requests to /users/1
+and /users/2 are aggregated as "GET /users/:id".
+"""
+import re
+from urllib.parse import urlsplit
+
+ID_SEGMENT = re.compile(r"^(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$")
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """"POST /api/register" style key with ids replaced by ":id\""""
+    path = urlsplit(url).path or "/"
+    segments = [":id" if ID_SEGMENT.match(part) else part for part in path.split("/")]
+    return f"{method.upper()} {'/'.join(segments)}"
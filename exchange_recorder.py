@@ -0,0 +1,117 @@
+"""
+HTTP exchange recorder
+테스트별 최근 Request/Response를 메모리 링 버퍼에 보관하고 실패 시에만 직렬화
+
+Recording only keeps references to what requests already produced (request
+body bytes, response content bytes), so passing tests pay no JSON
+formatting or report I/O. Exchanges are formatted and attached to Allure
+(or rendered as text) only when a test fails or when asked to.
+"""
+import json
+from collections import deque
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import requests
+
+try:
+    import allure
+except ImportError:
+    allure = None
+
+DEFAULT_CAPACITY = 20
+
+
+class Exchange(NamedTuple):
+    """One request/response pair, kept in raw form"""
+    method: str
+    url: str
+    request_body: Optional[bytes]
+    status: int
+    response_body: bytes
+    elapsed: float
+
+
+def format_body(body) -> str:
+    """Pretty-print a JSON body, falling back to the raw text"""
+    if not body:
+        return ""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.dumps(json.loads(body), indent=2, ensure_ascii=False)
+    except ValueError:
+        return body
+
+
+class ExchangeRecorder:
+    """Ring buffer of the last N HTTP exchanges of one test"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.exchanges = deque(maxlen=capacity)
+        self.total = 0
+
+    def __len__(self) -> int:
+        return len(self.exchanges)
+
+    def __iter__(self) -> Iterator[Exchange]:
+        return iter(self.exchanges)
+
+    def record(self, response: requests.Response) -> requests.Response:
+        """Store a response and its request without serializing anything"""
+        request = response.request
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.exchanges.append(Exchange(
+            request.method,
+            request.url,
+            body,
+            response.status_code,
+            response.content,
+            response.elapsed.total_seconds()
+        ))
+        self.total += 1
+        return response
+
+    def hook(self, response: requests.Response, *args, **kwargs) -> requests.Response:
+        """requests response hook: session.hooks["response"].append(recorder.hook)"""
+        return self.record(response)
+
+    def clear(self):
+        self.exchanges.clear()
+        self.total = 0
+
+    def render(self) -> List[Tuple[str, str]]:
+        """
+        Format the buffered exchanges
+
+        Returns:
+            List of (title, text) pairs, one per exchange
+        """
+        rendered = []
+        first = self.total - len(self.exchanges) + 1
+        for number, exchange in enumerate(self.exchanges, start=first):
+            title = f"#{number} {exchange.method} {exchange.url} -> {exchange.status}"
+            text = "\n".join([
+                f"{exchange.method} {exchange.url}",
+                format_body(exchange.request_body),
+                "",
+                f"Status: {exchange.status} ({exchange.elapsed * 1000:.1f} ms)",
+                format_body(exchange.response_body),
+            ])
+            rendered.append((title, text))
+        return rendered
+
+    def attach(self) -> int:
+        """
+        Attach the buffered exchanges to the current Allure test
+
+        Returns:
+            Number of attachments written (0 without allure)
+        """
+        if allure is None:
+            return 0
+        rendered = self.render()
+        for title, text in rendered:
+            allure.attach(text, name=title, attachment_type=allure.attachment_type.TEXT)
+        return len(rendered)
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Differential fuzzer for /api/register
+Faker 기반 시드 입력을 문법 기반으로 변형해 /api/register 에 동시 전송하고,
+validation_oracle 의 예상 결과(status/code/message)와 다른 응답을 찾아 중복 제거/최소화하는 스크립트
+
+Every case is derived from --seed and its index, so a run (and each
+divergence it reports) can be reproduced. Emails carry a per-case token
+so concurrent cases never collide; cases using fixed literal emails (the
+BUG_* patterns) are sent one at a time so the duplicate model stays exact.
+
+Divergences are grouped by their (expected, actual) outcome pair; the
+first input of each group is shrunk character by character in a separate
+namespace that is reset before every probe.
+
+Usage:
+    python3 fuzz_register.py --duration 60 --concurrency 32 --seed 42
+    python3 fuzz_register.py --rate 500 --duration 600 --output reports/fuzz.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import aiohttp
+from faker import Faker
+
+from validation_oracle import (
+    DUPLICATE_BUG_EMAIL, JS_WHITESPACE, NO_BUGS, NO_LOWERCASE_BUG_PASSWORD,
+    XSS_BUG_EMAIL, Expectation, RegistrationOracle, js_string, js_trim
+)
+
+# Try to import colorama for colored output, fallback to no colors
+try:
+    from colorama import Fore, Style, init
+    init(autoreset=True)
+except ImportError:
+    class Fore:
+        CYAN = YELLOW = GREEN = MAGENTA = BLUE = RED = ""
+        RESET = ""
+    class Style:
+        RESET_ALL = ""
+
+REGISTER_PATH = "/api/register"
+NAMESPACE_HEADER = "X-Test-Namespace"
+
+# Fragments the grammar splices into emails and passwords
+INJECTIONS = ["'", "--", ";", "' OR '1'='1", "\"; DROP TABLE users; --"]
+MARKUP = ["<script>", "</script>", "<", ">", "script", "<img src=x onerror=alert(1)>"]
+TRAVERSALS = ["../", "..\\", "../../etc/passwd", "..%2f"]
+UNICODE = ["ü", "é", "한글", "日本", "😀", "\u200b", "İ"]
+# JS whitespace plus characters Python treats as whitespace but JS does not
+WHITESPACE = list(JS_WHITESPACE) + ["\x1c", "\x1d", "\x1e", "\x1f", "\x85"]
+NON_STRINGS = [None, 0, 1, 12345678, True, False, [], {}, ["a@b.co"], {"email": "a@b.co"}]
+SPECIALS = "@$!%*?&#"
+
+
+class Payload(NamedTuple):
+    email: Any
+    password: Any
+
+
+class Case(NamedTuple):
+    """One fuzz case: payloads sent in order, and the mutations that built it"""
+    index: int
+    payloads: Tuple[Payload, ...]
+    mutations: Tuple[str, ...]
+    literal: bool  # Email may be shared with other cases (sent one at a time)
+
+
+class CaseGenerator:
+    """Seeded grammar-based payload generator"""
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.fake = Faker()
+
+    def insert(self, rng: random.Random, text: str, fragment: str) -> str:
+        position = rng.randint(0, len(text))
+        return text[:position] + fragment + text[position:]
+
+    def base_email(self, fake: Faker, index: int) -> str:
+        local = fake.user_name()
+        # The case index keeps emails unique across concurrent cases
+        return f"{local}.{index}@{fake.free_email_domain()}"
+
+    def base_password(self, fake: Faker, rng: random.Random) -> str:
+        password = fake.password(length=rng.randint(8, 24))
+        # Faker's specials differ from the middleware's, add one half the time
+        if rng.random() < 0.5:
+            password = self.insert(rng, password, rng.choice(SPECIALS))
+        return password
+
+    def mutate_email(self, rng: random.Random, email: str) -> Tuple[Any, str]:
+        """Apply one email mutation, returns (email, mutation name)"""
+        local, _, domain = email.partition("@")
+        name = rng.choice([
+            "no_at", "empty_local", "empty_domain", "no_dot_domain", "double_at",
+            "pad_whitespace", "inner_whitespace", "injection", "markup", "traversal",
+            "case", "unicode", "trailing_newline", "long", "literal", "non_string",
+        ])
+        if name == "no_at":
+            email = local + domain
+        elif name == "empty_local":
+            email = "@" + domain
+        elif name == "empty_domain":
+            email = local + "@"
+        elif name == "no_dot_domain":
+            email = f"{local}@{domain.replace('.', '')}"
+        elif name == "double_at":
+            email = self.insert(rng, email, "@")
+        elif name == "pad_whitespace":
+            email = rng.choice(WHITESPACE) + email + rng.choice(WHITESPACE)
+        elif name == "inner_whitespace":
+            email = self.insert(rng, email, rng.choice(WHITESPACE))
+        elif name == "injection":
+            email = self.insert(rng, email, rng.choice(INJECTIONS))
+        elif name == "markup":
+            email = self.insert(rng, email, rng.choice(MARKUP))
+        elif name == "traversal":
+            email = rng.choice(TRAVERSALS) + email if rng.random() < 0.5 \
+                else self.insert(rng, email, rng.choice(TRAVERSALS))
+        elif name == "case":
+            email = email.upper() if rng.random() < 0.5 else email.swapcase()
+        elif name == "unicode":
+            email = self.insert(rng, email, rng.choice(UNICODE))
+        elif name == "trailing_newline":
+            email = email + "\n"
+        elif name == "long":
+            email = f"{local * rng.randint(10, 40)}@{domain}"
+        elif name == "literal":
+            email = rng.choice([XSS_BUG_EMAIL, DUPLICATE_BUG_EMAIL, XSS_BUG_EMAIL.upper()])
+        elif name == "non_string":
+            email = rng.choice(NON_STRINGS)
+        return email, name
+
+    def mutate_password(self, rng: random.Random, password: str) -> Tuple[Any, str]:
+        """Apply one password mutation, returns (password, mutation name)"""
+        name = rng.choice([
+            "truncate", "drop_upper", "drop_lower", "drop_digit", "drop_special",
+            "long", "unicode", "whitespace", "injection", "literal", "non_string",
+        ])
+        if name == "truncate":
+            password = password[:rng.randint(0, 9)]
+        elif name == "drop_upper":
+            password = "".join(c for c in password if not c.isupper())
+        elif name == "drop_lower":
+            password = "".join(c for c in password if not c.islower())
+        elif name == "drop_digit":
+            password = "".join(c for c in password if not c.isdigit())
+        elif name == "drop_special":
+            password = "".join(c for c in password if c.isalnum())
+        elif name == "long":
+            password = (password * 20)[:rng.randint(120, 140)]
+        elif name == "unicode":
+            password = self.insert(rng, password, rng.choice(UNICODE))
+        elif name == "whitespace":
+            password = self.insert(rng, password, rng.choice(WHITESPACE))
+        elif name == "injection":
+            password = rng.choice(INJECTIONS + MARKUP + TRAVERSALS)
+        elif name == "literal":
+            password = rng.choice([NO_LOWERCASE_BUG_PASSWORD, "Pass12!", "NOLOWERCASE123!!"])
+        elif name == "non_string":
+            password = rng.choice(NON_STRINGS)
+        return password, name
+
+    def case(self, index: int) -> Case:
+        """Build case number index (deterministic for a given seed)"""
+        rng = random.Random(f"{self.seed}:{index}")
+        fake = self.fake
+        fake.seed_instance(rng.getrandbits(32))
+
+        email = self.base_email(fake, index)
+        password = self.base_password(fake, rng)
+        mutations = []
+
+        # Weighted so roughly a third of the cases stay valid
+        for _ in range(rng.choices([0, 1, 2], [3, 5, 2])[0]):
+            if rng.random() < 0.5 and isinstance(email, str):
+                email, name = self.mutate_email(rng, email)
+                mutations.append(f"email:{name}")
+            elif isinstance(password, str):
+                password, name = self.mutate_password(rng, password)
+                mutations.append(f"password:{name}")
+
+        payloads = [Payload(email, password)]
+        if isinstance(email, str) and rng.random() < 0.1:
+            # Register again with a case/whitespace variant of the same email
+            variant = email.swapcase() if rng.random() < 0.5 else f" {email} "
+            payloads.append(Payload(variant, password))
+            mutations.append("duplicate")
+
+        # Emails that lost the case token (and every non-string email, which
+        # comes from the shared NON_STRINGS list) may be shared with other cases
+        literal = not isinstance(email, str) or f".{index}@" not in js_trim(email).lower()
+        return Case(index, tuple(payloads), tuple(mutations), literal)
+
+
+class RegisterFuzzer:
+    def __init__(self, base_url: str, seed: int, concurrency: int = 16,
+                 rate: Optional[float] = None, duration: float = 60.0,
+                 max_cases: Optional[int] = None, minimize_time: float = 30.0,
+                 timeout: float = 10.0, namespace: str = "fuzz", bugs=None):
+        self.base_url = base_url.rstrip("/")
+        self.seed = seed
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.max_cases = max_cases
+        self.minimize_time = minimize_time
+        self.timeout = timeout
+        self.namespace = namespace
+        self.min_namespace = f"{namespace}-min"
+        self.bugs = bugs
+
+        self.generator = CaseGenerator(seed)
+        self.oracle = RegistrationOracle(bugs)
+        self.literal_lock = asyncio.Lock()
+
+        self.next_index = 0
+        self.requests = 0
+        self.outcomes: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.divergences = 0
+        self.unique: Dict[Tuple, Dict[str, Any]] = {}
+
+    async def reset(self, session: aiohttp.ClientSession, namespace: str):
+        async with session.post(f"{self.base_url}/__admin/reset",
+                                headers={NAMESPACE_HEADER: namespace}) as response:
+            if response.status != 200:
+                raise RuntimeError(f"Namespace reset failed with HTTP {response.status} "
+                                   "(the mock server admin endpoint is required)")
+
+    async def drop(self, session: aiohttp.ClientSession, namespace: str):
+        try:
+            async with session.delete(f"{self.base_url}/__admin/namespaces/{namespace}"):
+                pass
+        except aiohttp.ClientError:
+            pass
+
+    async def send(self, session: aiohttp.ClientSession, namespace: str,
+                   payload: Payload) -> Expectation:
+        """Send one payload, returns the actual (status, code, message)"""
+        async with session.post(f"{self.base_url}{REGISTER_PATH}",
+                                json={"email": payload.email, "password": payload.password},
+                                headers={NAMESPACE_HEADER: namespace}) as response:
+            body = await response.read()
+        code = message = None
+        if response.status >= 400:
+            try:
+                error = json.loads(body)
+                code, message = error.get("code"), error.get("error")
+            except (ValueError, AttributeError):
+                code = message = None
+        return Expectation(response.status, code, message)
+
+    async def run_payloads(self, session: aiohttp.ClientSession, namespace: str,
+                           oracle: RegistrationOracle,
+                           payloads) -> Optional[Tuple[int, Expectation, Expectation]]:
+        """
+        Send payloads in order, comparing each response to the oracle
+
+        Returns:
+            (payload position, expected, actual) of the first divergence, or None
+        """
+        for position, payload in enumerate(payloads):
+            expected = oracle.classify(payload.email, payload.password)
+            actual = await self.send(session, namespace, payload)
+            self.requests += 1
+            # Follow the server's state, not the model's, for later duplicates
+            if actual.status == 200:
+                email = payload.email
+                oracle.emails.add((js_trim(email) if isinstance(email, str) else js_string(email)).lower())
+            if actual != expected:
+                return position, expected, actual
+        return None
+
+    async def fire(self, session: aiohttp.ClientSession, case: Case):
+        try:
+            if case.literal:
+                async with self.literal_lock:
+                    divergence = await self.run_payloads(session, self.namespace,
+                                                         self.oracle, case.payloads)
+            else:
+                divergence = await self.run_payloads(session, self.namespace,
+                                                     self.oracle, case.payloads)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.errors[type(e).__name__] += 1
+            return
+
+        if divergence is None:
+            self.outcomes["match"] += 1
+            return
+        position, expected, actual = divergence
+        self.outcomes["divergence"] += 1
+        self.divergences += 1
+        finding = self.unique.get((expected, actual))
+        if finding is None:
+            finding = self.unique[(expected, actual)] = {
+                "case": case.index,
+                "count": 0,
+                "expected": expected._asdict(),
+                "actual": actual._asdict(),
+                "payloads": [payload._asdict() for payload in case.payloads[:position + 1]],
+                "mutations": Counter(),
+            }
+        finding["count"] += 1
+        finding["mutations"].update(case.mutations or ["none"])
+
+    def has_budget(self, deadline: float) -> bool:
+        if self.max_cases is not None and self.next_index >= self.max_cases:
+            return False
+        return time.perf_counter() < deadline
+
+    async def fuzz(self, session: aiohttp.ClientSession, start: float, deadline: float):
+        """Workers pull case indexes in order; --rate caps the case start rate"""
+        interval = 1.0 / self.rate if self.rate else 0.0
+
+        async def worker():
+            while self.has_budget(deadline):
+                index = self.next_index
+                self.next_index += 1
+                delay = start + index * interval - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self.fire(session, self.generator.case(index))
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+    async def still_diverges(self, session: aiohttp.ClientSession, payloads,
+                             expected: Expectation, actual: Expectation) -> bool:
+        await self.reset(session, self.min_namespace)
+        divergence = await self.run_payloads(session, self.min_namespace,
+                                             RegistrationOracle(self.bugs), payloads)
+        return divergence is not None and divergence[1:] == (expected, actual)
+
+    async def minimize(self, session: aiohttp.ClientSession, deadline: float):
+        """Shrink the string fields of each unique divergence's payloads"""
+        for entry in self.unique.values():
+            payloads = [Payload(**payload) for payload in entry["payloads"]]
+            expected = Expectation(**entry["expected"])
+            actual = Expectation(**entry["actual"])
+            if time.perf_counter() >= deadline or \
+                    not await self.still_diverges(session, payloads, expected, actual):
+                continue
+
+            for position in range(len(payloads)):
+                for field in Payload._fields:
+                    value = getattr(payloads[position], field)
+                    if not isinstance(value, str):
+                        continue
+                    value = await self.shrink_field(session, payloads, position, field,
+                                                    expected, actual, deadline)
+                    payloads[position] = payloads[position]._replace(**{field: value})
+            entry["minimized"] = [payload._asdict() for payload in payloads]
+
+    async def shrink_field(self, session, payloads, position, field,
+                           expected, actual, deadline) -> str:
+        """
+        Delta-debugging style minimization of one string field
+
+        Removes chunks of decreasing size while the same divergence persists.
+        """
+        value = getattr(payloads[position], field)
+        chunk = max(1, len(value) // 2)
+        while chunk >= 1 and time.perf_counter() < deadline:
+            start = 0
+            reduced = False
+            while start < len(value) and time.perf_counter() < deadline:
+                candidate = value[:start] + value[start + chunk:]
+                trial = list(payloads)
+                trial[position] = trial[position]._replace(**{field: candidate})
+                if candidate != value and await self.still_diverges(session, trial, expected, actual):
+                    value = candidate
+                    payloads = trial
+                    reduced = True
+                else:
+                    start += chunk
+            if not reduced:
+                chunk //= 2
+        return value
+
+    async def run(self) -> Dict[str, Any]:
+        """Run the fuzzer and return the results summary"""
+        connector = aiohttp.TCPConnector(limit=self.concurrency + 1, keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await self.reset(session, self.namespace)
+            start = time.perf_counter()
+            deadline = start + self.duration if self.duration else math.inf
+            await self.fuzz(session, start, deadline)
+            elapsed = time.perf_counter() - start
+            requests = self.requests
+
+            minimize_deadline = time.perf_counter() + self.minimize_time
+            if self.unique and self.minimize_time > 0:
+                await self.minimize(session, minimize_deadline)
+            for namespace in (self.namespace, self.min_namespace):
+                await self.drop(session, namespace)
+
+        return self.summary(elapsed, requests)
+
+    def summary(self, elapsed: float, requests: int) -> Dict[str, Any]:
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "target": f"POST {self.base_url}{REGISTER_PATH}",
+            "seed": self.seed,
+            "bugs": (self.bugs or self.oracle.bugs)._asdict(),
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            "elapsed_s": round(elapsed, 3),
+            "cases": sum(self.outcomes.values()),
+            "requests": requests,
+            "rps": round(requests / elapsed, 2) if elapsed else 0.0,
+            "divergences": self.divergences,
+            "unique_divergences": len(self.unique),
+            "errors": dict(self.errors.most_common()),
+            "findings": [
+                {**finding, "mutations": dict(finding["mutations"].most_common())}
+                for finding in self.unique.values()
+            ],
+        }
+
+
+def print_summary(result: Dict[str, Any]):
+    """Print a human readable summary of a fuzz run"""
+    print(f"\n{Fore.CYAN}{'='*80}")
+    print(f"{Fore.YELLOW}{'FUZZ SUMMARY':^80}")
+    print(f"{Fore.CYAN}{'='*80}{Style.RESET_ALL}\n")
+    print(f"Target:      {result['target']} (seed: {result['seed']})")
+    print(f"Cases:       {result['cases']} ({result['requests']} requests in {result['elapsed_s']}s)")
+    print(f"{Fore.GREEN}Throughput:  {result['rps']} req/s{Style.RESET_ALL}")
+    color = Fore.RED if result["unique_divergences"] else Fore.GREEN
+    print(f"{color}Divergences: {result['divergences']} "
+          f"({result['unique_divergences']} unique){Style.RESET_ALL}")
+
+    for finding in result["findings"]:
+        payloads = finding.get("minimized", finding["payloads"])
+        print(f"\n{Fore.MAGENTA}expected {finding['expected']['status']} "
+              f"{finding['expected']['code'] or 'OK'} -> actual {finding['actual']['status']} "
+              f"{finding['actual']['code'] or 'OK'}: {finding['count']} cases "
+              f"(first: #{finding['case']}){Style.RESET_ALL}")
+        mutations = Counter(finding["mutations"]).most_common(5)
+        print(f"  mutations: {', '.join(f'{name} x{count}' for name, count in mutations)}")
+        for payload in payloads:
+            print(f"  {json.dumps(payload, ensure_ascii=False)}")
+    if result["errors"]:
+        print(f"\n{Fore.RED}Client errors:{Style.RESET_ALL}")
+        for error, count in result["errors"].items():
+            print(f"  {error:<30} {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Differential fuzzing of /api/register")
+    parser.add_argument("base_url", nargs="?", default="http://localhost:3000")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Random seed (printed in the summary, default: random)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Cases in flight")
+    parser.add_argument("--rate", type=float, default=None, help="Max cases started per second")
+    parser.add_argument("--duration", type=float, default=60.0, help="Fuzzing time in seconds (0 = unlimited)")
+    parser.add_argument("--cases", type=int, default=None, help="Stop after this many cases")
+    parser.add_argument("--minimize-time", type=float, default=30.0,
+                        help="Seconds spent shrinking divergences after fuzzing (0 = off)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--no-bugs", action="store_true",
+                        help="Model a server started with all BUG_* flags set to 'false'")
+    parser.add_argument("--namespace", default="fuzz", help="Mock server namespace (reset at start)")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    if not args.duration and args.cases is None:
+        parser.error("--duration 0 requires --cases")
+    seed = args.seed if args.seed is not None else random.randrange(2**32)
+
+    fuzzer = RegisterFuzzer(
+        args.base_url, seed, concurrency=args.concurrency, rate=args.rate,
+        duration=args.duration, max_cases=args.cases, minimize_time=args.minimize_time,
+        timeout=args.timeout, namespace=args.namespace, bugs=NO_BUGS if args.no_bugs else None
+    )
+    result = asyncio.run(fuzzer.run())
+    print_summary(result)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n{Fore.GREEN}Results written to {args.output}{Style.RESET_ALL}")
+
+    return 0 if not result["unique_divergences"] and not result["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+HTTP cassette record/replay
+api_client 요청/응답을 테스트별 카세트 파일로 녹화하고, Mock 서버 없이 재생
+
+Modes:
+    record:  send requests to the mock server and save every exchange
+    replay:  answer from the cassette, no server; requests must match the
+             recorded ones in order (method, path, query, normalized body)
+    compare: send requests to the mock server and report responses that
+             diverge from the cassette (e.g. after a middleware change)
+
+Volatile values (created_at timestamps, generated ids, uuid-suffixed
+emails) are normalized away before matching and comparing.
+"""
+import json
+import re
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_MODES = ("off", "record", "replay", "compare")
+
+# Fields whose values change on every run
+VOLATILE_FIELDS = {"created_at", "updated_at", "id"}
+# uuid4 (with or without dashes) or a uuid4().hex[:8] suffix in an email
+UUID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}"
+    r"|(?<=_)[0-9a-f]{8}(?=@)"
+)
+# Response headers worth keeping in a cassette
+KEPT_HEADERS = ("Content-Type",)
+
+
+class CassetteError(Exception):
+    """Request does not match the cassette (replay mode)"""
+
+
+def normalize(value: Any) -> Any:
+    """Drop volatile fields and mask uuids in parsed JSON"""
+    if isinstance(value, dict):
+        return {key: normalize(item) for key, item in sorted(value.items())
+                if key not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [normalize(item) for item in value]
+    if isinstance(value, str):
+        return UUID_PATTERN.sub("<uuid>", value)
+    return value
+
+
+def parse_body(body) -> Any:
+    """Parse a request/response body as JSON, falling back to text"""
+    if not body:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
+
+
+def request_key(request: requests.PreparedRequest) -> Dict[str, Any]:
+    """Matching key of a request (host and port are ignored)"""
+    url = urlsplit(request.url)
+    return {
+        "method": request.method,
+        "path": UUID_PATTERN.sub("<uuid>", url.path),
+        "query": normalize(sorted(parse_qsl(url.query))),
+        "body": normalize(parse_body(request.body)),
+    }
+
+
+def response_key(interaction: Dict[str, Any]) -> Dict[str, Any]:
+    """Comparable part of a recorded response"""
+    return {"status": interaction["status"], "body": normalize(interaction["body"])}
+
+
+class Cassette:
+    """Recorded exchanges of one test, stored as a compact JSON file"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.interactions: List[Dict[str, Any]] = []
+        self.position = 0
+        self.divergences: List[str] = []
+
+    def load(self) -> bool:
+        """Load the cassette file; returns False if it does not exist"""
+        if not self.path.exists():
+            return False
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.interactions = json.load(f)["interactions"]
+        return True
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({"interactions": self.interactions}, f,
+                      ensure_ascii=False, separators=(",", ":"))
+            f.write("\n")
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response):
+        self.interactions.append({
+            "request": request_key(request),
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in KEPT_HEADERS
+                        if name in response.headers},
+            "body": parse_body(response.content),
+        })
+
+    def next_interaction(self, request: requests.PreparedRequest) -> Optional[Dict[str, Any]]:
+        """
+        Return the recorded interaction for the next request
+
+        Returns:
+            The interaction, or None if the request does not match
+        """
+        if self.position >= len(self.interactions):
+            return None
+        interaction = self.interactions[self.position]
+        if interaction["request"] != request_key(request):
+            return None
+        self.position += 1
+        return interaction
+
+    def describe_mismatch(self, request: requests.PreparedRequest) -> str:
+        key = request_key(request)
+        if self.position >= len(self.interactions):
+            return (f"{self.path.name}: unexpected request #{self.position + 1} "
+                    f"{key['method']} {key['path']} (cassette has {len(self.interactions)})")
+        expected = self.interactions[self.position]["request"]
+        return (f"{self.path.name}: request #{self.position + 1} does not match\n"
+                f"  expected: {json.dumps(expected, ensure_ascii=False)}\n"
+                f"  actual:   {json.dumps(key, ensure_ascii=False)}")
+
+    def compare(self, request: requests.PreparedRequest, response: requests.Response):
+        """Record a divergence if the live response differs from the cassette"""
+        number = self.position + 1
+        interaction = self.next_interaction(request)
+        if interaction is None:
+            self.divergences.append(self.describe_mismatch(request))
+            # Keep comparing the remaining requests in order
+            self.position += 1
+            return
+        live = {"status": response.status_code, "body": parse_body(response.content)}
+        if response_key(live) != response_key(interaction):
+            self.divergences.append(
+                f"{self.path.name}: response #{number} "
+                f"{request.method} {urlsplit(request.url).path} diverged\n"
+                f"  recorded: {json.dumps(response_key(interaction), ensure_ascii=False)}\n"
+                f"  live:     {json.dumps(response_key(live), ensure_ascii=False)}"
+            )
+
+    def build_response(self, request: requests.PreparedRequest,
+                       interaction: Dict[str, Any]) -> requests.Response:
+        """Build a requests.Response from a recorded interaction"""
+        body = interaction["body"]
+        if body is None:
+            content = b""
+        elif isinstance(body, str) and not interaction["headers"].get(
+                "Content-Type", "").startswith("application/json"):
+            content = body.encode("utf-8")
+        else:
+            content = json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response._content = content
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        response.elapsed = timedelta(0)
+        return response
+
+
+class CassetteAdapter(BaseAdapter):
+    """Transport adapter that records, replays or compares through a cassette"""
+
+    def __init__(self, cassette: Cassette, mode: str, adapter: BaseAdapter = None):
+        super().__init__()
+        self.cassette = cassette
+        self.mode = mode
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):
+        if self.mode == "replay":
+            interaction = self.cassette.next_interaction(request)
+            if interaction is None:
+                raise CassetteError(self.cassette.describe_mismatch(request))
+            return self.cassette.build_response(request, interaction)
+
+        response = self.adapter.send(request, **kwargs)
+        if self.mode == "record":
+            self.cassette.record(request, response)
+        elif self.mode == "compare":
+            self.cassette.compare(request, response)
+        return response
+
+    def close(self):
+        # The wrapped adapter is shared across the session and closed there
+        pass
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Change-impact test selection
+변경된 미들웨어 규칙/픽스처 케이스/페이지 객체 메서드에 영향받는 테스트만 골라 실행
+
+A recording run (--impact=record) stores, per test nodeid, what it
+exercised:
+
+- branches: validation branches of mock_server/middleware.js, reported by
+  the server in the X-Impact-Branches header
+- endpoints: "METHOD /path" of every request (ids become ":id")
+- cases: test_data.json cases read through the test_data fixture
+- methods: page object methods called (tests/ui/pages)
+
+Together with the project Python modules the run imported, this is
+written to reports/impact_map.json. A selecting run (--impact=select)
+diffs the working tree against --impact-base and deselects every test the
+changes cannot affect. Changes the map cannot attribute precisely fall
+back to a wider set, up to the whole suite.
+
+Usage:
+    pytest tests/ --impact=record               # build the map (full run)
+    pytest tests/ --impact=select               # run tests affected by uncommitted changes
+    pytest tests/ --impact=select --impact-base main
+    python3 impact_map.py --base main           # only list the affected tests
+"""
+import argparse
+import ast
+import functools
+import inspect
+import json
+import os
+import re
+import subprocess
+import sys
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import pytest
+
+from endpoints import endpoint_key
+
+PROJECT_ROOT = Path(__file__).parent
+DEFAULT_MAP_PATH = PROJECT_ROOT / "reports" / "impact_map.json"
+
+TRACE_HEADER = "X-Impact-Trace"
+BRANCHES_HEADER = "X-Impact-Branches"
+
+MIDDLEWARE = "mock_server/middleware.js"
+SERVER_DIR = "mock_server/"
+STATIC_DIR = "mock_server/public/"
+FIXTURE_FILE = "tests/fixtures/test_data.json"
+PAGES_DIR = "tests/ui/pages/"
+# Files that change how every test runs
+GLOBAL_FILES = {"pytest.ini", "requirements.txt"}
+
+BRANCH_CALL = re.compile(r"^(\s*)hit\('([\w.]+)'\);")
+
+
+class TrackedCases(Mapping):
+    """Read-only view of test_data that records which cases are read"""
+
+    def __init__(self, data: Mapping, on_hit: Callable[[str], None]):
+        self._data = data
+        self._on_hit = on_hit
+
+    def __getitem__(self, family):
+        return TrackedFamily(family, self._data[family], self._on_hit)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TrackedFamily(Sequence):
+    def __init__(self, family: str, cases: Sequence, on_hit: Callable[[str], None]):
+        self._family = family
+        self._cases = cases
+        self._on_hit = on_hit
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        case = self._cases[index]
+        self._on_hit(f"{self._family}[{index % len(self._cases)}]")
+        return case
+
+    def __len__(self):
+        return len(self._cases)
+
+
+class ImpactRecorder:
+    """Collects what each test exercises during a recording run"""
+
+    KINDS = ("branches", "endpoints", "cases", "methods")
+
+    def __init__(self):
+        self.current: Optional[str] = None
+        self.tests: Dict[str, Dict[str, Set[str]]] = {}
+        self._instrumented: Set[type] = set()
+
+    def hit(self, kind: str, value: str):
+        if self.current is None:
+            return
+        entry = self.tests.setdefault(self.current, {k: set() for k in self.KINDS})
+        entry[kind].add(value)
+
+    def observe_response(self, response, *args, **kwargs):
+        """requests response hook"""
+        self.hit("endpoints", endpoint_key(response.request.method, response.request.url))
+        for branch in filter(None, response.headers.get(BRANCHES_HEADER, "").split(",")):
+            self.hit("branches", branch)
+        return response
+
+    def observe_page_response(self, response):
+        """Playwright "response" event handler"""
+        self.hit("endpoints", endpoint_key(response.request.method, response.url))
+        for branch in filter(None, response.headers.get(BRANCHES_HEADER.lower(), "").split(",")):
+            self.hit("branches", branch)
+
+    def track_cases(self, data: Mapping) -> Mapping:
+        return TrackedCases(data, functools.partial(self.hit, "cases"))
+
+    def instrument_page_objects(self):
+        """Wrap the methods of the loaded page object classes to record calls"""
+        pages_dir = str(PROJECT_ROOT / PAGES_DIR)
+        for module in list(sys.modules.values()):
+            path = getattr(module, "__file__", None) or ""
+            if not path.startswith(pages_dir):
+                continue
+            relpath = Path(path).relative_to(PROJECT_ROOT).as_posix()
+            for cls in vars(module).values():
+                if (inspect.isclass(cls) and cls.__module__ == module.__name__
+                        and cls not in self._instrumented):
+                    self._instrument(cls, relpath)
+
+    def _instrument(self, cls: type, relpath: str):
+        self._instrumented.add(cls)
+        for name, function in list(vars(cls).items()):
+            if not inspect.isfunction(function) or name.startswith("__"):
+                continue
+            key = f"{relpath}::{cls.__name__}.{name}"
+
+            @functools.wraps(function)
+            def recorded(*args, _function=function, _key=key, **kwargs):
+                self.hit("methods", _key)
+                return _function(*args, **kwargs)
+            setattr(cls, name, recorded)
+
+    def to_json(self) -> Dict[str, Dict[str, List[str]]]:
+        return {nodeid: {kind: sorted(values) for kind, values in entry.items() if values}
+                for nodeid, entry in sorted(self.tests.items())}
+
+
+def project_modules() -> List[str]:
+    """Project Python files imported by this process"""
+    root = str(PROJECT_ROOT) + os.sep
+    files = set()
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and path.startswith(root) and path.endswith(".py"):
+            files.add(Path(path).relative_to(PROJECT_ROOT).as_posix())
+    return sorted(files)
+
+
+def git(*args: str) -> str:
+    result = subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def changed_files(base: str) -> Dict[str, Tuple[Set[int], Set[int]]]:
+    """
+    Files changed between base and the working tree
+
+    Returns:
+        path -> (changed lines in the base version, changed lines now);
+        untracked files count as entirely new
+    """
+    changes: Dict[str, Tuple[Set[int], Set[int]]] = {}
+    current = None
+    for line in git("diff", "--unified=0", "--no-color", "--no-renames", base, "--").splitlines():
+        if line.startswith("diff --git"):
+            current = line.split(" b/", 1)[1]
+            changes[current] = (set(), set())
+        elif line.startswith("@@") and current is not None:
+            match = re.match(r"@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@", line)
+            old_start, old_count, new_start, new_count = (
+                int(match.group(1)), int(match.group(2) or 1),
+                int(match.group(3)), int(match.group(4) or 1))
+            changes[current][0].update(range(old_start, old_start + old_count))
+            changes[current][1].update(range(new_start, new_start + new_count))
+    for path in git("ls-files", "--others", "--exclude-standard").splitlines():
+        try:
+            count = len((PROJECT_ROOT / path).read_text(encoding="utf-8").splitlines())
+        except (OSError, UnicodeDecodeError):
+            count = 1
+        changes[path] = (set(), set(range(1, count + 1)))
+    return changes
+
+
+def base_text(base: str, path: str) -> str:
+    try:
+        return git("show", f"{base}:{path}")
+    except RuntimeError:
+        return ""
+
+
+def current_text(path: str) -> str:
+    try:
+        return (PROJECT_ROOT / path).read_text(encoding="utf-8")
+    except OSError:
+        return ""
+
+
+def branch_regions(source: str) -> Dict[int, str]:
+    """
+    Line -> middleware branch
+
+    A branch starts at its hit('<branch>') call and runs until the next
+    call or the end of the enclosing block (a less indented line).
+    """
+    regions: Dict[int, str] = {}
+    branch, indent = None, 0
+    for number, line in enumerate(source.splitlines(), 1):
+        match = BRANCH_CALL.match(line)
+        if match:
+            branch, indent = match.group(2), len(match.group(1))
+        elif branch and line.strip() and len(line) - len(line.lstrip()) < indent:
+            branch = None
+        if branch:
+            regions[number] = branch
+    return regions
+
+
+def function_regions(source: str) -> Dict[int, str]:
+    """Line -> qualified name ("Class.method") of the innermost def"""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return {}
+    regions: Dict[int, str] = {}
+
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                name = f"{prefix}{child.name}"
+                if not isinstance(child, ast.ClassDef):
+                    start = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                    for number in range(start, child.end_lineno + 1):
+                        regions[number] = name
+                visit(child, f"{name}.")
+    visit(tree, "")
+    return regions
+
+
+def changed_cases(old: str, new: str) -> Optional[Set[str]]:
+    """"family[index]" keys that differ, or None if either side is unreadable"""
+    try:
+        before = json.loads(old) if old else {}
+        after = json.loads(new) if new else {}
+    except ValueError:
+        return None
+    keys = set()
+    for family in set(before) | set(after):
+        old_cases, new_cases = before.get(family, []), after.get(family, [])
+        for index in range(max(len(old_cases), len(new_cases))):
+            old_case = old_cases[index] if index < len(old_cases) else None
+            new_case = new_cases[index] if index < len(new_cases) else None
+            if old_case != new_case:
+                keys.add(f"{family}[{index}]")
+    return keys
+
+
+def test_name(nodeid: str) -> Tuple[str, str]:
+    """nodeid -> (file, "Class.function") without parameters"""
+    file, _, rest = nodeid.partition("::")
+    return file, re.sub(r"\[.*\]$", "", rest).replace("::", ".")
+
+
+class ImpactMap:
+    """Recorded test dependencies and the selection they imply for a diff"""
+
+    def __init__(self, tests: Dict[str, Dict[str, List[str]]], modules: Iterable[str] = ()):
+        self.tests = tests
+        self.modules = set(modules)
+
+    @classmethod
+    def load(cls, path: Path) -> "ImpactMap":
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get("tests", {}), data.get("modules", ()))
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"modules": sorted(self.modules), "tests": self.tests}, f,
+                      ensure_ascii=False, indent=1)
+
+    def merge(self, other: "ImpactMap"):
+        self.tests.update(other.tests)
+        self.modules |= other.modules
+
+    def using(self, kind: str, predicate: Callable[[str], bool] = lambda value: True) -> Set[str]:
+        return {nodeid for nodeid, entry in self.tests.items()
+                if any(predicate(value) for value in entry.get(kind, ()))}
+
+    def affected(self, base: str) -> Tuple[Optional[Set[str]], List[str]]:
+        """
+        Tests affected by the changes since base
+
+        Returns:
+            (recorded nodeids to run, or None for all tests; reasons)
+        """
+        selected: Set[str] = set()
+        reasons: List[str] = []
+
+        def add(nodeids: Set[str], reason: str):
+            selected.update(nodeids)
+            reasons.append(f"{reason}: {len(nodeids)} tests")
+
+        for path, (old_lines, new_lines) in sorted(changed_files(base).items()):
+            if path in GLOBAL_FILES:
+                return None, [f"{path} changed: all tests"]
+
+            if path == MIDDLEWARE:
+                old_regions = branch_regions(base_text(base, path))
+                new_regions = branch_regions(current_text(path))
+                branches = ({old_regions.get(n) for n in old_lines}
+                            | {new_regions.get(n) for n in new_lines})
+                if None in branches:
+                    add(self.using("endpoints"), f"{path} outside a branch")
+                branches.discard(None)
+                if branches:
+                    add(self.using("branches", branches.__contains__),
+                        f"{path} branches {', '.join(sorted(branches))}")
+            elif path.startswith(STATIC_DIR):
+                add(self.using("methods"), f"{path} (UI page)")
+            elif path.startswith(SERVER_DIR):
+                add(self.using("endpoints"), f"{path} (server)")
+            elif path == FIXTURE_FILE:
+                cases = changed_cases(base_text(base, path), current_text(path))
+                if cases is None:
+                    add(self.using("cases"), f"{path} unreadable")
+                elif cases:
+                    add(self.using("cases", cases.__contains__),
+                        f"{path} cases {', '.join(sorted(cases))}")
+            elif path.endswith(".py"):
+                nodeids, reason = self.python_impact(base, path, old_lines, new_lines)
+                if nodeids is None:
+                    return None, [reason]
+                if reason:
+                    add(nodeids, reason)
+        return selected, reasons
+
+    def python_impact(self, base: str, path: str, old_lines: Set[int],
+                      new_lines: Set[int]) -> Tuple[Optional[Set[str]], str]:
+        """Tests affected by a changed Python file (None: all tests)"""
+        old_regions = function_regions(base_text(base, path))
+        new_regions = function_regions(current_text(path))
+        names = {old_regions.get(n) for n in old_lines} | {new_regions.get(n) for n in new_lines}
+
+        if path.startswith(PAGES_DIR):
+            if None in names:
+                prefix = f"{path}::"
+                return (self.using("methods", lambda key: key.startswith(prefix)),
+                        f"{path} outside a method")
+            keys = {f"{path}::{name}" for name in names}
+            return (self.using("methods", keys.__contains__),
+                    f"{path} {', '.join(sorted(names))}")
+
+        if Path(path).name.startswith("test_"):
+            in_file = {nodeid for nodeid in self.tests if nodeid.partition("::")[0] == path}
+            if None in names:
+                return in_file, f"{path} outside a test"
+            tests = {nodeid for nodeid in in_file if test_name(nodeid)[1] in names
+                     or any(test_name(nodeid)[1].startswith(f"{name}.") for name in names)}
+            return tests, f"{path} {', '.join(sorted(names))}"
+        if path in self.modules:
+            return None, f"{path} changed: all tests"
+        return set(), ""
+
+
+class ImpactPlugin:
+    """pytest plugin for --impact=record / --impact=select"""
+
+    def __init__(self, config):
+        self.config = config
+        self.mode = config.getoption("--impact")
+        self.path = Path(config.getoption("--impact-map"))
+        self.recorder = ImpactRecorder() if self.mode == "record" else None
+        self.summary: List[str] = []
+        self._selection = None
+
+    def selection(self) -> Tuple[ImpactMap, Optional[Set[str]], List[str]]:
+        """Impact map, affected tests and reasons (computed once)"""
+        if self._selection is None:
+            if not self.path.exists():
+                raise pytest.UsageError(
+                    f"No impact map at {self.path}, build it with --impact=record")
+            impact = ImpactMap.load(self.path)
+            selected, reasons = impact.affected(self.config.getoption("--impact-base"))
+            self._selection = impact, selected, reasons or ["no relevant changes"]
+        return self._selection
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        if self.recorder is not None:
+            self.recorder.current = item.nodeid
+            self.recorder.instrument_page_objects()
+        yield
+        if self.recorder is not None:
+            self.recorder.current = None
+
+    def pytest_collection_modifyitems(self, config, items):
+        if self.mode != "select":
+            return
+        impact, selected, reasons = self.selection()
+        self.summary = list(reasons)
+        if selected is None:
+            return
+        keep, drop = [], []
+        for item in items:
+            # Tests missing from the map (new or never recorded) always run
+            (keep if item.nodeid in selected or item.nodeid not in impact.tests else drop).append(item)
+        if drop:
+            config.hook.pytest_deselected(items=drop)
+            items[:] = keep
+        self.summary.append(f"selected {len(keep)} of {len(keep) + len(drop)} tests")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.mode == "select" and not self.summary:
+            # xdist controller: the workers did the selection
+            self.summary = list(self.selection()[2])
+        if not self.summary:
+            return
+        terminalreporter.section("impact selection")
+        for line in self.summary:
+            terminalreporter.line(line)
+
+    def pytest_sessionfinish(self, session):
+        if self.mode != "record" or self.config.option.collectonly:
+            return
+        worker = getattr(self.config, "workerinput", {}).get("workerid")
+        if worker:
+            # Each xdist worker writes its part, the controller merges them
+            ImpactMap(self.recorder.to_json(), project_modules()).save(
+                self.path.with_name(f"{self.path.name}.{worker}"))
+            return
+        impact = ImpactMap(self.recorder.to_json(), project_modules())
+        for part in sorted(self.path.parent.glob(f"{self.path.name}.gw*")):
+            impact.merge(ImpactMap.load(part))
+            part.unlink()
+        impact.save(self.path)
+        self.summary = [f"recorded {len(impact.tests)} tests into {self.path}"]
+
+
+def add_options(parser):
+    group = parser.getgroup("impact", "Change-impact test selection")
+    group.addoption("--impact", choices=["off", "record", "select"], default="off",
+                    help="record: map each test to the middleware branches, endpoints, "
+                         "fixture cases and page object methods it exercises, "
+                         "select: run only tests affected by changes since --impact-base")
+    group.addoption("--impact-map", default=str(DEFAULT_MAP_PATH),
+                    help=f"Impact map file (default {DEFAULT_MAP_PATH})")
+    group.addoption("--impact-base", default="HEAD",
+                    help="Git revision to diff the working tree against (default HEAD)")
+
+
+def configure(config):
+    if config.getoption("--impact") != "off":
+        config.pluginmanager.register(ImpactPlugin(config), "impact")
+
+
+def get_recorder(config) -> Optional[ImpactRecorder]:
+    """The recorder of a --impact=record run, else None"""
+    plugin = config.pluginmanager.get_plugin("impact")
+    return plugin.recorder if plugin is not None else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List tests affected by changes since a revision")
+    parser.add_argument("--base", default="HEAD", help="Git revision (default HEAD)")
+    parser.add_argument("--map", type=Path, default=DEFAULT_MAP_PATH,
+                        help=f"Impact map file (default {DEFAULT_MAP_PATH})")
+    args = parser.parse_args()
+
+    if not args.map.exists():
+        sys.exit(f"No impact map at {args.map}, build it with pytest --impact=record")
+    selected, reasons = ImpactMap.load(args.map).affected(args.base)
+    for reason in reasons:
+        print(f"# {reason}")
+    if selected is None:
+        print("# run the full suite")
+        return
+    for nodeid in sorted(selected):
+        print(nodeid)
+
+
+if __name__ == "__main__":
+    main()
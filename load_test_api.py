@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+API Load Tester
+/api/register, /users, /config 엔드포인트의 처리량(RPS)과 지연시간 분포를 측정하는 스크립트
+
+Closed-loop mode keeps a fixed number of requests in flight; open-loop mode
+fires requests at a fixed arrival rate regardless of how fast the server
+answers, and measures latency from the scheduled send time.
+
+Usage:
+    python3 load_test_api.py --duration 30 --concurrency 50
+    python3 load_test_api.py --mode open --rate 200 --duration 60 --output reports/load.json
+    python3 load_test_api.py --endpoint config --requests 10000
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+# Try to import colorama for colored output, fallback to no colors
+try:
+    from colorama import Fore, Style, init
+    init(autoreset=True)
+except ImportError:
+    class Fore:
+        CYAN = YELLOW = GREEN = MAGENTA = BLUE = RED = ""
+        RESET = ""
+    class Style:
+        RESET_ALL = ""
+
+FIXTURES_PATH = Path(__file__).parent / "tests" / "fixtures" / "test_data.json"
+
+ENDPOINTS = {
+    "register": ("POST", "/api/register"),
+    "users": ("GET", "/users"),
+    "config": ("GET", "/config"),
+}
+
+# Default share of each test_data.json case family in the register payload mix
+DEFAULT_MIX = {"positive": 60, "negative": 20, "boundary": 10, "security": 10}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parse a family mix such as 'positive=70,negative=30'"""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+class PayloadFactory:
+    """Builds unique /api/register payloads from the test_data.json case families"""
+
+    def __init__(self, mix: Dict[str, int], fixtures_path: Path = FIXTURES_PATH,
+                 seed: Optional[int] = None):
+        with open(fixtures_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        self.families = {
+            name: data[f"{name}_cases"]
+            for name, weight in mix.items()
+            if weight > 0 and data.get(f"{name}_cases")
+        }
+        if not self.families:
+            raise ValueError(f"No test data cases found for mix: {mix}")
+
+        self.names = list(self.families)
+        self.weights = [mix[name] for name in self.names]
+        self.rng = random.Random(seed)
+
+    @staticmethod
+    def uniquify(email: str, suffix: str) -> str:
+        """
+        Make an email unique while keeping its validity class
+
+        The suffix goes at the end of a non-empty local part, so valid emails
+        stay valid and malformed ones (no '@', empty local part) stay malformed.
+        """
+        local, at, domain = email.partition("@")
+        if not at:
+            return f"{email}_{suffix}" if email else email
+        if not local.strip():
+            return email
+        return f"{local}_{suffix}@{domain}"
+
+    def next(self) -> Tuple[str, Dict[str, Any]]:
+        """Return (family, payload) for the next request"""
+        family = self.rng.choices(self.names, self.weights)[0]
+        case = self.rng.choice(self.families[family])
+        payload = {
+            "email": self.uniquify(case["email"], uuid.uuid4().hex[:12]),
+            "password": case["password"]
+        }
+        return family, payload
+
+
+class APILoadTester:
+    def __init__(self, base_url: str, endpoint: str = "register", mode: str = "closed",
+                 concurrency: int = 20, rate: float = 100.0, duration: float = 10.0,
+                 max_requests: Optional[int] = None, timeout: float = 10.0,
+                 mix: Dict[str, int] = None, seed: Optional[int] = None,
+                 namespace: Optional[str] = None):
+        self.base_url = base_url.rstrip("/")
+        self.endpoint = endpoint
+        self.method, self.path = ENDPOINTS[endpoint]
+        self.mode = mode
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.max_requests = max_requests
+        self.timeout = timeout
+        self.namespace = namespace
+        self.payloads = PayloadFactory(mix or DEFAULT_MIX, seed=seed) if endpoint == "register" else None
+
+        self.sent = 0
+        self.latencies: List[float] = []
+        self.outcomes: Counter = Counter()
+        self.families: Counter = Counter()
+        self.errors: Counter = Counter()
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if self.namespace:
+            headers["X-Test-Namespace"] = self.namespace
+        return headers
+
+    async def fire(self, session: aiohttp.ClientSession, scheduled: float):
+        """Send one request and record its latency (measured from scheduled) and outcome"""
+        family, payload = self.payloads.next() if self.payloads else (None, None)
+        url = f"{self.base_url}{self.path}"
+
+        try:
+            async with session.request(self.method, url, json=payload) as response:
+                body = await response.read()
+                latency = time.perf_counter() - scheduled
+                outcome = str(response.status)
+                if response.status >= 400:
+                    try:
+                        code = json.loads(body).get("code")
+                    except (ValueError, AttributeError):
+                        code = None
+                    outcome = f"{response.status} {code or 'UNKNOWN'}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            latency = time.perf_counter() - scheduled
+            outcome = "ERROR"
+            self.errors[type(e).__name__] += 1
+
+        self.latencies.append(latency)
+        self.outcomes[outcome] += 1
+        if family:
+            self.families[f"{family} -> {outcome}"] += 1
+
+    def has_budget(self, deadline: float) -> bool:
+        if self.max_requests is not None and self.sent >= self.max_requests:
+            return False
+        return time.perf_counter() < deadline
+
+    async def run_closed_loop(self, session: aiohttp.ClientSession, deadline: float):
+        """Each worker sends its next request as soon as the previous one completes"""
+        async def worker():
+            while self.has_budget(deadline):
+                self.sent += 1
+                await self.fire(session, time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+    async def run_open_loop(self, session: aiohttp.ClientSession, start: float, deadline: float):
+        """Requests are scheduled at a fixed rate; in-flight requests are capped by concurrency"""
+        interval = 1.0 / self.rate
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+
+        async def bounded(scheduled: float):
+            async with semaphore:
+                await self.fire(session, scheduled)
+
+        while True:
+            scheduled = start + self.sent * interval
+            if scheduled >= deadline or (self.max_requests is not None and self.sent >= self.max_requests):
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.sent += 1
+            task = asyncio.create_task(bounded(scheduled))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def run(self) -> Dict[str, Any]:
+        """Run the load test and return the results summary"""
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers=self.headers()) as session:
+            start = time.perf_counter()
+            # No duration limit when only a request count is given
+            deadline = start + self.duration if self.duration else math.inf
+
+            if self.mode == "open":
+                await self.run_open_loop(session, start, deadline)
+            else:
+                await self.run_closed_loop(session, deadline)
+            elapsed = time.perf_counter() - start
+
+        return self.summary(elapsed)
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        to_ms = lambda seconds: round(seconds * 1000, 3)
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "target": f"{self.method} {self.base_url}{self.path}",
+            "mode": self.mode,
+            "concurrency": self.concurrency,
+            "rate": self.rate if self.mode == "open" else None,
+            "elapsed_s": round(elapsed, 3),
+            "requests": len(latencies),
+            "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": {
+                "mean": to_ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+                "p50": to_ms(percentile(latencies, 50)),
+                "p90": to_ms(percentile(latencies, 90)),
+                "p99": to_ms(percentile(latencies, 99)),
+                "max": to_ms(latencies[-1]) if latencies else 0.0,
+            },
+            "outcomes": dict(self.outcomes.most_common()),
+            "families": dict(sorted(self.families.items())),
+            "errors": dict(self.errors.most_common()),
+        }
+
+
+def print_summary(result: Dict[str, Any]):
+    """Print a human readable summary of a load test run"""
+    print(f"\n{Fore.CYAN}{'='*80}")
+    print(f"{Fore.YELLOW}{'LOAD TEST SUMMARY':^80}")
+    print(f"{Fore.CYAN}{'='*80}{Style.RESET_ALL}\n")
+    print(f"Target:      {result['target']}")
+    print(f"Mode:        {result['mode']} (concurrency: {result['concurrency']}"
+          + (f", rate: {result['rate']}/s)" if result['rate'] else ")"))
+    print(f"Requests:    {result['requests']} in {result['elapsed_s']}s")
+    print(f"{Fore.GREEN}Throughput:  {result['rps']} req/s{Style.RESET_ALL}")
+
+    latency = result["latency_ms"]
+    print(f"Latency:     p50 {latency['p50']}ms | p90 {latency['p90']}ms | "
+          f"p99 {latency['p99']}ms | max {latency['max']}ms")
+
+    print(f"\n{Fore.MAGENTA}Outcomes (status / code):{Style.RESET_ALL}")
+    for outcome, count in result["outcomes"].items():
+        print(f"  {outcome:<30} {count}")
+    if result["errors"]:
+        print(f"\n{Fore.RED}Client errors:{Style.RESET_ALL}")
+        for error, count in result["errors"].items():
+            print(f"  {error:<30} {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the mock server API")
+    parser.add_argument("base_url", nargs="?", default="http://localhost:3000")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="register")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed",
+                        help="closed: fixed concurrency, open: fixed arrival rate")
+    parser.add_argument("--concurrency", type=int, default=20,
+                        help="Concurrent requests (max in-flight for open mode)")
+    parser.add_argument("--rate", type=float, default=100.0, help="Requests per second in open mode")
+    parser.add_argument("--duration", type=float, default=10.0, help="Run time in seconds (0 = unlimited)")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Register payload families, e.g. positive=70,negative=20,security=10")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for the payload mix")
+    parser.add_argument("--namespace", default="load-test",
+                        help="Mock server namespace (empty string for the default database)")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    if not args.duration and args.requests is None:
+        parser.error("--duration 0 requires --requests")
+
+    tester = APILoadTester(
+        args.base_url, endpoint=args.endpoint, mode=args.mode,
+        concurrency=args.concurrency, rate=args.rate, duration=args.duration,
+        max_requests=args.requests, timeout=args.timeout, mix=args.mix,
+        seed=args.seed, namespace=args.namespace or None
+    )
+    result = asyncio.run(tester.run())
+    print_summary(result)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n{Fore.GREEN}Results written to {args.output}{Style.RESET_ALL}")
+    else:
+        print(json.dumps(result, ensure_ascii=False))
+
+    return 0 if not result["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+/**
+ * Admin endpoints for test state management
+ * Keeps the db-backup.json baseline in memory so tests can reset the
+ * database with a single request instead of copying files and waiting
+ * for the server to pick up the change.
+ *
+ * All endpoints act on the request's namespace (X-Test-Namespace header),
+ * or on the default database when the header is absent.
+ *
+ * POST   /__admin/reset             - Restore the baseline (db-backup.json) state
+ * POST   /__admin/snapshot {name}   - Save the current state under a name
+ * POST   /__admin/restore  {name}   - Restore a previously saved snapshot
+ * GET    /__admin/snapshots         - List saved snapshot names
+ * POST   /__admin/users/delete      - Delete users by {ids} in one request
+ *                                    (all users of the namespace without ids)
+ * GET    /__admin/namespaces        - List active namespaces and their user counts
+ * DELETE /__admin/namespaces/:name  - Drop a namespace and its data
+ * GET    /__admin/status            - Process info (pid, port, version) for daemon control
+ * POST   /__admin/shutdown          - Stop the server process
+ *
+ * Fault injection profiles (/__admin/faults) are served by faults.js.
+ *
+ * Resets, restores and bulk deletes only swap the in-memory state: the
+ * database file catches up with the next write through the router, an
+ * explicit snapshot or the server shutting down (see server.js). With
+ * persistSwaps (the append-only log storage, whose records are deltas
+ * against the last state it wrote) every swap is written right away.
+ */
+const clone = (state) => JSON.parse(JSON.stringify(state));
+
+module.exports = (baseline, namespaces, serverInfo = {}, { persistSwaps = false } = {}) => {
+  const snapshots = new Map();
+
+  // Swap the whole state in one synchronous step so no request can observe
+  // a half-restored database
+  const swapState = (db, state) => {
+    db.setState(clone(state));
+    if (persistSwaps) {
+      db.write();
+    }
+    return (db.getState().users || []).length;
+  };
+
+  return (req, res, next) => {
+    if (!req.path.startsWith('/__admin/')) {
+      return next();
+    }
+
+    const name = (req.body && req.body.name) || 'default';
+    const snapshotKey = `${req.namespace || ''}:${name}`;
+
+    if (req.path === '/__admin/reset' && req.method === 'POST') {
+      const users = swapState(req.db, baseline);
+      return res.json({ status: 'ok', action: 'reset', namespace: req.namespace, users });
+    }
+
+    if (req.path === '/__admin/snapshot' && req.method === 'POST') {
+      snapshots.set(snapshotKey, clone(req.db.getState()));
+      // A snapshot is a checkpoint: bring the database file up to date
+      req.db.write();
+      return res.json({ status: 'ok', action: 'snapshot', namespace: req.namespace, name });
+    }
+
+    if (req.path === '/__admin/restore' && req.method === 'POST') {
+      if (!snapshots.has(snapshotKey)) {
+        return res.status(404).json({
+          error: `Snapshot not found: ${name}`,
+          code: 'SNAPSHOT_NOT_FOUND'
+        });
+      }
+      const users = swapState(req.db, snapshots.get(snapshotKey));
+      return res.json({ status: 'ok', action: 'restore', namespace: req.namespace, name, users });
+    }
+
+    if (req.path === '/__admin/snapshots' && req.method === 'GET') {
+      const prefix = `${req.namespace || ''}:`;
+      const names = Array.from(snapshots.keys())
+        .filter(key => key.startsWith(prefix))
+        .map(key => key.slice(prefix.length));
+      return res.json({ namespace: req.namespace, snapshots: names });
+    }
+
+    if (req.path === '/__admin/users/delete' && req.method === 'POST') {
+      const ids = req.body && req.body.ids;
+      if (ids !== undefined && !Array.isArray(ids)) {
+        return res.status(400).json({
+          error: 'ids must be an array of user ids',
+          code: 'INVALID_IDS'
+        });
+      }
+      const state = req.db.getState();
+      const users = state.users || [];
+      const targets = ids ? new Set(ids.map(String)) : null;
+      const kept = targets ? users.filter(user => !targets.has(String(user.id))) : [];
+      swapState(req.db, Object.assign({}, state, { users: kept }));
+      return res.json({
+        status: 'ok',
+        action: 'delete',
+        namespace: req.namespace,
+        deleted: users.length - kept.length,
+        users: kept.length
+      });
+    }
+
+    if (req.path === '/__admin/namespaces' && req.method === 'GET') {
+      return res.json({ namespaces: namespaces.list() });
+    }
+
+    if (req.path.startsWith('/__admin/namespaces/') && req.method === 'DELETE') {
+      const namespace = decodeURIComponent(req.path.slice('/__admin/namespaces/'.length));
+      const dropped = namespaces.drop(namespace);
+      for (const key of Array.from(snapshots.keys())) {
+        if (key.startsWith(`${namespace}:`)) {
+          snapshots.delete(key);
+        }
+      }
+      return res.json({ status: 'ok', action: 'drop', namespace, dropped });
+    }
+
+    if (req.path === '/__admin/status' && req.method === 'GET') {
+      return res.json(Object.assign({
+        status: 'ok',
+        pid: process.pid,
+        uptime: process.uptime(),
+        namespaces: namespaces.list().length
+      }, serverInfo));
+    }
+
+    if (req.path === '/__admin/shutdown' && req.method === 'POST') {
+      res.json({ status: 'ok', action: 'shutdown' });
+      // Let the response flush before exiting
+      setTimeout(() => process.kill(process.pid, 'SIGTERM'), 50);
+      return;
+    }
+
+    return res.status(404).json({
+      error: `Unknown admin endpoint: ${req.method} ${req.path}`,
+      code: 'NOT_FOUND'
+    });
+  };
+};
@@ -0,0 +1,75 @@
+/**
+ * Case-insensitive email index for the duplicate check
+ * Keeps a lowercased email -> count map per lowdb instance so that
+ * /api/register can detect duplicates in O(1) instead of scanning users.
+ *
+ * The index follows the router's lowdb state without hooking into
+ * json-server internals:
+ * - Inserts (users appended to the array) are indexed incrementally
+ * - Deletes and resets (shorter array, replaced array or changed tail)
+ *   trigger a rebuild on the next lookup
+ * - In-place updates (PUT/PATCH /users/:id) must call invalidate()
+ */
+const indexes = new WeakMap();
+
+const normalize = (email) => String(email).toLowerCase();
+
+function rebuild(users) {
+  const counts = new Map();
+  for (const user of users) {
+    if (user && user.email !== undefined) {
+      const key = normalize(user.email);
+      counts.set(key, (counts.get(key) || 0) + 1);
+    }
+  }
+  return { users, length: users.length, last: users[users.length - 1], counts, dirty: false };
+}
+
+// Return the index for db, synced with its current users collection
+function sync(db) {
+  const users = db.getState().users || [];
+  let index = indexes.get(db);
+
+  const stale = !index
+    || index.dirty
+    || index.users !== users
+    || users.length < index.length
+    || (index.length > 0 && users[index.length - 1] !== index.last);
+
+  if (stale) {
+    index = rebuild(users);
+    indexes.set(db, index);
+    return index;
+  }
+
+  // Only appends since the last sync: index the new tail
+  for (let i = index.length; i < users.length; i++) {
+    const user = users[i];
+    if (user && user.email !== undefined) {
+      const key = normalize(user.email);
+      index.counts.set(key, (index.counts.get(key) || 0) + 1);
+    }
+  }
+  index.length = users.length;
+  index.last = users[users.length - 1];
+  return index;
+}
+
+module.exports = {
+  // Number of users registered with this email (case-insensitive)
+  count(db, email) {
+    return sync(db).counts.get(normalize(email)) || 0;
+  },
+
+  has(db, email) {
+    return this.count(db, email) > 0;
+  },
+
+  // Force a rebuild on the next lookup (e.g. after in-place updates)
+  invalidate(db) {
+    const index = indexes.get(db);
+    if (index) {
+      index.dirty = true;
+    }
+  }
+};
@@ -0,0 +1,260 @@
+/**
+ * Per-route latency and fault injection
+ *
+ * A profile maps route patterns to rules. The first matching pattern (in
+ * the profile's order) applies:
+ *
+ *   {
+ *     "POST /api/register": { "delay": 300, "jitter": { "distribution": "normal", "ms": 50 } },
+ *     "GET /users/:id":     { "error_rate": 0.2, "status": 503 },
+ *     "/users*":            { "reset_rate": 0.05, "drip": { "bytes": 16, "interval": 100 } },
+ *     "*":                  { "delay": 20 }
+ *   }
+ *
+ * Patterns are "[METHOD ]path"; ids match ":id" (as in /metrics routes)
+ * and "*" matches anything. Rule fields (times in ms, rates 0..1):
+ *   delay       fixed delay before the request is handled
+ *   jitter      random extra delay: a number (uniform 0..n) or
+ *               { distribution: uniform|normal|exponential, ms } where ms
+ *               is the width, standard deviation or mean
+ *   error_rate  probability of answering `status` (default 503) with
+ *               code FAULT_INJECTED instead of handling the request
+ *   reset_rate  probability of closing the connection without a response
+ *   drip        send the response body in `bytes` sized pieces every
+ *               `interval` ms, the first one (with the headers) after one
+ *               interval
+ *
+ * FAULT_PROFILE (JSON, or a file path relative to this directory) sets
+ * the profile at startup; FAULT_SEED makes the random draws repeatable.
+ * Profiles can be switched at runtime, per namespace (X-Test-Namespace)
+ * or globally without the header:
+ *
+ * GET    /__admin/faults  - Profile in effect for the namespace
+ * PUT    /__admin/faults  - Replace it with the JSON body
+ * DELETE /__admin/faults  - Clear it (the global profile falls back to FAULT_PROFILE)
+ *
+ * Admin endpoints, /metrics and /config are never affected.
+ */
+const fs = require('fs');
+const path = require('path');
+const { routeOf } = require('./metrics');
+
+const DISTRIBUTIONS = ['uniform', 'normal', 'exponential'];
+const EXEMPT = (req) => req.path.startsWith('/__admin/') || req.path === '/metrics' || req.path === '/config';
+
+// mulberry32: small seeded generator for repeatable runs
+function seeded(seed) {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+const random = process.env.FAULT_SEED ? seeded(Number(process.env.FAULT_SEED)) : Math.random;
+
+function gaussian() {
+  // Box-Muller
+  return Math.sqrt(-2 * Math.log(1 - random())) * Math.cos(2 * Math.PI * random());
+}
+
+function jitterOf(jitter) {
+  if (typeof jitter === 'number') {
+    return random() * jitter;
+  }
+  switch (jitter.distribution || 'uniform') {
+    case 'normal':
+      return gaussian() * jitter.ms;
+    case 'exponential':
+      return -jitter.ms * Math.log(1 - random());
+    default:
+      return random() * jitter.ms;
+  }
+}
+
+function checkRule(pattern, rule) {
+  const fail = (message) => {
+    throw new Error(`${pattern}: ${message}`);
+  };
+  const number = (value, name, max = Infinity) => {
+    if (value !== undefined && (typeof value !== 'number' || value < 0 || value > max)) {
+      fail(`${name} must be a number between 0 and ${max}`);
+    }
+  };
+  if (!rule || typeof rule !== 'object' || Array.isArray(rule)) {
+    fail('rule must be an object');
+  }
+  number(rule.delay, 'delay');
+  number(rule.error_rate, 'error_rate', 1);
+  number(rule.reset_rate, 'reset_rate', 1);
+  if (rule.status !== undefined && !(Number.isInteger(rule.status) && rule.status >= 400 && rule.status <= 599)) {
+    fail('status must be an HTTP error status');
+  }
+  if (rule.jitter !== undefined && typeof rule.jitter !== 'number') {
+    if (typeof rule.jitter !== 'object' || !DISTRIBUTIONS.includes(rule.jitter.distribution || 'uniform')
+        || typeof rule.jitter.ms !== 'number' || rule.jitter.ms < 0) {
+      fail(`jitter must be a number or { distribution: ${DISTRIBUTIONS.join('|')}, ms }`);
+    }
+  } else {
+    number(rule.jitter, 'jitter');
+  }
+  if (rule.drip !== undefined) {
+    if (typeof rule.drip !== 'object' || !(rule.drip.bytes >= 1)) {
+      fail('drip must be { bytes (>= 1), interval }');
+    }
+    number(rule.drip.interval, 'drip.interval');
+  }
+}
+
+/**
+ * Validate a profile and compile its patterns
+ *
+ * @returns {Array<{pattern, method, path: RegExp, rule}>}
+ * @throws {Error} describing the first invalid rule
+ */
+function compile(profile) {
+  if (!profile || typeof profile !== 'object' || Array.isArray(profile)) {
+    throw new Error('profile must be an object of "[METHOD ]path": rule');
+  }
+  return Object.entries(profile).map(([pattern, rule]) => {
+    checkRule(pattern, rule);
+    const match = pattern.trim().match(/^(?:([A-Za-z]+)\s+)?(\S+)$/);
+    if (!match) {
+      throw new Error(`${pattern}: pattern must be "[METHOD ]path"`);
+    }
+    const [, method, glob] = match;
+    const source = glob.split('*').map(part => part.replace(/[.+?^${}()|[\]\\]/g, '\\$&')).join('.*');
+    return { pattern, method: method && method.toUpperCase(), path: new RegExp(`^${source}$`), rule };
+  });
+}
+
+function loadEnvProfile() {
+  const value = process.env.FAULT_PROFILE;
+  if (!value) {
+    return null;
+  }
+  const text = value.trim().startsWith('{') ? value : fs.readFileSync(path.resolve(__dirname, value), 'utf8');
+  const profile = JSON.parse(text);
+  compile(profile);
+  console.log(`Fault profile: ${Object.keys(profile).join(', ')}`);
+  return profile;
+}
+
+// Send the body in pieces, starting one interval late so the headers
+// are slow too; stops if the client goes away
+function drip(res, { bytes, interval = 100 }) {
+  const end = res.end;
+  res.end = function (chunk, encoding, callback) {
+    if (typeof chunk === 'function' || !chunk) {
+      return end.call(this, chunk, encoding, callback);
+    }
+    const body = Buffer.isBuffer(chunk) ? chunk : Buffer.from(chunk, typeof encoding === 'string' ? encoding : 'utf8');
+    let offset = 0;
+    const tick = () => {
+      if (res.socket === null || res.socket.destroyed) {
+        return;
+      }
+      const piece = body.subarray(offset, offset + bytes);
+      offset += bytes;
+      if (offset >= body.length) {
+        end.call(res, piece);
+        return;
+      }
+      res.write(piece);
+      setTimeout(tick, interval);
+    };
+    setTimeout(tick, interval);
+    return this;
+  };
+}
+
+/**
+ * Create the fault injection middleware
+ *
+ * Mount it after the namespace middleware (profiles are per namespace)
+ * and before the storage middleware: the delay is asynchronous, while
+ * storage expects the router to run in the same tick as its hook.
+ */
+function createFaults(envProfile = loadEnvProfile()) {
+  // Namespace ('' = global) -> { profile, rules }
+  const profiles = new Map();
+  if (envProfile) {
+    profiles.set('', { profile: envProfile, rules: compile(envProfile) });
+  }
+
+  const ruleFor = (req) => {
+    const entry = profiles.get(req.namespace || '') || profiles.get('');
+    if (!entry) {
+      return null;
+    }
+    const route = routeOf(req.path);
+    const found = entry.rules.find(({ method, path: pattern }) =>
+      (!method || method === req.method) && (pattern.test(route) || pattern.test(req.path)));
+    return found ? found.rule : null;
+  };
+
+  const admin = (req, res) => {
+    const key = req.namespace || '';
+    if (req.method === 'GET') {
+      const entry = profiles.get(key) || profiles.get('');
+      return res.json({ namespace: req.namespace, profile: entry ? entry.profile : null });
+    }
+    if (req.method === 'PUT') {
+      let rules;
+      try {
+        rules = compile(req.body);
+      } catch (error) {
+        return res.status(400).json({ error: error.message, code: 'INVALID_FAULT_PROFILE' });
+      }
+      profiles.set(key, { profile: req.body, rules });
+      return res.json({ status: 'ok', action: 'faults', namespace: req.namespace, routes: rules.length });
+    }
+    if (req.method === 'DELETE') {
+      profiles.delete(key);
+      if (!key && envProfile) {
+        profiles.set('', { profile: envProfile, rules: compile(envProfile) });
+      }
+      return res.json({ status: 'ok', action: 'faults', namespace: req.namespace, routes: 0 });
+    }
+    return res.status(405).json({ error: 'Use GET, PUT or DELETE', code: 'METHOD_NOT_ALLOWED' });
+  };
+
+  const middleware = (req, res, next) => {
+    if (req.path === '/__admin/faults') {
+      return admin(req, res);
+    }
+    const rule = EXEMPT(req) ? null : ruleFor(req);
+    if (!rule) {
+      return next();
+    }
+
+    const inject = () => {
+      if (rule.reset_rate && random() < rule.reset_rate) {
+        req.socket.destroy();
+        return;
+      }
+      if (rule.error_rate && random() < rule.error_rate) {
+        res.status(rule.status || 503).json({ error: 'Injected fault', code: 'FAULT_INJECTED' });
+        return;
+      }
+      if (rule.drip) {
+        drip(res, rule.drip);
+      }
+      next();
+    };
+    const delay = Math.max(0, (rule.delay || 0) + (rule.jitter !== undefined ? jitterOf(rule.jitter) : 0));
+    if (delay > 0) {
+      setTimeout(inject, delay);
+    } else {
+      inject();
+    }
+  };
+
+  return middleware;
+}
+
+module.exports = createFaults;
+module.exports.compile = compile;
@@ -0,0 +1,133 @@
+/**
+ * Latency histograms in Prometheus text format
+ *
+ * GET /metrics
+ *   mock_http_request_duration_seconds{namespace,method,route,outcome}
+ *     Whole request time per route ("/users/:id" style) and outcome:
+ *     the error code of 4xx/5xx JSON responses (INVALID_EMAIL, ...),
+ *     otherwise the status code ("200", "404", ...).
+ *   mock_register_stage_duration_seconds{namespace,stage}
+ *     Time spent in each validation stage of /api/register, the stages
+ *     being the hit('<branch>') markers of middleware.js. The last stage
+ *     of a request ends when its response is sent.
+ *
+ * With an X-Test-Namespace header only that namespace's series are
+ * returned, so a test worker can scrape its own traffic on a shared
+ * server. /metrics itself is not measured.
+ */
+const { NAMESPACE_HEADER } = require('./namespaces');
+
+const REQUEST_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5];
+const STAGE_BUCKETS = [0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01];
+
+const REQUEST_METRIC = 'mock_http_request_duration_seconds';
+const STAGE_METRIC = 'mock_register_stage_duration_seconds';
+
+const ID_SEGMENT = /^(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$/i;
+
+const seconds = (nanoseconds) => Number(nanoseconds) / 1e9;
+const escape = (value) => String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+
+class Histogram {
+  constructor(name, help, labelNames, buckets) {
+    this.name = name;
+    this.help = help;
+    this.labelNames = labelNames;
+    this.buckets = buckets;
+    this.series = new Map();
+  }
+
+  observe(labels, value) {
+    const key = this.labelNames.map(name => labels[name]).join('\u0000');
+    let series = this.series.get(key);
+    if (!series) {
+      series = { labels, counts: new Array(this.buckets.length).fill(0), sum: 0, count: 0 };
+      this.series.set(key, series);
+    }
+    // Buckets are cumulative on output, so only the first match is counted
+    const index = this.buckets.findIndex(bound => value <= bound);
+    if (index >= 0) {
+      series.counts[index] += 1;
+    }
+    series.sum += value;
+    series.count += 1;
+  }
+
+  render(filter) {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} histogram`];
+    for (const series of this.series.values()) {
+      if (filter && !filter(series.labels)) {
+        continue;
+      }
+      const labels = this.labelNames.map(name => `${name}="${escape(series.labels[name])}"`).join(',');
+      let cumulative = 0;
+      this.buckets.forEach((bound, index) => {
+        cumulative += series.counts[index];
+        lines.push(`${this.name}_bucket{${labels},le="${bound}"} ${cumulative}`);
+      });
+      lines.push(`${this.name}_bucket{${labels},le="+Inf"} ${series.count}`);
+      lines.push(`${this.name}_sum{${labels}} ${series.sum}`);
+      lines.push(`${this.name}_count{${labels}} ${series.count}`);
+    }
+    return lines.join('\n');
+  }
+}
+
+const requests = new Histogram(REQUEST_METRIC, 'Mock server request latency by route and outcome',
+  ['namespace', 'method', 'route', 'outcome'], REQUEST_BUCKETS);
+const stages = new Histogram(STAGE_METRIC, 'Time per /api/register validation stage',
+  ['namespace', 'stage'], STAGE_BUCKETS);
+
+function routeOf(path) {
+  if (path.startsWith('/__admin/')) {
+    return path.startsWith('/__admin/namespaces/') ? '/__admin/namespaces/:name' : path;
+  }
+  return path.split('/').map(part => (ID_SEGMENT.test(part) ? ':id' : part)).join('/');
+}
+
+/**
+ * Close the request's open stage and start the next one (null: none)
+ */
+function stage(req, name) {
+  const now = process.hrtime.bigint();
+  const open = req.metricsStage;
+  if (open) {
+    stages.observe({ namespace: req.get(NAMESPACE_HEADER) || '', stage: open.name }, seconds(now - open.start));
+  }
+  req.metricsStage = name ? { name, start: now } : null;
+}
+
+// Time every request; serve /metrics
+function middleware(req, res, next) {
+  if (req.path === '/metrics' && req.method === 'GET') {
+    const namespace = req.get(NAMESPACE_HEADER);
+    const filter = namespace ? (labels) => labels.namespace === namespace : null;
+    res.set('Content-Type', 'text/plain; version=0.0.4; charset=utf-8');
+    return res.send(`${requests.render(filter)}\n${stages.render(filter)}\n`);
+  }
+
+  const start = process.hrtime.bigint();
+  // Route and namespace before the register endpoint rewrites req.url
+  const route = routeOf(req.path);
+  const namespace = req.get(NAMESPACE_HEADER) || '';
+  let code = null;
+  const json = res.json;
+  res.json = function (body) {
+    if (body && typeof body.code === 'string') {
+      code = body.code;
+    }
+    return json.call(this, body);
+  };
+  res.on('finish', () => {
+    stage(req, null);
+    const outcome = res.statusCode >= 400 && code ? code : String(res.statusCode);
+    requests.observe({ namespace, method: req.method, route, outcome },
+      seconds(process.hrtime.bigint() - start));
+  });
+  next();
+}
+
+module.exports = middleware;
+module.exports.stage = stage;
+module.exports.routeOf = routeOf;
+module.exports.Histogram = Histogram;
@@ -17,17 +17,40 @@ const BUGS = {
   DUPLICATE_ALLOW: process.env.BUG_DUPLICATE_ALLOW !== 'false'   // TC-024
 };
 
+const emailIndex = require('./email-index');
+const metrics = require('./metrics');
+
 module.exports = (req, res, next) => {
+  // In-place user updates can change emails without growing the collection
+  if (req.path.startsWith('/users/') && (req.method === 'PUT' || req.method === 'PATCH')) {
+    emailIndex.invalidate(req.db);
+  }
+  
   // Handle /api/register endpoint
   if (req.path === '/api/register' && req.method === 'POST') {
     let { email, password } = req.body;
     
+    // Validation branches this request went through: each one is a timed
+    // stage (metrics.js), and they are reported in the X-Impact-Branches
+    // header when asked for with X-Impact-Trace (used by impact_map.py to
+    // map tests to the rules they exercise)
+    const trace = req.get('X-Impact-Trace') ? [] : null;
+    const hit = (branch) => {
+      metrics.stage(req, branch);
+      if (trace) {
+        trace.push(branch);
+        res.set('X-Impact-Branches', trace.join(','));
+      }
+    };
+    
+    hit('email.trim');
     // Trim email spaces
     if (typeof email === 'string') {
       email = email.trim();
       req.body.email = email;
     }
     
+    hit('email.format');
     // Email validation
     const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
     if (!email || !emailRegex.test(email)) {
@@ -37,10 +60,12 @@ module.exports = (req, res, next) => {
       });
     }
     
+    hit('email.xss_bug');
     // Check if this is the special XSS bug pattern FIRST
     // BUG: TC-020 - Specific XSS pattern bypasses validation
     const isXSSBugPattern = BUGS.XSS_BYPASS && email === '<script>alert(\'XSS\')</script>@test.com';
     
+    hit('email.sql');
     // Security: Block SQL injection patterns in email
     // Skip SQL injection check for the XSS bug pattern (it contains quotes)
     if (!isXSSBugPattern && (email.includes("'") || email.includes('--') || email.includes(';'))) {
@@ -50,6 +75,7 @@ module.exports = (req, res, next) => {
       });
     }
     
+    hit('email.xss');
     // Security: Block XSS patterns in email
     if (isXSSBugPattern) {
       // Intentional bug: This specific XSS pattern is not blocked
@@ -65,6 +91,7 @@ module.exports = (req, res, next) => {
       }
     }
     
+    hit('email.traversal');
     // Security: Block path traversal patterns in email
     if (!isXSSBugPattern && (email.includes('../') || email.includes('..\\'))) {
       return res.status(400).json({
@@ -73,6 +100,7 @@ module.exports = (req, res, next) => {
       });
     }
     
+    hit('password.length');
     // Password validation (minimum 8 characters)
     // BUG: TC-008 - Allows 7-character passwords
     if (BUGS.SHORT_PASSWORD && password && password.length === 7) {
@@ -86,6 +114,7 @@ module.exports = (req, res, next) => {
       });
     }
     
+    hit('password.complexity');
     // Check for password complexity (uppercase, lowercase, number, special char)
     // Allow longer passwords up to 128 characters
     const hasUpper = /[A-Z]/.test(password);
@@ -105,6 +134,7 @@ module.exports = (req, res, next) => {
       });
     }
     
+    hit('password.max_length');
     // Maximum password length check
     if (password.length > 128) {
       return res.status(400).json({
@@ -113,25 +143,23 @@ module.exports = (req, res, next) => {
       });
     }
     
+    hit('email.duplicate');
     // Check for duplicate email in database (case-insensitive)
-    const fs = require('fs');
-    const dbPath = require('path').join(__dirname, 'db.json');
-    const dbContent = fs.readFileSync(dbPath, 'utf8');
-    const db = JSON.parse(dbContent);
+    // O(1) lookup in the lowercased email index of the request namespace
+    // (req.db is the namespace's lowdb instance, see namespaces.js)
+    const duplicateCount = emailIndex.count(req.db, email);
     
     // BUG: TC-024 - Allows duplicate for specific email
     if (BUGS.DUPLICATE_ALLOW && email === 'duplicate@test.com') {
       // Intentional bug: Duplicate check is bypassed for this specific email
-      const duplicateCount = db.users.filter(u => u.email === email).length;
+      // (also by the unique email index of DB_STORAGE=log, see storage.js)
+      req.allowDuplicate = true;
       if (duplicateCount > 0) {
         console.log('[BUG TC-024] Duplicate email allowed:', email, 'Count:', duplicateCount + 1);
         // Skip duplicate check and continue
       }
     } else {
-      const existingUser = db.users.find(user => 
-        user.email.toLowerCase() === email.toLowerCase()
-      );
-      if (existingUser) {
+      if (duplicateCount > 0) {
         return res.status(400).json({
           error: '이미 등록된 이메일입니다.',
           code: 'DUPLICATE_EMAIL'
@@ -139,6 +167,7 @@ module.exports = (req, res, next) => {
       }
     }
     
+    hit('register.store');
     // Security: Never store plain password - hash it
     const crypto = require('crypto');
     const hashedPassword = crypto.createHash('sha256').update(password).digest('hex');
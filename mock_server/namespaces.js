@@ -0,0 +1,47 @@
+/**
+ * Per-request namespaces for concurrent test workers
+ * Requests carrying an X-Test-Namespace header are served from their own
+ * in-memory json-server router seeded from the baseline, so many workers
+ * can share one server without seeing each other's users.
+ * Requests without the header use the default (file-backed) router.
+ */
+const NAMESPACE_HEADER = 'X-Test-Namespace';
+
+const clone = (state) => JSON.parse(JSON.stringify(state));
+
+module.exports = (jsonServer, defaultRouter, baseline) => {
+  const routers = new Map();
+
+  const middleware = (req, res, next) => {
+    const name = req.get(NAMESPACE_HEADER);
+
+    if (name) {
+      if (!routers.has(name)) {
+        // Plain objects are loaded into lowdb's memory adapter (no file I/O)
+        routers.set(name, jsonServer.router(clone(baseline)));
+      }
+      req.namespace = name;
+      req.router = routers.get(name);
+    } else {
+      req.namespace = null;
+      req.router = defaultRouter;
+    }
+    req.db = req.router.db;
+
+    next();
+  };
+
+  // Route the request to the router selected for its namespace
+  middleware.router = (req, res, next) => (req.router || defaultRouter)(req, res, next);
+
+  middleware.list = () => Array.from(routers.entries()).map(([name, router]) => ({
+    name,
+    users: (router.db.getState().users || []).length
+  }));
+
+  middleware.drop = (name) => routers.delete(name);
+
+  return middleware;
+};
+
+module.exports.NAMESPACE_HEADER = NAMESPACE_HEADER;
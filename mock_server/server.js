@@ -1,11 +1,56 @@
 /**
  * Custom JSON Server with middleware
  */
+const fs = require('fs');
+const path = require('path');
 const jsonServer = require('json-server');
+
+// Database and port files can be overridden per process so that several
+// servers (e.g. one per pytest-xdist worker) never share state
+const DB_FILE = process.env.DB_FILE || 'db.json';
+const PORT_FILE = process.env.PORT_FILE || '.port';
+
+// Daemon mode (see mock_server_ctl.py): also serve on a Unix control socket
+// and report the launcher's source version through /__admin/status
+const CONTROL_SOCKET = process.env.CONTROL_SOCKET;
+const serverInfo = { version: process.env.SERVER_VERSION || null, port: null };
+const dbPath = path.join(__dirname, DB_FILE);
+const backupPath = path.join(__dirname, 'db-backup.json');
+
+// Initialize a fresh database file from the backup
+if (!fs.existsSync(dbPath) && fs.existsSync(backupPath)) {
+  fs.copyFileSync(backupPath, dbPath);
+}
+
+// DB_STORAGE=log keeps the default database in an append-only log
+// instead of rewriting DB_FILE on every change (see storage.js)
+const DB_STORAGE = process.env.DB_STORAGE || 'lowdb';
+const readJson = (file) => JSON.parse(fs.readFileSync(file, 'utf8'));
+const storage = require('./storage')(DB_STORAGE, dbPath, () => readJson(dbPath));
+
 const server = jsonServer.create();
-const router = jsonServer.router('db.json');
+const router = jsonServer.router(storage.source);
 const middlewares = jsonServer.defaults();
 const customMiddleware = require('./middleware');
+const adminMiddleware = require('./admin');
+const namespaceMiddleware = require('./namespaces');
+const metricsMiddleware = require('./metrics');
+
+// Keep the baseline in memory for resets and new namespaces;
+// fall back to the state the router started with
+let baseline;
+try {
+  baseline = readJson(backupPath);
+} catch (error) {
+  console.log(`Backup file not readable (${error.message}), using current state as baseline`);
+  baseline = JSON.parse(JSON.stringify(router.db.getState()));
+}
+const namespaces = namespaceMiddleware(jsonServer, router, baseline);
+// Per-route latency/fault profiles (FAULT_PROFILE, /__admin/faults)
+const faults = require('./faults')();
+
+// Latency histograms of every request, served at GET /metrics
+server.use(metricsMiddleware);
 
 // Set default middlewares (logger, cors, no-cache)
 server.use(middlewares);
@@ -25,11 +70,25 @@ server.get('/config', (req, res) => {
   });
 });
 
+// Resolve the request namespace (X-Test-Namespace header) to its database
+server.use(namespaces);
+
+// Inject configured delays, jitter, errors, resets and slow bodies
+// (before storage.middleware, which must run in the router's tick)
+server.use(faults);
+
+// Add admin endpoints for fast database reset/snapshot/restore
+// (in memory, except for the log storage which must record every swap)
+server.use(adminMiddleware(baseline, namespaces, serverInfo, { persistSwaps: DB_STORAGE === 'log' }));
+
 // Add custom middleware for /api/register
 server.use(customMiddleware);
 
-// Use default router
-server.use(router);
+// Storage engine hooks (unique email index, log records)
+server.use(storage.middleware);
+
+// Use the router of the request namespace (default router without header)
+server.use(namespaces.router);
 
 // Function to find available port
 const net = require('net');
@@ -56,28 +115,70 @@ function findAvailablePort(startPort) {
 }
 
 // Start server with dynamic port allocation
-const DEFAULT_PORT = process.env.PORT || 3000;
+// PORT=0 lets the OS pick a free port (reported through PORT_FILE)
+const DEFAULT_PORT = Number(process.env.PORT || 3000);
+
+// Admin resets only swap the in-memory state, so write the default
+// database out before exiting (SIGTERM also comes from /__admin/shutdown)
+const exitHooks = [() => router.db.write()];
+
+function exit() {
+  for (const hook of exitHooks) {
+    try {
+      hook();
+    } catch (error) {
+      console.error('Shutdown hook failed:', error);
+    }
+  }
+  process.exit(0);
+}
+process.on('SIGTERM', exit);
+process.on('SIGINT', exit);
+
+function startControlSocket(socketPath) {
+  // Remove a socket left behind by a crashed daemon
+  if (fs.existsSync(socketPath)) {
+    fs.unlinkSync(socketPath);
+  }
+  require('http').createServer(server).listen(socketPath, () => {
+    console.log(`Control socket listening on ${socketPath}`);
+  });
+  
+  exitHooks.push(() => {
+    if (fs.existsSync(socketPath)) {
+      fs.unlinkSync(socketPath);
+    }
+  });
+}
 
 async function startServer() {
   try {
     const PORT = await findAvailablePort(DEFAULT_PORT);
     
-    server.listen(PORT, () => {
+    const httpServer = server.listen(PORT, () => {
       console.log(`JSON Server is running on port ${PORT}`);
       console.log(`API endpoint: http://localhost:${PORT}/api/register`);
       console.log(`Users endpoint: http://localhost:${PORT}/users`);
       
       // Save port to file for test scripts to read
-      const fs = require('fs');
-      const path = require('path');
-      const portFile = path.join(__dirname, '.port');
+      const portFile = path.join(__dirname, PORT_FILE);
       fs.writeFileSync(portFile, PORT.toString());
+      serverInfo.port = PORT;
       
-      if (PORT !== DEFAULT_PORT) {
+      if (CONTROL_SOCKET) {
+        startControlSocket(path.resolve(__dirname, CONTROL_SOCKET));
+      }
+      
+      if (DEFAULT_PORT !== 0 && PORT !== DEFAULT_PORT) {
         console.log(`⚠️  Note: Using port ${PORT} instead of default ${DEFAULT_PORT}`);
         console.log(`   Update your test configuration if needed.`);
       }
     });
+    
+    // Keep idle client connections open between tests so pooled
+    // HTTP clients can reuse them (Node's default is 5 seconds)
+    httpServer.keepAliveTimeout = 65000;
+    httpServer.headersTimeout = 66000;
   } catch (error) {
     console.error('Failed to start server:', error);
     process.exit(1);
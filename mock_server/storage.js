@@ -0,0 +1,220 @@
+/**
+ * Storage engines for the default (non-namespaced) database
+ *
+ * DB_STORAGE=lowdb (default): json-server's FileSync adapter, which
+ *   rewrites the whole DB_FILE on every change.
+ * DB_STORAGE=log: append-only log (DB_FILE + '.log', one JSON record per
+ *   line). Each change appends only the record it touched, so write cost
+ *   does not grow with the database. The log is compacted into a single
+ *   state record every STORAGE_COMPACT_EVERY records and at startup.
+ *   Admin resets/restores rewrite the log as that one state, so they
+ *   cost the size of the restored state, not of the history.
+ *   Emails are unique case-insensitively for every write to /users
+ *   (except the intentional TC-024 bug), not only through /api/register.
+ *
+ * Log records:
+ *   {"op":"state","state":{...}}                        whole database
+ *   {"op":"insert","collection":"users","value":{...}}
+ *   {"op":"put","collection":"users","id":1,"value":{...}}
+ *   {"op":"delete","collection":"users","id":1}
+ */
+const fs = require('fs');
+const emailIndex = require('./email-index');
+
+const STORAGE_MODES = ['lowdb', 'log'];
+const COMPACT_EVERY = Number(process.env.STORAGE_COMPACT_EVERY || 1000);
+
+const sameId = (item, id) => item && item.id !== undefined && String(item.id) === String(id);
+
+// Apply one log record to a state object (mutated in place where possible)
+function apply(state, record) {
+  const items = () => (state[record.collection] = state[record.collection] || []);
+  switch (record.op) {
+    case 'state':
+      return record.state;
+    case 'insert':
+      items().push(record.value);
+      return state;
+    case 'put': {
+      const list = items();
+      const index = list.findIndex(item => sameId(item, record.id));
+      if (index >= 0) {
+        list[index] = record.value;
+      } else {
+        list.push(record.value);
+      }
+      return state;
+    }
+    case 'delete':
+      state[record.collection] = items().filter(item => !sameId(item, record.id));
+      return state;
+    default:
+      return state;
+  }
+}
+
+/**
+ * lowdb adapter writing changes to an append-only log
+ *
+ * lowdb hands write() the whole state; the change it contains is told
+ * by expect() just before json-server's router runs. Writes without a
+ * matching expectation (admin swaps, singular resources) append the
+ * whole state, which is always correct.
+ */
+class LogAdapter {
+  constructor(logPath, seed, compactEvery = COMPACT_EVERY) {
+    this.logPath = logPath;
+    this.seed = seed;
+    this.compactEvery = compactEvery;
+    this.pending = null;
+    this.records = 0;
+    this.fd = null;
+  }
+
+  read() {
+    let state = null;
+    let records = 0;
+    if (fs.existsSync(this.logPath)) {
+      for (const line of fs.readFileSync(this.logPath, 'utf8').split('\n')) {
+        if (!line) {
+          continue;
+        }
+        try {
+          state = apply(state || {}, JSON.parse(line));
+          records += 1;
+        } catch (error) {
+          // A torn last line from a crash mid-write is dropped by compaction
+          console.log(`Skipping unreadable log record (${error.message})`);
+        }
+      }
+    }
+    if (state === null) {
+      state = this.seed();
+    }
+    console.log(`Storage: ${records} log records replayed from ${this.logPath}`);
+    this.compact(state);
+    return state;
+  }
+
+  write(state) {
+    const describe = this.pending;
+    this.pending = null;
+    const record = describe && describe(state);
+    if (!record) {
+      // A whole state makes every earlier record obsolete
+      this.compact(state);
+      return;
+    }
+    fs.writeSync(this.fd, JSON.stringify(record) + '\n');
+    this.records += 1;
+    if (this.records >= this.compactEvery) {
+      this.compact(state);
+    }
+  }
+
+  // Expect the next write to be the change made by this request
+  expect(req) {
+    const match = req.path.match(/^\/([^/]+)(?:\/([^/]+))?\/?$/);
+    if (!match) {
+      return;
+    }
+    const [, collection, id] = match;
+    let describe = null;
+    if (!id && req.method === 'POST') {
+      // lodash-id appends the new document
+      describe = (state) => {
+        const items = state[collection];
+        return Array.isArray(items) && items.length
+          ? { op: 'insert', collection, value: items[items.length - 1] }
+          : null;
+      };
+    } else if (id && (req.method === 'PUT' || req.method === 'PATCH')) {
+      describe = (state) => {
+        const value = Array.isArray(state[collection])
+          && state[collection].find(item => sameId(item, id));
+        return value ? { op: 'put', collection, id: value.id, value } : null;
+      };
+    } else if (id && req.method === 'DELETE') {
+      describe = (state) => Array.isArray(state[collection])
+        ? { op: 'delete', collection, id }
+        : null;
+    }
+    this.pending = describe;
+    // json-server writes synchronously; never let an unused expectation
+    // describe a later, unrelated write
+    process.nextTick(() => {
+      if (this.pending === describe) {
+        this.pending = null;
+      }
+    });
+  }
+
+  // Rewrite the log as one state record (atomically, through a temp file)
+  compact(state) {
+    const temp = `${this.logPath}.tmp`;
+    fs.writeFileSync(temp, JSON.stringify({ op: 'state', state }) + '\n');
+    fs.renameSync(temp, this.logPath);
+    if (this.fd !== null) {
+      fs.closeSync(this.fd);
+    }
+    this.fd = fs.openSync(this.logPath, 'a');
+    this.records = 1;
+  }
+}
+
+// Reject writes to /users that would duplicate an email (case-insensitive)
+function uniqueEmails(req, res, next) {
+  const match = req.path.match(/^\/users(?:\/([^/]+))?\/?$/);
+  const email = req.body && req.body.email;
+  const writes = match && (req.method === 'POST' || req.method === 'PUT' || req.method === 'PATCH');
+  if (!writes || typeof email !== 'string' || req.allowDuplicate) {
+    return next();
+  }
+  const id = match[1];
+  const users = req.db.getState().users || [];
+  const current = id !== undefined ? users.find(user => sameId(user, id)) : null;
+  const own = current && String(current.email).toLowerCase() === email.toLowerCase() ? 1 : 0;
+  if (emailIndex.count(req.db, email) > own) {
+    return res.status(400).json({
+      error: '이미 등록된 이메일입니다.',
+      code: 'DUPLICATE_EMAIL'
+    });
+  }
+  next();
+}
+
+/**
+ * Create the storage engine
+ *
+ * @param {string} mode - One of STORAGE_MODES
+ * @param {string} dbPath - JSON database file (DB_FILE)
+ * @param {function} seed - Initial state when there is no log yet
+ * @returns {{source, middleware}} json-server router source and the
+ *   middleware to mount right before the router
+ */
+function createStorage(mode, dbPath, seed) {
+  if (!STORAGE_MODES.includes(mode)) {
+    throw new Error(`Unknown DB_STORAGE "${mode}" (expected one of ${STORAGE_MODES.join(', ')})`);
+  }
+  if (mode === 'lowdb') {
+    return { source: dbPath, middleware: (req, res, next) => next() };
+  }
+
+  // json-server depends on lowdb 1.x and accepts a ready lowdb instance
+  const low = require('lowdb');
+  const adapter = new LogAdapter(`${dbPath}.log`, seed);
+  const db = low(adapter);
+  const middleware = (req, res, next) => {
+    uniqueEmails(req, res, () => {
+      if (!req.namespace) {
+        adapter.expect(req);
+      }
+      next();
+    });
+  };
+  return { source: db, middleware, adapter };
+}
+
+module.exports = createStorage;
+module.exports.STORAGE_MODES = STORAGE_MODES;
+module.exports.LogAdapter = LogAdapter;
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Mock Server Daemon Control
+Mock 서버를 백그라운드 데몬으로 띄워두고 여러 pytest 실행에서 재사용하기 위한 CLI
+
+The daemon serves the usual HTTP port plus a Unix control socket
+(mock_server/.daemon.sock). conftest.py discovers a running daemon through
+that socket and only resets its state instead of booting a new server.
+A daemon is restarted automatically when it is stale (process gone,
+socket dead) or when the mock server sources changed since it was launched.
+
+Usage:
+    python3 mock_server_ctl.py start
+    python3 mock_server_ctl.py status
+    python3 mock_server_ctl.py reset [--namespace gw0]
+    python3 mock_server_ctl.py stop
+"""
+
+import argparse
+import fcntl
+import hashlib
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent
+MOCK_SERVER_DIR = PROJECT_ROOT / "mock_server"
+REPORTS_DIR = PROJECT_ROOT / "reports"
+
+CONTROL_SOCKET = MOCK_SERVER_DIR / ".daemon.sock"
+STATE_FILE = MOCK_SERVER_DIR / ".daemon.json"
+LOCK_FILE = MOCK_SERVER_DIR / ".daemon.lock"
+PORT_FILE = MOCK_SERVER_DIR / ".port.daemon"
+LOG_FILE = REPORTS_DIR / "mock_server.daemon.log"
+# Log of the previous daemon (kept to see why it went stale)
+PREVIOUS_LOG_FILE = LOG_FILE.with_name(LOG_FILE.name + ".1")
+
+# Files whose changes require restarting a running daemon
+VERSION_PATTERNS = ("*.js", "package.json", "package-lock.json", "db-backup.json")
+
+START_TIMEOUT = 30
+
+
+class UnixSocketHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over the daemon's Unix control socket"""
+
+    def __init__(self, socket_path: Path, timeout: float = 2):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(str(self.socket_path))
+
+
+def source_version() -> str:
+    """Hash of the mock server sources, used to detect outdated daemons"""
+    digest = hashlib.sha256()
+    for pattern in VERSION_PATTERNS:
+        for path in sorted(MOCK_SERVER_DIR.glob(pattern)):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def control_request(method: str, path: str, namespace: str = None,
+                    timeout: float = 2) -> Tuple[int, Dict[str, Any]]:
+    """
+    Send a request to the daemon over its control socket
+
+    Returns:
+        Tuple of (status code, JSON body)
+
+    Raises:
+        OSError: If the socket is missing or nobody is listening
+    """
+    connection = UnixSocketHTTPConnection(CONTROL_SOCKET, timeout)
+    headers = {"Content-Type": "application/json"}
+    if namespace:
+        headers["X-Test-Namespace"] = namespace
+    try:
+        connection.request(method, path, body="{}" if method != "GET" else None, headers=headers)
+        response = connection.getresponse()
+        body = response.read()
+        return response.status, json.loads(body or b"{}")
+    finally:
+        connection.close()
+
+
+def read_state() -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(STATE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def daemon_status() -> Dict[str, Any]:
+    """
+    Inspect the daemon
+
+    Returns:
+        Dictionary with 'state' ("running", "outdated", "stale" or "stopped")
+        plus the daemon's status info when it answered
+    """
+    state = read_state()
+    try:
+        code, info = control_request("GET", "/__admin/status")
+    except (OSError, http.client.HTTPException, ValueError):
+        if state or CONTROL_SOCKET.exists():
+            return {"state": "stale", "daemon": state}
+        return {"state": "stopped"}
+
+    if code != 200 or not info.get("port"):
+        return {"state": "stale", "daemon": state, **info}
+
+    info["base_url"] = f"http://localhost:{info['port']}"
+    current = source_version()
+    if info.get("version") != current:
+        return {"state": "outdated", "current_version": current, **info}
+    return {"state": "running", **info}
+
+
+def start_daemon(port: int = None) -> Dict[str, Any]:
+    """Launch the daemon in its own session and wait until it answers"""
+    REPORTS_DIR.mkdir(exist_ok=True)
+    for path in (PORT_FILE, CONTROL_SOCKET):
+        if path.exists():
+            path.unlink()
+
+    version = source_version()
+    env = {
+        **os.environ,
+        "PORT_FILE": PORT_FILE.name,
+        "CONTROL_SOCKET": CONTROL_SOCKET.name,
+        "SERVER_VERSION": version,
+    }
+    if port is not None:
+        env["PORT"] = str(port)
+
+    # Keep the previous daemon's log instead of truncating it
+    if LOG_FILE.exists() and LOG_FILE.stat().st_size:
+        os.replace(LOG_FILE, PREVIOUS_LOG_FILE)
+    with open(LOG_FILE, "w", encoding="utf-8") as log:
+        process = subprocess.Popen(
+            ["npm", "start"],
+            cwd=MOCK_SERVER_DIR,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True  # Survive the pytest run that started it
+        )
+
+    deadline = time.monotonic() + START_TIMEOUT
+    delay = 0.01
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Mock server daemon exited with code {process.returncode} (see {LOG_FILE})")
+        status = daemon_status()
+        if status["state"] == "running":
+            STATE_FILE.write_text(json.dumps({
+                "pid": process.pid,
+                "server_pid": status["pid"],
+                "port": status["port"],
+                "version": version,
+                "started_at": datetime.now().isoformat(),
+                "log": str(LOG_FILE),
+            }, indent=2))
+            return status
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+    os.killpg(process.pid, signal.SIGTERM)
+    raise RuntimeError(f"Mock server daemon did not become ready (see {LOG_FILE})")
+
+
+def stop_daemon(timeout: float = 5) -> bool:
+    """
+    Stop the daemon (gracefully through the control socket, then by signal)
+
+    Returns:
+        True if a daemon was running or left state behind
+    """
+    state = read_state()
+    found = state is not None or CONTROL_SOCKET.exists()
+
+    try:
+        control_request("POST", "/__admin/shutdown")
+    except (OSError, http.client.HTTPException, ValueError):
+        pass
+
+    if state and state.get("pid"):
+        pid = state["pid"]
+        deadline = time.monotonic() + timeout
+        while pid_alive(pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        if pid_alive(pid):
+            try:
+                os.killpg(pid, signal.SIGTERM)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+    for path in (STATE_FILE, CONTROL_SOCKET, PORT_FILE):
+        if path.exists():
+            path.unlink()
+    return found
+
+
+def reset_daemon(namespace: str = None) -> bool:
+    """Reset the daemon's database (or one namespace) to the baseline"""
+    try:
+        code, body = control_request("POST", "/__admin/reset", namespace=namespace)
+    except (OSError, http.client.HTTPException, ValueError):
+        return False
+    return code == 200 and body.get("status") == "ok"
+
+
+@contextmanager
+def daemon_lock():
+    """Serialize daemon start/restart across concurrent pytest processes"""
+    LOCK_FILE.touch(exist_ok=True)
+    with open(LOCK_FILE, "r") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def ensure_daemon(start: bool = True, port: int = None, reset: bool = True) -> Optional[str]:
+    """
+    Return the base URL of a warm, up-to-date daemon
+
+    A running daemon is reused (and reset if reset is True); a stale or
+    outdated one is restarted. Without a daemon, one is started only if
+    start is True.
+
+    Args:
+        start: Launch a daemon if none exists
+        port: Preferred HTTP port of a newly launched daemon
+        reset: Reset the state of a running daemon
+
+    Returns:
+        Base URL of the daemon, or None if no daemon is used
+    """
+    with daemon_lock():
+        status = daemon_status()
+
+        if status["state"] == "running":
+            if reset:
+                reset_daemon()
+            return status["base_url"]
+
+        if status["state"] == "stopped" and not start:
+            return None
+
+        if status["state"] in ("stale", "outdated"):
+            print(f"Restarting {status['state']} mock server daemon...")
+            stop_daemon()
+
+        return start_daemon(port)["base_url"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock server daemon control")
+    parser.add_argument("command", choices=["start", "stop", "restart", "status", "reset"])
+    parser.add_argument("--port", type=int, default=None, help="Preferred HTTP port (default 3000)")
+    parser.add_argument("--namespace", default=None, help="Namespace to reset (reset command)")
+    args = parser.parse_args()
+
+    if args.command == "start":
+        status = daemon_status()
+        if status["state"] == "running":
+            # Leave its state alone: tests may be using it
+            print(f"Mock server daemon already running at {status['base_url']} (pid {status['pid']})")
+            if args.port is not None and args.port != status["port"]:
+                print(f"Use 'restart --port {args.port}' to move it to port {args.port}")
+        else:
+            print(f"Mock server daemon running at {ensure_daemon(port=args.port, reset=False)}")
+    elif args.command == "restart":
+        with daemon_lock():
+            stop_daemon()
+            print(f"Mock server daemon running at {start_daemon(args.port)['base_url']}")
+    elif args.command == "stop":
+        print("Mock server daemon stopped" if stop_daemon() else "No mock server daemon running")
+    elif args.command == "reset":
+        if not reset_daemon(args.namespace):
+            print("Reset failed: no mock server daemon running")
+            return 1
+        print("Mock server daemon reset")
+    else:
+        status = daemon_status()
+        print(json.dumps(status, indent=2))
+        return 0 if status["state"] == "running" else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Streaming NDJSON test results
+테스트 단계(setup/call/teardown)가 끝날 때마다 결과를 한 줄씩 기록하고, 실시간으로 진행 상황을 보여주는 도구
+
+With --ndjson-report PATH every finished test phase is appended to PATH
+as one compact JSON line right away, so a crashed or killed run keeps
+everything up to that point and nothing accumulates in memory. xdist
+workers append to the same file (one write per line, O_APPEND).
+
+Records:
+    {"event":"start","ts":...,"pid":...}
+    {"event":"collected","count":60}
+    {"ts":...,"nodeid":"...","when":"call","outcome":"passed","duration":0.012,
+     "markers":["api","positive"],"tc":"TC-001","worker":"gw0"}
+    {"event":"finish","ts":...,"exitstatus":0}
+
+Usage:
+    pytest tests/ --ndjson-report reports/results.ndjson
+    python3 ndjson_report.py reports/results.ndjson --follow   # live view
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent
+DEFAULT_REPORT_PATH = PROJECT_ROOT / "reports" / "results.ndjson"
+
+# Markers that describe how a test is run rather than what it is
+IGNORED_MARKERS = {"parametrize", "usefixtures", "filterwarnings", "skip", "skipif", "xfail"}
+
+CLEAR_LINE = "\r\033[K"
+# allure_commons.types.LinkType.TEST_CASE, the link type of @allure.testcase
+TEST_CASE_LINK = "tms"
+
+
+def test_case_id(item) -> Optional[str]:
+    """TC id given with @allure.testcase (allure_link marker of type test_case)"""
+    for mark in item.iter_markers("allure_link"):
+        if mark.kwargs.get("link_type") == TEST_CASE_LINK:
+            return mark.kwargs.get("name") or (mark.args[0] if mark.args else None)
+    return None
+
+
+def marker_names(item) -> List[str]:
+    names = []
+    for mark in item.iter_markers():
+        if (mark.name not in IGNORED_MARKERS and not mark.name.startswith("allure")
+                and mark.name not in names):
+            names.append(mark.name)
+    return names
+
+
+class NDJSONWriter:
+    """Appends one line per record, unbuffered"""
+
+    def __init__(self, path: Path, truncate: bool):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | (os.O_TRUNC if truncate else 0)
+        self.fd = os.open(path, flags, 0o644)
+
+    def write(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        # A single write per line keeps lines from concurrent workers whole
+        os.write(self.fd, line.encode("utf-8"))
+
+    def close(self):
+        os.close(self.fd)
+
+
+class NDJSONReport:
+    """pytest plugin streaming test phase results to an NDJSON file"""
+
+    def __init__(self, config, path: Path):
+        self.config = config
+        workerinput = getattr(config, "workerinput", None)
+        self.worker = workerinput["workerid"] if workerinput else None
+        # The controller (or a serial run) starts a fresh file, workers append
+        self.writer = NDJSONWriter(path, truncate=self.worker is None)
+        # Metadata of the tests currently running in this process only
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.collected = False
+        if self.worker is None:
+            self.writer.write({"event": "start", "ts": round(time.time(), 3), "pid": os.getpid()})
+
+    def pytest_collection_finish(self, session):
+        if self.worker is None and not self.is_controller():
+            self.collected = True
+            self.writer.write({"event": "collected", "count": len(session.items)})
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_node_collection_finished(self, node, ids):
+        # Every worker collects the same tests, count the first one
+        if not self.collected:
+            self.collected = True
+            self.writer.write({"event": "collected", "count": len(ids)})
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        self.items[item.nodeid] = {"markers": marker_names(item), "tc": test_case_id(item)}
+        yield
+        self.items.pop(item.nodeid, None)
+
+    def pytest_runtest_logreport(self, report):
+        meta = self.items.get(report.nodeid)
+        if meta is None:
+            # xdist controller: the worker already wrote this report
+            return
+        category = self.config.hook.pytest_report_teststatus(report=report, config=self.config)[0]
+        record = {
+            "ts": round(time.time(), 3),
+            "nodeid": report.nodeid,
+            "when": report.when,
+            "outcome": category or report.outcome,
+            "duration": round(report.duration, 4),
+            "markers": meta["markers"],
+        }
+        if meta["tc"]:
+            record["tc"] = meta["tc"]
+        if self.worker:
+            record["worker"] = self.worker
+        self.writer.write(record)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if self.worker is None:
+            self.writer.write({"event": "finish", "ts": round(time.time(), 3),
+                               "exitstatus": int(exitstatus)})
+
+    def pytest_unconfigure(self, config):
+        self.writer.close()
+
+    def is_controller(self) -> bool:
+        return self.config.pluginmanager.hasplugin("dsession")
+
+
+def add_options(parser):
+    group = parser.getgroup("ndjson", "Streaming NDJSON results")
+    group.addoption("--ndjson-report", metavar="PATH", default=None,
+                    help="Append one JSON line per finished test phase to PATH "
+                         f"(e.g. {DEFAULT_REPORT_PATH.relative_to(PROJECT_ROOT)})")
+
+
+def configure(config):
+    path = config.getoption("--ndjson-report")
+    if path and not config.option.collectonly:
+        config.pluginmanager.register(NDJSONReport(config, Path(path)), "ndjson_report")
+
+
+def read_records(path: Path, follow: bool, interval: float = 0.2) -> Iterator[Optional[Dict]]:
+    """
+    Yield records as they are appended; None marks "no new data yet"
+
+    A file that shrinks (a new run truncated it) is read from the start,
+    after a {"event": "start"} record is seen.
+    """
+    while not path.exists():
+        if not follow:
+            return
+        time.sleep(interval)
+    with open(path, 'r', encoding='utf-8') as f:
+        partial = ""
+        while True:
+            line = f.readline()
+            if line.endswith("\n"):
+                partial, line = "", partial + line
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+                continue
+            partial += line
+            if not follow:
+                return
+            if path.stat().st_size < f.tell():
+                f.seek(0)
+                partial = ""
+            yield None
+            time.sleep(interval)
+
+
+class Progress:
+    """Running pass/fail counts and throughput, with the same categories as pytest"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counts: Counter = Counter()
+        self.collected: Optional[int] = None
+        self.started: Optional[float] = None
+        self.last: Optional[float] = None
+        self.finished: Optional[int] = None
+        self.done = 0
+
+    def add(self, record: Dict[str, Any]):
+        event = record.get("event")
+        if event == "start":
+            self.reset()
+            self.started = record["ts"]
+        elif event == "collected":
+            self.collected = record["count"]
+        elif event == "finish":
+            self.finished = record["exitstatus"]
+            self.last = record["ts"]
+        elif "nodeid" in record:
+            self.started = self.started or record["ts"]
+            self.last = record["ts"]
+            outcome = record["outcome"]
+            if outcome == "passed" and record["when"] != "call":
+                return
+            self.counts[outcome] += 1
+            # A test is done after its call, or after a setup that did not pass
+            if record["when"] != "teardown":
+                self.done += 1
+
+    def line(self) -> str:
+        elapsed = (self.last or time.time()) - (self.started or time.time())
+        total = f"/{self.collected}" if self.collected is not None else ""
+        counts = " ".join(f"{name} {count}" for name, count in sorted(self.counts.items()))
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        return f"{self.done}{total} tests | {counts or 'no results'} | {rate:.1f} tests/s | {elapsed:.0f}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live view of an NDJSON test result stream")
+    parser.add_argument("path", nargs="?", type=Path, default=DEFAULT_REPORT_PATH,
+                        help=f"NDJSON report (default {DEFAULT_REPORT_PATH.relative_to(PROJECT_ROOT)})")
+    parser.add_argument("-f", "--follow", action="store_true",
+                        help="Keep reading until the run finishes")
+    args = parser.parse_args()
+
+    progress = Progress()
+    interactive = sys.stdout.isatty()
+    try:
+        for record in read_records(args.path, args.follow):
+            if record is not None:
+                progress.add(record)
+                if record.get("outcome") in ("failed", "error"):
+                    tc = f" [{record['tc']}]" if record.get("tc") else ""
+                    print(f"{CLEAR_LINE if interactive else ''}{record['outcome'].upper()} "
+                          f"{record['nodeid']}{tc}")
+            if interactive:
+                print(f"{CLEAR_LINE}{progress.line()}", end="", flush=True)
+            if progress.finished is not None and args.follow:
+                break
+    except KeyboardInterrupt:
+        pass
+    print(f"{CLEAR_LINE if interactive else ''}{progress.line()}")
+    if progress.finished is not None:
+        print(f"Run finished with exit status {progress.finished}")
+        return progress.finished
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+Client-side request timing
+api_client / APITestInspector 요청의 연결 시간, TTFB, 전체 시간, payload 크기를 측정하고 엔드포인트·테스트별로 집계
+
+TimingHTTPAdapter measures each request at the transport level: time spent
+opening TCP connections (0 for a reused keep-alive connection) and time to
+the response headers (TTFB, connect included). The response hook
+(RequestTimingPlugin.hook) then reads the body and adds total time and payload
+sizes. With --request-timing the slowest endpoints and tests are printed
+at the end of the run and written as JSON.
+
+Usage:
+    pytest tests/api/ --request-timing                       # reports/request_timing.json
+    pytest tests/api/ -n 4 --request-timing=/tmp/timing.json
+"""
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from endpoints import endpoint_key
+
+PROJECT_ROOT = Path(__file__).parent
+DEFAULT_REPORT_PATH = PROJECT_ROOT / "reports" / "request_timing.json"
+
+# Rows per table in the terminal summary
+TOP = 10
+
+# Connect time of the request running on this thread
+_connects = threading.local()
+
+
+class RequestTiming(NamedTuple):
+    """Timing of one request; times in seconds, sizes in bytes"""
+    endpoint: str
+    status: int
+    connect: float
+    ttfb: float
+    total: float
+    sent: int
+    received: int
+
+
+def _timed_connect(connect):
+    def timed(self):
+        start = time.perf_counter()
+        try:
+            return connect(self)
+        finally:
+            _connects.seconds = getattr(_connects, "seconds", 0.0) + time.perf_counter() - start
+    return timed
+
+
+class TimedHTTPConnection(HTTPConnection):
+    connect = _timed_connect(HTTPConnection.connect)
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    connect = _timed_connect(HTTPSConnection.connect)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that stamps responses with connect time and TTFB"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        _connects.seconds = 0.0
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        # The body is not read yet (requests reads it after the hooks)
+        response.timing_start = start
+        response.timing_connect = _connects.seconds
+        response.timing_ttfb = time.perf_counter() - start
+        return response
+
+
+def measure(response: requests.Response) -> Optional[RequestTiming]:
+    """
+    Complete the adapter's timing by reading the body
+
+    Returns:
+        None for responses that did not go through a TimingHTTPAdapter
+        (e.g. replayed from a cassette)
+    """
+    start = getattr(response, "timing_start", None)
+    if start is None:
+        return None
+    received = len(response.content)
+    total = time.perf_counter() - start
+    request = response.request
+    return RequestTiming(
+        endpoint_key(request.method, request.url),
+        response.status_code,
+        response.timing_connect,
+        response.timing_ttfb,
+        total,
+        len(request.body or b""),
+        received,
+    )
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+class TimingStats:
+    """Aggregate of the requests of one endpoint or one test"""
+
+    def __init__(self):
+        self.totals: List[float] = []
+        self.ttfb = 0.0
+        self.connect = 0.0
+        self.connections = 0
+        self.sent = 0
+        self.received = 0
+
+    def add(self, timing: RequestTiming):
+        self.totals.append(timing.total)
+        self.ttfb += timing.ttfb
+        self.connect += timing.connect
+        self.connections += timing.connect > 0
+        self.sent += timing.sent
+        self.received += timing.received
+
+    @property
+    def count(self) -> int:
+        return len(self.totals)
+
+    @property
+    def total(self) -> float:
+        return sum(self.totals)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": round(self.total, 6),
+            "mean": round(self.total / self.count, 6),
+            "p95": round(percentile(self.totals, 0.95), 6),
+            "max": round(max(self.totals), 6),
+            "ttfb_mean": round(self.ttfb / self.count, 6),
+            "connect_total": round(self.connect, 6),
+            "connections": self.connections,
+            "sent": self.sent,
+            "received": self.received,
+        }
+
+
+class RequestTimings:
+    """Request timings aggregated per endpoint ("POST /api/register") and per test"""
+
+    def __init__(self):
+        self.endpoints: Dict[str, TimingStats] = defaultdict(TimingStats)
+        self.tests: Dict[str, TimingStats] = defaultdict(TimingStats)
+        self.lock = threading.Lock()
+
+    def add(self, test: str, timings: Iterable[RequestTiming]):
+        with self.lock:
+            for timing in timings:
+                self.endpoints[timing.endpoint].add(timing)
+                self.tests[test].add(timing)
+
+    @property
+    def requests(self) -> int:
+        return sum(stats.count for stats in self.endpoints.values())
+
+    def slowest(self, table: Dict[str, TimingStats], key: str) -> List[Dict[str, Any]]:
+        rows = [{key: name, **stats.to_json()} for name, stats in table.items()]
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "endpoints": self.slowest(self.endpoints, "endpoint"),
+            "tests": self.slowest(self.tests, "test"),
+        }
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_json(), f, indent=2, ensure_ascii=False)
+
+    def render(self, top: int = TOP) -> List[str]:
+        """Slowest endpoints and tests by total request time"""
+        header = f"{'total ms':>9} {'count':>5} {'mean ms':>8} {'p95 ms':>8} {'ttfb ms':>8} {'conns':>5} {'recv B':>8}"
+        lines = []
+        for key, table in (("endpoint", self.endpoints), ("test", self.tests)):
+            lines.append(f"{header}  slowest {key}s")
+            for row in self.slowest(table, key)[:top]:
+                lines.append(f"{row['total'] * 1000:>9.1f} {row['count']:>5} {row['mean'] * 1000:>8.2f} "
+                             f"{row['p95'] * 1000:>8.2f} {row['ttfb_mean'] * 1000:>8.2f} "
+                             f"{row['connections']:>5} {row['received']:>8}  {row[key]}")
+            lines.append("")
+        return lines[:-1]
+
+
+class RequestTimingPlugin:
+    """
+    pytest plugin collecting api_client request timings
+
+    Timings are recorded in the process running the test and travel to the
+    xdist controller on the teardown report (report.request_timings).
+    """
+
+    def __init__(self, config, path: Path):
+        self.config = config
+        self.path = path
+        self.worker = hasattr(config, "workerinput")
+        self.timings = RequestTimings()
+        self.current: Optional[List[RequestTiming]] = None
+
+    def hook(self, response: requests.Response, *args, **kwargs) -> requests.Response:
+        """requests response hook, added to api_client before the other hooks"""
+        if self.current is not None:
+            timing = measure(response)
+            if timing is not None:
+                self.current.append(timing)
+        return response
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        self.current = []
+        yield
+        self.current = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when == "teardown" and self.current:
+            # Plain tuples so xdist can serialize them
+            report.request_timings = [tuple(timing) for timing in self.current]
+
+    def pytest_runtest_logreport(self, report):
+        timings = getattr(report, "request_timings", None)
+        if timings and not self.worker:
+            self.timings.add(report.nodeid, (RequestTiming(*timing) for timing in timings))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.worker or not self.timings.requests:
+            return
+        terminalreporter.section(f"request timing ({self.timings.requests} requests)")
+        for line in self.timings.render():
+            terminalreporter.line(line)
+        terminalreporter.line(f"Written to {self.path}")
+
+    def pytest_sessionfinish(self, session):
+        if not self.worker and self.timings.requests:
+            self.timings.save(self.path)
+
+
+def add_options(parser):
+    group = parser.getgroup("timing", "Client-side request timing")
+    group.addoption("--request-timing", metavar="PATH", nargs="?", default=None,
+                    const=str(DEFAULT_REPORT_PATH),
+                    help="Time api_client requests (connect, TTFB, total, sizes) and report the "
+                         "slowest endpoints and tests, as JSON to PATH (default "
+                         f"{DEFAULT_REPORT_PATH.relative_to(PROJECT_ROOT)})")
+
+
+def configure(config):
+    path = config.getoption("--request-timing")
+    if path and not config.option.collectonly:
+        config.pluginmanager.register(RequestTimingPlugin(config, Path(path)), "request_timing")
+
+
+def get_timer(config) -> Optional[RequestTimingPlugin]:
+    """The timing plugin of a --request-timing run, else None"""
+    return config.pluginmanager.get_plugin("request_timing")
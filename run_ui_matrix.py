@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Cross-browser UI test runner
+UI 테스트를 브라우저(chromium/firefox/webkit) x 워커 샤드로 나눠 병렬 실행하고 Allure 결과를 하나로 합치는 스크립트
+
+Each browser's tests are split into --workers shards by measured duration
+(duration_history.py, longest first), and every shard runs as its own
+pytest process at the same time. Shards share the mock server daemon and
+each one gets its own namespace. They all write to the same --alluredir,
+so results and failure screenshots end up in one report. Shard durations
+are read back from JUnit XML and added to the history for the next run.
+
+Usage:
+    python3 run_ui_matrix.py                                  # 3 browsers x 2 workers
+    python3 run_ui_matrix.py --browsers chromium,firefox --workers 3
+    python3 run_ui_matrix.py --clean-alluredir -- -m "not offline"
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import requests
+
+from duration_history import DEFAULT_HISTORY_PATH, DurationHistory, lpt_schedule, makespan
+
+# Try to import colorama for colored output, fallback to no colors
+try:
+    from colorama import Fore, Style, init
+    init(autoreset=True)
+except ImportError:
+    class Fore:
+        CYAN = YELLOW = GREEN = MAGENTA = BLUE = RED = ""
+        RESET = ""
+    class Style:
+        RESET_ALL = ""
+
+PROJECT_ROOT = Path(__file__).parent
+UI_TESTS = "tests/ui"
+SHARDS_DIR = PROJECT_ROOT / "reports" / "ui_matrix"
+BROWSERS = ("chromium", "firefox", "webkit")
+
+
+class Shard(NamedTuple):
+    name: str
+    browser: str
+    nodeids: List[str]
+    predicted: float
+
+    @property
+    def namespace(self) -> str:
+        return f"ui-{self.name}"
+
+
+def collect(browser: str, pytest_args: List[str]) -> List[str]:
+    """Collect the UI test nodeids for one browser"""
+    # pytest.ini addopts has -v, which turns -q back into the full tree;
+    # clear it so one nodeid is printed per line
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", UI_TESTS, "-o", "addopts=", "-p", "no:cacheprovider",
+         "--browser", browser, *pytest_args, "--collect-only", "-q"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    if result.returncode not in (0, 5):  # 5 = no tests collected
+        raise RuntimeError(f"Collection failed for {browser}:\n{result.stdout}{result.stderr}")
+    return [line.strip() for line in result.stdout.splitlines()
+            if line.startswith(f"{UI_TESTS}/") and "::" in line]
+
+
+def junit_durations(path: Path) -> Dict[str, float]:
+    """Read nodeid -> seconds from a JUnit XML report (junit_family=xunit1)"""
+    if not path.exists():
+        return {}
+    durations = {}
+    for case in ET.parse(path).iter("testcase"):
+        file = case.get("file")
+        if not file:
+            continue
+        module = file[:-3].replace("/", ".") if file.endswith(".py") else file
+        classes = case.get("classname", "")[len(module) + 1:]
+        parts = [file, *(classes.split(".") if classes else []), case.get("name")]
+        durations["::".join(parts)] = float(case.get("time") or 0)
+    return durations
+
+
+def plan(browsers: List[str], workers: int, pytest_args: List[str],
+         history: DurationHistory) -> List[Shard]:
+    """Split every browser's tests into workers shards, longest first"""
+    estimate = history.estimator()
+    shards = []
+    for browser in browsers:
+        nodeids = collect(browser, pytest_args)
+        groups, loads = lpt_schedule(nodeids, min(workers, len(nodeids)) or 1, estimate)
+        for index, (group, load) in enumerate(zip(groups, loads)):
+            if group:
+                shards.append(Shard(f"{browser}-{index}", browser, group, load))
+    return shards
+
+
+def start_shard(shard: Shard, alluredir: Path, pytest_args: List[str]) -> subprocess.Popen:
+    """Launch one shard as a pytest process in its own mock server namespace"""
+    env = {
+        **os.environ,
+        "MOCK_SERVER_ISOLATION": "namespace",
+        "TEST_NAMESPACE": shard.namespace,
+    }
+    command = [
+        sys.executable, "-m", "pytest", *shard.nodeids,
+        "--browser", shard.browser,
+        "--alluredir", str(alluredir),
+        "--junitxml", str(SHARDS_DIR / f"{shard.name}.xml"),
+        "-o", "junit_family=xunit1",
+        "-p", "no:cacheprovider",
+        # Shards run concurrently; the runner records their durations once
+        "--no-duration-record",
+        *pytest_args,
+    ]
+    # The child keeps its own copy of the log descriptor
+    with open(SHARDS_DIR / f"{shard.name}.log", "w", encoding="utf-8") as log:
+        return subprocess.Popen(command, cwd=PROJECT_ROOT, env=env, stdout=log,
+                                stderr=subprocess.STDOUT)
+
+
+def ensure_server() -> Optional[str]:
+    """Start (or reuse) the mock server daemon the shards share"""
+    if os.getenv("SKIP_SERVER_STARTUP") == "true":
+        return None
+    import mock_server_ctl
+    return mock_server_ctl.ensure_daemon(start=True)
+
+
+def drop_namespaces(base_url: str, shards: List[Shard]):
+    """Drop the shards' namespaces so the shared server does not keep their routers"""
+    with requests.Session() as session:
+        for shard in shards:
+            try:
+                session.delete(f"{base_url}/__admin/namespaces/{shard.namespace}", timeout=5)
+            except requests.RequestException as e:
+                print(f"Could not drop namespace {shard.namespace}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the UI suite across browsers and parallel workers",
+        epilog="Arguments after -- are passed to every pytest process"
+    )
+    parser.add_argument("--browsers", default=",".join(BROWSERS),
+                        help=f"Comma separated browsers (default {','.join(BROWSERS)})")
+    parser.add_argument("--workers", type=int, default=2, help="Parallel shards per browser")
+    parser.add_argument("--alluredir", type=Path, default=PROJECT_ROOT / "allure-results",
+                        help="Allure results directory shared by all shards")
+    parser.add_argument("--clean-alluredir", action="store_true",
+                        help="Remove previous Allure results before running")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY_PATH,
+                        help="Duration history file used to balance shards")
+    args, pytest_args = parser.parse_known_args()
+    pytest_args = [arg for arg in pytest_args if arg != "--"]
+    browsers = [name.strip() for name in args.browsers.split(",") if name.strip()]
+
+    if args.clean_alluredir and args.alluredir.exists():
+        shutil.rmtree(args.alluredir)
+    args.alluredir.mkdir(parents=True, exist_ok=True)
+    SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+
+    base_url = ensure_server()
+    if base_url:
+        print(f"Using Mock Server daemon at {base_url}")
+
+    history = DurationHistory(args.history)
+    shards = plan(browsers, args.workers, pytest_args, history)
+    if not shards:
+        print("No UI tests collected")
+        return 5
+    print(f"{len(shards)} shards ({len(browsers)} browsers x up to {args.workers} workers), "
+          f"predicted makespan {makespan([shard.predicted for shard in shards]):.1f}s")
+
+    started = time.perf_counter()
+    processes = [(shard, start_shard(shard, args.alluredir, pytest_args)) for shard in shards]
+    finished = {}
+    while len(finished) < len(processes):
+        for shard, process in processes:
+            if shard.name not in finished and process.poll() is not None:
+                finished[shard.name] = (process.returncode, time.perf_counter() - started)
+        time.sleep(0.1)
+    elapsed = time.perf_counter() - started
+    drop_namespaces(base_url or os.getenv("API_BASE_URL", "http://localhost:3000"), shards)
+
+    print(f"\n{Fore.CYAN}{'='*80}")
+    print(f"{Fore.YELLOW}{'UI MATRIX SUMMARY':^80}")
+    print(f"{Fore.CYAN}{'='*80}{Style.RESET_ALL}\n")
+    failed = 0
+    for shard in shards:
+        returncode, actual = finished[shard.name]
+        for nodeid, seconds in junit_durations(SHARDS_DIR / f"{shard.name}.xml").items():
+            history.record(nodeid, seconds)
+        ok = returncode in (0, 5)
+        failed += not ok
+        color = Fore.GREEN if ok else Fore.RED
+        print(f"{color}{shard.name:<12} {'PASS' if ok else 'FAIL':<5}{Style.RESET_ALL} "
+              f"{len(shard.nodeids):>3} tests  predicted {shard.predicted:6.1f}s  "
+              f"actual {actual:6.1f}s  (log: {SHARDS_DIR / (shard.name + '.log')})")
+    history.save()
+
+    print(f"\nWall time: {elapsed:.1f}s | Allure results: {args.alluredir}")
+    if failed:
+        print(f"{Fore.RED}{failed} shard(s) failed{Style.RESET_ALL}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
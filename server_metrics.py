@@ -0,0 +1,116 @@
+"""
+Mock server metrics scraping
+Mock 서버 /metrics(Prometheus 텍스트)를 테스트 전후로 수집해 서버 측 처리 시간을 계산
+
+The mock server keeps latency histograms per route and outcome and per
+/api/register validation stage (mock_server/metrics.js). Scraping before
+and after a test and subtracting gives the server time that test caused,
+separate from client and network time.
+"""
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import requests
+
+try:
+    import allure
+except ImportError:
+    allure = None
+
+REQUEST_METRIC = "mock_http_request_duration_seconds"
+STAGE_METRIC = "mock_register_stage_duration_seconds"
+
+SAMPLE_PATTERN = re.compile(r"^(\w+)(?:\{(.*)\})? (\S+)$")
+LABEL_PATTERN = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+Labels = Tuple[Tuple[str, str], ...]
+Samples = Dict[Tuple[str, Labels], float]
+
+
+class Series(NamedTuple):
+    """Count and total seconds of one histogram series"""
+    labels: Dict[str, str]
+    count: int
+    seconds: float
+
+
+def parse(text: str) -> Samples:
+    """Parse Prometheus text exposition into {(name, labels): value}"""
+    samples: Samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = SAMPLE_PATTERN.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        labels = tuple(LABEL_PATTERN.findall(labels or ""))
+        samples[(name, labels)] = float(value)
+    return samples
+
+
+def scrape(base_url: str, namespace: str = "", session: requests.Session = None,
+           timeout: float = 2) -> Optional[Samples]:
+    """
+    Current metrics of a namespace ("" for the default database)
+
+    Returns:
+        Parsed samples, or None if the server has no /metrics endpoint
+    """
+    headers = {"X-Test-Namespace": namespace} if namespace else {}
+    try:
+        response = (session or requests).get(f"{base_url.rstrip('/')}/metrics",
+                                             headers=headers, timeout=timeout)
+    except requests.RequestException:
+        return None
+    if response.status_code != 200:
+        return None
+    samples = parse(response.text)
+    # Without a namespace header every namespace is returned
+    return {key: value for key, value in samples.items()
+            if dict(key[1]).get("namespace", "") == namespace}
+
+
+def delta(before: Samples, after: Samples) -> Samples:
+    """Samples that grew between two scrapes (counters only go up)"""
+    return {key: value - before.get(key, 0.0) for key, value in after.items()
+            if value != before.get(key, 0.0)}
+
+
+def series(samples: Samples, metric: str) -> List[Series]:
+    """Count/sum pairs of a histogram, slowest total first"""
+    sums = {labels: value for (name, labels), value in samples.items() if name == f"{metric}_sum"}
+    result = []
+    for (name, labels), value in samples.items():
+        if name == f"{metric}_count" and value:
+            label_map = {key: val for key, val in labels if key != "namespace"}
+            result.append(Series(label_map, int(value), sums.get(labels, 0.0)))
+    return sorted(result, key=lambda entry: entry.seconds, reverse=True)
+
+
+def total_seconds(samples: Samples) -> float:
+    """Server time of all requests in the samples"""
+    return sum(entry.seconds for entry in series(samples, REQUEST_METRIC))
+
+
+def render(samples: Samples) -> str:
+    """Human readable table of a metrics delta"""
+    lines = [f"Server time: {total_seconds(samples) * 1000:.2f} ms", "",
+             f"{'route':<36} {'outcome':<18} {'count':>5} {'total ms':>9} {'avg ms':>8}"]
+    for entry in series(samples, REQUEST_METRIC):
+        route = f"{entry.labels.get('method', '')} {entry.labels.get('route', '')}"
+        lines.append(f"{route:<36} {entry.labels.get('outcome', ''):<18} {entry.count:>5} "
+                     f"{entry.seconds * 1000:>9.3f} {entry.seconds * 1000 / entry.count:>8.3f}")
+    stages = series(samples, STAGE_METRIC)
+    if stages:
+        lines += ["", f"{'register stage':<36} {'':<18} {'count':>5} {'total ms':>9} {'avg ms':>8}"]
+        for entry in stages:
+            lines.append(f"{entry.labels.get('stage', ''):<36} {'':<18} {entry.count:>5} "
+                         f"{entry.seconds * 1000:>9.3f} {entry.seconds * 1000 / entry.count:>8.3f}")
+    return "\n".join(lines)
+
+
+def attach(samples: Samples, name: str = "Server metrics"):
+    """Attach a metrics delta to the Allure report (no-op without allure)"""
+    if allure is not None and samples:
+        allure.attach(render(samples), name=name, attachment_type=allure.attachment_type.TEXT)
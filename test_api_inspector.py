@@ -5,12 +5,17 @@ API Test Case Inspector
 """
 
 import requests
+import argparse
 import json
-import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Tuple
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
 import uuid
+from exchange_recorder import DEFAULT_CAPACITY, ExchangeRecorder
+from request_timing import RequestTimings, TimingHTTPAdapter, measure
 # Try to import colorama for colored output, fallback to no colors
 try:
     from colorama import Fore, Style, init
@@ -26,46 +31,100 @@ except ImportError:
     HAS_COLOR = False
 
 class APITestInspector:
-    def __init__(self, base_url: str = "http://localhost:3000"):
+    # Test cases in execution order, grouped by category
+    TEST_GROUPS = [
+        ("POSITIVE TEST CASES", [
+            "test_tc001_valid_registration",
+            "test_tc002_email_with_plus",
+            "test_tc003_korean_domain",
+        ]),
+        ("NEGATIVE TEST CASES", [
+            "test_tc005_invalid_email_no_at",
+            "test_tc008_password_too_short",
+            "test_tc010_password_no_lowercase",
+        ]),
+        ("SECURITY TEST CASES", [
+            "test_tc018_sql_injection",
+            "test_tc020_xss_bypass",
+        ]),
+        ("DUPLICATE TEST CASES", [
+            "test_tc024_duplicate_email",
+        ]),
+    ]
+    
+    # Educational bug cases return the status code; 200 means the bug is active
+    BUG_CASES = {"TC-008", "TC-010", "TC-020", "TC-024"}
+    
+    def __init__(self, base_url: str = "http://localhost:3000", workers: int = 8,
+                 verbose: bool = True, exchanges: str = "all",
+                 buffer_size: int = DEFAULT_CAPACITY, timing_path: str = None):
         self.base_url = base_url
+        self.verbose = verbose
+        # "all" prints every request/response as it happens, "failed" keeps
+        # them in a per-case ring buffer and prints them only for failed cases
+        self.exchanges = exchanges
+        self.buffer_size = buffer_size
         self.session = requests.Session()
+        # Shared connection pool sized for concurrent cases
+        adapter = TimingHTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.workers = workers
         self.results = []
+        # Connect/TTFB/total time of every request, per endpoint and per case
+        self.timings = RequestTimings()
+        self.timing_path = timing_path
+        # Per-thread output buffer so concurrent cases don't interleave
+        self._output = threading.local()
+    
+    def emit(self, text: str = ""):
+        """Print a line, or buffer it when running inside a concurrent case"""
+        buffer = getattr(self._output, "buffer", None)
+        if buffer is not None:
+            buffer.append(text)
+        else:
+            print(text)
         
     def print_header(self, title: str):
         """Print a formatted header"""
-        print(f"\n{Fore.CYAN}{'='*80}")
-        print(f"{Fore.YELLOW}{title:^80}")
-        print(f"{Fore.CYAN}{'='*80}{Style.RESET_ALL}\n")
+        self.emit(f"\n{Fore.CYAN}{'='*80}")
+        self.emit(f"{Fore.YELLOW}{title:^80}")
+        self.emit(f"{Fore.CYAN}{'='*80}{Style.RESET_ALL}\n")
     
     def print_test_case(self, tc_id: str, description: str):
         """Print test case information"""
-        print(f"{Fore.GREEN}[{tc_id}] {description}{Style.RESET_ALL}")
+        self.emit(f"{Fore.GREEN}[{tc_id}] {description}{Style.RESET_ALL}")
         
     def print_request(self, method: str, url: str, data: Dict[str, Any] = None):
         """Print request details"""
-        print(f"\n{Fore.MAGENTA}📤 REQUEST:")
-        print(f"  Method: {method}")
-        print(f"  URL: {url}")
+        if self.exchanges == "failed":
+            return
+        self.emit(f"\n{Fore.MAGENTA}📤 REQUEST:")
+        self.emit(f"  Method: {method}")
+        self.emit(f"  URL: {url}")
         if data:
-            print(f"  Body: {json.dumps(data, indent=4)}")
+            self.emit(f"  Body: {json.dumps(data, indent=4 if self.verbose else None, ensure_ascii=False)}")
     
     def print_response(self, response: requests.Response):
-        """Print response details"""
-        print(f"\n{Fore.BLUE}📥 RESPONSE:")
-        print(f"  Status: {response.status_code}")
-        print(f"  Headers: {dict(response.headers)}")
+        """Print response details (headers only in verbose mode)"""
+        if self.exchanges == "failed":
+            return
+        self.emit(f"\n{Fore.BLUE}📥 RESPONSE:")
+        self.emit(f"  Status: {response.status_code}")
+        if self.verbose:
+            self.emit(f"  Headers: {dict(response.headers)}")
         try:
             body = response.json()
-            print(f"  Body: {json.dumps(body, indent=4)}")
+            self.emit(f"  Body: {json.dumps(body, indent=4 if self.verbose else None, ensure_ascii=False)}")
         except:
-            print(f"  Body: {response.text}")
+            self.emit(f"  Body: {response.text}")
     
     def print_validation(self, passed: bool, message: str):
         """Print validation result"""
         if passed:
-            print(f"{Fore.GREEN}  ✅ {message}")
+            self.emit(f"{Fore.GREEN}  ✅ {message}")
         else:
-            print(f"{Fore.RED}  ❌ {message}")
+            self.emit(f"{Fore.RED}  ❌ {message}")
     
     def make_request(self, method: str, endpoint: str, data: Dict[str, Any] = None) -> requests.Response:
         """Make HTTP request and return response"""
@@ -77,7 +136,13 @@ class APITestInspector:
             response = self.session.get(url)
         else:
             response = self.session.request(method, url, json=data)
-            
+        
+        timing = measure(response)
+        if timing is not None:
+            self.timings.add(getattr(self._output, "case", "-"), [timing])
+        recorder = getattr(self._output, "recorder", None)
+        if recorder is not None:
+            recorder.record(response)
         return response
     
     def test_tc001_valid_registration(self):
@@ -256,13 +321,13 @@ class APITestInspector:
         }
         
         # First registration
-        print(f"\n{Fore.CYAN}[첫 번째 등록 시도]")
+        self.emit(f"\n{Fore.CYAN}[첫 번째 등록 시도]")
         self.print_request("POST", f"{self.base_url}/api/register", data)
         response1 = self.make_request("POST", "/api/register", data)
         self.print_response(response1)
         
         # Second registration with same email
-        print(f"\n{Fore.CYAN}[두 번째 등록 시도 - 동일 이메일]")
+        self.emit(f"\n{Fore.CYAN}[두 번째 등록 시도 - 동일 이메일]")
         self.print_request("POST", f"{self.base_url}/api/register", data)
         response2 = self.make_request("POST", "/api/register", data)
         self.print_response(response2)
@@ -275,11 +340,67 @@ class APITestInspector:
         
         return response2.status_code
     
-    def run_all_tests(self):
-        """Run all test cases"""
+    def run_case(self, group: str, method_name: str) -> Dict[str, Any]:
+        """Run one test case and record its outcome"""
+        method = getattr(self, method_name)
+        tc_id = method.__doc__.split(":")[0].strip()
+        if self.exchanges == "failed":
+            self._output.recorder = ExchangeRecorder(self.buffer_size)
+        self._output.case = tc_id
+        started = time.perf_counter()
+        try:
+            outcome = method()
+            error = None
+        except Exception as e:
+            outcome = None
+            error = f"{type(e).__name__}: {e}"
+            self.print_validation(False, f"Test case raised {error}")
+        
+        result = {
+            "tc_id": tc_id,
+            "group": group,
+            "outcome": outcome,
+            "duration": time.perf_counter() - started,
+            "error": error,
+        }
+        if tc_id in self.BUG_CASES:
+            # Bug cases return the status code of the request under test
+            result["bug_detected"] = outcome == 200
+            result["passed"] = outcome is not None
+        else:
+            result["passed"] = outcome is True
+        
+        recorder = getattr(self._output, "recorder", None)
+        self._output.recorder = None
+        self._output.case = None
+        if recorder is not None and not result["passed"]:
+            # Serialize the buffered exchanges only for failed cases
+            for title, text in recorder.render():
+                self.emit(f"\n{Fore.MAGENTA}📤📥 {title}{Style.RESET_ALL}")
+                self.emit(text)
+        return result
+    
+    def run_case_buffered(self, group: str, method_name: str) -> Tuple[List[str], Dict[str, Any]]:
+        """Run one test case on a worker thread, capturing its output"""
+        self._output.buffer = []
+        try:
+            result = self.run_case(group, method_name)
+            return self._output.buffer, result
+        finally:
+            self._output.buffer = None
+    
+    def run_all_tests(self, concurrent: bool = False):
+        """
+        Run all test cases
+        
+        Args:
+            concurrent: Run independent cases in parallel on a thread pool
+                (no fixed sleeps; output is printed per case in order)
+        """
         self.print_header("API Test Case Inspector")
         print(f"Base URL: {self.base_url}")
         print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Mode: {'concurrent (' + str(self.workers) + ' workers)' if concurrent else 'sequential'}")
         
         # Check server connectivity
         print(f"\n{Fore.YELLOW}Checking server connectivity...")
@@ -290,45 +411,86 @@ class APITestInspector:
             print(f"{Fore.RED}❌ Server is not accessible: {e}{Style.RESET_ALL}")
             return
         
-        # Positive test cases
-        self.print_header("POSITIVE TEST CASES")
-        self.test_tc001_valid_registration()
-        time.sleep(0.5)
-        self.test_tc002_email_with_plus()
-        time.sleep(0.5)
-        self.test_tc003_korean_domain()
-        
-        # Negative test cases
-        self.print_header("NEGATIVE TEST CASES")
-        self.test_tc005_invalid_email_no_at()
-        time.sleep(0.5)
-        self.test_tc008_password_too_short()
-        time.sleep(0.5)
-        self.test_tc010_password_no_lowercase()
-        
-        # Security test cases
-        self.print_header("SECURITY TEST CASES")
-        self.test_tc018_sql_injection()
-        time.sleep(0.5)
-        self.test_tc020_xss_bypass()
-        
-        # Duplicate test cases
-        self.print_header("DUPLICATE TEST CASES")
-        self.test_tc024_duplicate_email()
-        
-        # Summary
+        self.results = []
+        started = time.perf_counter()
+        
+        if concurrent:
+            # Cases use unique emails, so they are independent of each other;
+            # the duplicate case keeps its two requests in order on one thread
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [
+                    (group, executor.submit(self.run_case_buffered, group, name))
+                    for group, names in self.TEST_GROUPS
+                    for name in names
+                ]
+                current_group = None
+                for group, future in futures:
+                    lines, result = future.result()
+                    if group != current_group:
+                        self.print_header(group)
+                        current_group = group
+                    for line in lines:
+                        print(line)
+                    self.results.append(result)
+        else:
+            for group, names in self.TEST_GROUPS:
+                self.print_header(group)
+                for i, name in enumerate(names):
+                    if i:
+                        time.sleep(0.5)
+                    self.results.append(self.run_case(group, name))
+        
+        self.print_summary(time.perf_counter() - started)
+    
+    def print_summary(self, elapsed: float):
+        """Print a summary computed from the collected results"""
+        bug_results = [r for r in self.results if r["tc_id"] in self.BUG_CASES]
+        bugs_detected = [r["tc_id"] for r in bug_results if r.get("bug_detected")]
+        failed = [r for r in self.results if not r["passed"]]
+        slowest = max(self.results, key=lambda r: r["duration"], default=None)
+        
         self.print_header("TEST EXECUTION SUMMARY")
-        print(f"{Fore.CYAN}Total test cases executed: 9")
-        print(f"{Fore.YELLOW}Educational bugs tested: 4 (TC-008, TC-010, TC-020, TC-024)")
+        print(f"{Fore.CYAN}Total test cases executed: {len(self.results)}")
+        print(f"{Fore.GREEN}Passed: {len(self.results) - len(failed)}")
+        if failed:
+            print(f"{Fore.RED}Failed: {len(failed)} ({', '.join(r['tc_id'] for r in failed)})")
+        print(f"{Fore.YELLOW}Educational bugs tested: {len(bug_results)} "
+              f"({', '.join(r['tc_id'] for r in bug_results)})")
+        print(f"{Fore.YELLOW}Educational bugs detected: {len(bugs_detected)}"
+              + (f" ({', '.join(bugs_detected)})" if bugs_detected else ""))
+        print(f"{Fore.CYAN}Elapsed: {elapsed:.2f}s"
+              + (f" (slowest case: {slowest['tc_id']} {slowest['duration']:.2f}s)" if slowest else ""))
+        if self.timings.requests:
+            print(f"\n{Fore.CYAN}Request timing ({self.timings.requests} requests):{Style.RESET_ALL}")
+            for line in self.timings.render(top=5):
+                print(f"  {line}")
+            if self.timing_path:
+                self.timings.save(Path(self.timing_path))
+                print(f"  Written to {self.timing_path}")
         print(f"\n{Fore.GREEN}Test inspection completed successfully!{Style.RESET_ALL}")
 
 def main():
-    # Check if custom URL is provided
-    base_url = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:3000"
+    parser = argparse.ArgumentParser(description="API Test Case Inspector")
+    parser.add_argument("base_url", nargs="?", default="http://localhost:3000")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="Run independent test cases in parallel")
+    parser.add_argument("--workers", type=int, default=8, help="Thread pool size for --concurrent")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Print full headers and pretty bodies (default unless --concurrent)")
+    parser.add_argument("--exchanges", choices=["all", "failed"], default="all",
+                        help="Print every request/response (default) or only those of failed cases")
+    parser.add_argument("--exchange-buffer", type=int, default=DEFAULT_CAPACITY,
+                        help=f"Exchanges kept per case with --exchanges failed (default {DEFAULT_CAPACITY})")
+    parser.add_argument("--timing-json", metavar="PATH",
+                        help="Write request timings per endpoint and per case as JSON")
+    args = parser.parse_args()
     
     # Create inspector and run tests
-    inspector = APITestInspector(base_url)
-    inspector.run_all_tests()
+    inspector = APITestInspector(args.base_url, workers=args.workers,
+                                 verbose=args.verbose or not args.concurrent,
+                                 exchanges=args.exchanges, buffer_size=args.exchange_buffer,
+                                 timing_path=args.timing_json)
+    inspector.run_all_tests(concurrent=args.concurrent)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,16 +2,17 @@
 Base class for API tests
 """
 import pytest
-import json
 import allure
+import requests
 from typing import Dict, Any, Optional
 from datetime import datetime
+from validation_oracle import is_valid_email, password_checks
 
 class BaseAPITest:
     """Base class providing common functionality for API tests"""
     
     @pytest.fixture(autouse=True)
-    def setup_api_test(self, api_client, api_endpoints, test_data):
+    def setup_api_test(self, request, api_client, api_base_url, api_endpoints, test_data):
         """Setup for each API test"""
         self.client = api_client
         self.endpoints = api_endpoints
@@ -20,11 +21,27 @@ class BaseAPITest:
         
         yield
         
-        # Cleanup created users
+        # When reset_database actually reset the server, the baseline is
+        # restored before the next test and deleting this test's users
+        # would be wasted work; replayed tests have no server to clean up
+        if (not self.created_users or request.getfixturevalue("reset_database")
+                or request.config.getoption("--cassette-mode") == "replay"):
+            return
+        
+        # Cleanup created users in one round-trip (bulk teardown endpoint)
+        try:
+            response = self.client.post(f"{api_base_url}/__admin/users/delete",
+                                        json={"ids": self.created_users})
+            if response.status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        
+        # Fallback for servers without the bulk teardown endpoint
         for user_id in self.created_users:
             try:
                 self.client.delete(f"{self.endpoints['users']}/{user_id}")
-            except:
+            except requests.RequestException:
                 pass
     
     def register_user(self, email: str, password: str, 
@@ -51,18 +68,8 @@ class BaseAPITest:
                 self.endpoints["register"],
                 json=payload
             )
-            
-            allure.attach(
-                json.dumps(payload, indent=2),
-                name="Request Payload",
-                attachment_type=allure.attachment_type.JSON
-            )
-            
-            allure.attach(
-                json.dumps(response.json() if response.text else {}, indent=2),
-                name="Response Body",
-                attachment_type=allure.attachment_type.JSON
-            )
+            # Request/response are recorded by the api_client exchange
+            # recorder and attached to Allure only if the test fails
             
             assert response.status_code == expected_status, \
                 f"Expected status {expected_status}, got {response.status_code}"
@@ -118,16 +125,8 @@ class BaseAPITest:
         Returns:
             Dictionary with validation results
         """
-        validations = {
-            "min_length": len(password) >= 8,
-            "has_lowercase": any(c.islower() for c in password),
-            "has_uppercase": any(c.isupper() for c in password),
-            "has_digit": any(c.isdigit() for c in password),
-            "has_special": any(c in "@$!%*?&" for c in password)
-        }
-        
-        validations["is_valid"] = all(validations.values())
-        return validations
+        # Same precompiled rules as the middleware (see validation_oracle.py)
+        return password_checks(password)
     
     def validate_email_format(self, email: str) -> bool:
         """
@@ -139,9 +138,8 @@ class BaseAPITest:
         Returns:
             True if valid email format, False otherwise
         """
-        import re
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email.strip()))
+        # Middleware format and security filters, without the BUG_* flags
+        return is_valid_email(email)
     
     def validate_timestamp(self, timestamp: str) -> bool:
         """
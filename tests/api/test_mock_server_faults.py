@@ -0,0 +1,172 @@
+"""
+Latency and fault injection tests for the mock server
+"""
+import pytest
+import allure
+import time
+import uuid
+import requests
+from urllib3.exceptions import ProtocolError
+from base_api_test import BaseAPITest
+
+@allure.feature("Mock Server")
+@allure.story("Fault Injection")
+@pytest.mark.live
+class TestMockServerFaults(BaseAPITest):
+
+    @pytest.fixture
+    def namespace_session(self, api_base_url, http_adapter):
+        """
+        Factory of clients bound to fresh mock server namespaces, on the
+        shared adapter (default timeouts); the namespaces and their fault
+        profiles are dropped after the test
+        """
+        namespaces = []
+
+        def create() -> requests.Session:
+            namespace = f"ns_{uuid.uuid4().hex[:8]}"
+            session = requests.Session()
+            session.mount("http://", http_adapter)
+            session.mount("https://", http_adapter)
+            session.headers.update({
+                "Content-Type": "application/json",
+                "X-Test-Namespace": namespace
+            })
+            namespaces.append(session)
+            return session
+
+        yield create
+
+        # Sessions are not closed: that would close the shared adapter
+        for session in namespaces:
+            namespace = session.headers["X-Test-Namespace"]
+            try:
+                session.delete(f"{api_base_url}/__admin/faults")
+                session.delete(f"{api_base_url}/__admin/namespaces/{namespace}")
+            except requests.RequestException:
+                pass
+
+    def faults_url(self) -> str:
+        return f"{self.endpoints['users'].rsplit('/', 1)[0]}/__admin/faults"
+
+    @allure.title("Injected delay applies only to the matching route")
+    @allure.severity("medium")
+    @pytest.mark.api
+    def test_fault_delay_per_route(self, namespace_session):
+        """Test that a fixed delay slows down its route and nothing else"""
+        session = namespace_session()
+        response = session.put(self.faults_url(), json={"GET /users": {"delay": 1000}})
+        assert response.status_code == 200
+
+        with allure.step("Delayed route"):
+            started = time.perf_counter()
+            assert session.get(self.endpoints["users"]).status_code == 200
+            assert time.perf_counter() - started >= 1.0
+
+        with allure.step("Other routes are not delayed"):
+            started = time.perf_counter()
+            response = session.post(self.endpoints["register"],
+                                    json={"email": "fast@test.com", "password": "Test1234!"})
+            assert response.status_code == 200
+            assert time.perf_counter() - started < 0.5
+
+    @allure.title("Injected jitter varies the delay of each request")
+    @allure.severity("low")
+    @pytest.mark.api
+    def test_fault_jitter(self, namespace_session):
+        """Test that uniform jitter adds a different extra delay per request"""
+        session = namespace_session()
+        profile = {"GET /users": {"delay": 100, "jitter": {"distribution": "uniform", "ms": 400}}}
+        assert session.put(self.faults_url(), json=profile).status_code == 200
+
+        elapsed = []
+        for _ in range(5):
+            started = time.perf_counter()
+            assert session.get(self.endpoints["users"]).status_code == 200
+            elapsed.append(time.perf_counter() - started)
+
+        assert min(elapsed) >= 0.1
+        # Five uniform draws over 400 ms all within 20 ms of each other is
+        # practically impossible
+        assert max(elapsed) - min(elapsed) > 0.02, elapsed
+
+    @allure.title("Injected errors are scoped to the namespace")
+    @allure.severity("medium")
+    @pytest.mark.api
+    def test_fault_errors_scoped_to_namespace(self, namespace_session):
+        """Test that error_rate 1 fails every request of one namespace only"""
+        faulty = namespace_session()
+        healthy = namespace_session()
+        response = faulty.put(self.faults_url(), json={"/users*": {"error_rate": 1, "status": 502}})
+        assert response.status_code == 200
+
+        response = faulty.get(self.endpoints["users"])
+        assert response.status_code == 502
+        assert response.json()["code"] == "FAULT_INJECTED"
+        assert healthy.get(self.endpoints["users"]).status_code == 200
+
+        with allure.step("Clearing the profile restores normal responses"):
+            assert faulty.delete(self.faults_url()).status_code == 200
+            assert faulty.get(self.endpoints["users"]).status_code == 200
+
+    @allure.title("Invalid fault profiles are rejected")
+    @allure.severity("low")
+    @pytest.mark.api
+    def test_invalid_fault_profile_rejected(self, namespace_session):
+        """Test that a profile with an out-of-range rate is refused"""
+        session = namespace_session()
+        response = session.put(self.faults_url(), json={"*": {"error_rate": 2}})
+        assert response.status_code == 400
+        assert response.json()["code"] == "INVALID_FAULT_PROFILE"
+
+    @allure.title("Client read timeout fires on a slow response")
+    @allure.severity("medium")
+    @pytest.mark.api
+    def test_client_timeout_on_slow_response(self, fault_profile):
+        """Test that api_client gives up on a response slower than its read timeout"""
+        # A read-only route: the server still answers after the client gave up
+        fault_profile({"GET /users": {"delay": 1000}})
+
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            self.client.get(self.endpoints["users"], timeout=(3.05, 0.2))
+
+    @allure.title("Client surfaces a connection reset without retrying")
+    @allure.severity("medium")
+    @pytest.mark.api
+    def test_client_connection_reset(self, fault_profile):
+        """Test that api_client raises ConnectionError on a reset and recovers afterwards"""
+        fault_profile({"GET /users": {"reset_rate": 1}})
+
+        with allure.step("Reset after the request was sent"):
+            with pytest.raises(requests.exceptions.ConnectionError) as error:
+                self.client.get(self.endpoints["users"])
+            # Raised as is, not as MaxRetryError: the request may have
+            # reached the server, so the adapter must not retry it
+            assert isinstance(error.value.args[0], ProtocolError), error.value
+
+        with allure.step("The pool replaces the dropped connection"):
+            fault_profile({})
+            assert self.client.get(self.endpoints["users"]).status_code == 200
+
+    @allure.title("Client read timeout applies per read on a slow-drip body")
+    @allure.severity("medium")
+    @pytest.mark.api
+    def test_client_slow_drip_body(self, fault_profile):
+        """Test that api_client times out on a stalled drip but not on a steady one"""
+        with allure.step("Pieces slower than the read timeout"):
+            fault_profile({"GET /users": {"drip": {"bytes": 8, "interval": 1000}}})
+            with pytest.raises(requests.exceptions.ReadTimeout):
+                self.client.get(self.endpoints["users"], timeout=(3.05, 0.5))
+
+        with allure.step("Pieces faster than the read timeout"):
+            self.register_user("drip@test.com", "Test1234!")
+            fault_profile({"GET /users": {"drip": {"bytes": 32, "interval": 100}}})
+            started = time.perf_counter()
+            response = self.client.get(self.endpoints["users"], timeout=(3.05, 0.5))
+            elapsed = time.perf_counter() - started
+            assert response.status_code == 200
+            assert [user["email"] for user in response.json()] == ["drip@test.com"]
+            # Each piece, the first included, waits one interval
+            pieces = -(-len(response.content) // 32)
+            assert pieces > 1
+            assert elapsed >= 0.1 * pieces - 0.05
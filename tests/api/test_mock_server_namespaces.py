@@ -0,0 +1,89 @@
+"""
+Namespace isolation and admin reset tests for the mock server
+"""
+import pytest
+import allure
+import uuid
+import requests
+from base_api_test import BaseAPITest
+
+@allure.feature("Mock Server")
+@allure.story("Namespace Isolation")
+@pytest.mark.live
+class TestMockServerNamespaces(BaseAPITest):
+
+    def namespace_session(self, namespace: str) -> requests.Session:
+        """Create a client bound to the given mock server namespace"""
+        session = requests.Session()
+        session.headers.update({
+            "Content-Type": "application/json",
+            "X-Test-Namespace": namespace
+        })
+        return session
+
+    @allure.title("Namespaces do not see each other's registrations")
+    @allure.severity("high")
+    @pytest.mark.api
+    def test_namespace_registrations_isolated(self):
+        """Test that a user registered in one namespace is invisible to another"""
+        first = self.namespace_session(f"ns_{uuid.uuid4().hex[:8]}")
+        second = self.namespace_session(f"ns_{uuid.uuid4().hex[:8]}")
+        payload = {"email": "isolated@test.com", "password": "Test1234!"}
+
+        with allure.step("Register the same email in two namespaces"):
+            assert first.post(self.endpoints["register"], json=payload).status_code == 200
+            assert second.post(self.endpoints["register"], json=payload).status_code == 200
+
+        with allure.step("Each namespace only sees its own user"):
+            users = first.get(self.endpoints["users"]).json()
+            assert [u["email"] for u in users] == [payload["email"]]
+
+    @allure.title("Namespace reset only clears its own data")
+    @allure.severity("medium")
+    @pytest.mark.api
+    def test_namespace_reset_scoped(self):
+        """Test that resetting one namespace leaves other namespaces untouched"""
+        base_url = self.endpoints["users"].rsplit("/", 1)[0]
+        first = self.namespace_session(f"ns_{uuid.uuid4().hex[:8]}")
+        second = self.namespace_session(f"ns_{uuid.uuid4().hex[:8]}")
+
+        for session in (first, second):
+            response = session.post(self.endpoints["register"],
+                                    json={"email": "reset@test.com", "password": "Test1234!"})
+            assert response.status_code == 200
+
+        with allure.step("Reset the first namespace"):
+            response = first.post(f"{base_url}/__admin/reset")
+            assert response.status_code == 200
+            assert response.json()["users"] == 0
+
+        assert first.get(self.endpoints["users"]).json() == []
+        assert len(second.get(self.endpoints["users"]).json()) == 1
+
+    @allure.title("Bulk teardown deletes users by id or by namespace")
+    @allure.severity("medium")
+    @pytest.mark.api
+    def test_bulk_delete_users(self):
+        """Test that the bulk teardown endpoint deletes users in one request"""
+        base_url = self.endpoints["users"].rsplit("/", 1)[0]
+        session = self.namespace_session(f"ns_{uuid.uuid4().hex[:8]}")
+
+        ids = []
+        for i in range(3):
+            response = session.post(self.endpoints["register"],
+                                    json={"email": f"bulk{i}@test.com", "password": "Test1234!"})
+            assert response.status_code == 200
+            ids.append(response.json()["id"])
+
+        with allure.step("Delete two users by id"):
+            response = session.post(f"{base_url}/__admin/users/delete", json={"ids": ids[:2]})
+            assert response.status_code == 200
+            assert response.json()["deleted"] == 2
+
+        assert [u["id"] for u in session.get(self.endpoints["users"]).json()] == ids[2:]
+
+        with allure.step("Delete the remaining users of the namespace"):
+            response = session.post(f"{base_url}/__admin/users/delete", json={})
+            assert response.json()["deleted"] == 1
+
+        assert session.get(self.endpoints["users"]).json() == []
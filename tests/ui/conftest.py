@@ -2,7 +2,10 @@
 UI test configuration and fixtures
 """
 import pytest
-from playwright.sync_api import Page, Browser, Playwright
+from typing import List, Tuple
+from playwright.sync_api import Page, Browser, BrowserContext, Playwright, expect
+from pages.network_stub import NetworkStub
+from impact_map import TRACE_HEADER, get_recorder
 
 # Allure를 옵셔널하게 import
 try:
@@ -12,26 +15,184 @@ except ImportError:
     ALLURE_AVAILABLE = False
 
 @pytest.fixture(scope="session")
-def browser_context_args():
+def browser_context_args(pytestconfig, test_namespace):
     """Browser context configuration"""
-    return {
+    args = {
         "viewport": {"width": 1920, "height": 1080},
         "ignore_https_errors": True,
     }
+    headers = {}
+    # Send the worker namespace with every browser request on a shared server
+    if test_namespace:
+        headers["X-Test-Namespace"] = test_namespace
+    # --impact=record: ask the server which validation branches ran
+    if get_recorder(pytestconfig):
+        headers[TRACE_HEADER] = "1"
+    if headers:
+        args["extra_http_headers"] = headers
+    return args
+
+# Remember the initial state of every element of a freshly loaded page.
+# Elements are kept by reference: the page script binds its listeners to
+# them, so they are restored in place instead of re-created.
+SNAPSHOT_PAGE_JS = """() => {
+    window.__qaBaseline = Array.from(document.body.querySelectorAll('*'), (el) => [
+        el,
+        el.getAttribute('class'),
+        el.getAttribute('style'),
+        el.children.length ? null : el.textContent,
+        'disabled' in el ? el.disabled : null,
+    ]);
+}"""
+
+# Restore the snapshot and clear storage; false if the page cannot be
+# restored in place (reloaded, DOM changed or a submit still in flight)
+RESTORE_PAGE_JS = """() => {
+    const baseline = window.__qaBaseline;
+    if (!baseline || document.body.querySelectorAll('*').length !== baseline.length) return false;
+    if (baseline.some(([el, , , , disabled]) => !el.isConnected
+            || (disabled !== null && el.disabled !== disabled))) return false;
+    // Blur first so blur listeners run before the state is overwritten
+    if (document.activeElement) document.activeElement.blur();
+    for (const form of document.forms) form.reset();
+    for (const [el, cls, style, text] of baseline) {
+        cls === null ? el.removeAttribute('class') : el.setAttribute('class', cls);
+        style === null ? el.removeAttribute('style') : el.setAttribute('style', style);
+        if (text !== null && el.textContent !== text) el.textContent = text;
+    }
+    localStorage.clear();
+    sessionStorage.clear();
+    window.scrollTo(0, 0);
+    return true;
+}"""
+
+class ContextPool:
+    """
+    Warm browser contexts of one worker, recycled between tests
+    
+    A context whose test passed is reset (cookies, storage, form DOM) and
+    handed to the next test already showing the registration page. Contexts
+    of failed tests are closed, so a broken page never leaks into another test.
+    """
+    
+    def __init__(self, browser: Browser, context_args: dict, url: str, size: int = 2,
+                 network_stub: NetworkStub = None):
+        self.browser = browser
+        self.context_args = context_args
+        self.url = url
+        self.size = size
+        self.network_stub = network_stub
+        self.idle: List[Tuple[BrowserContext, Page]] = []
+    
+    def load(self, page: Page):
+        """Navigate to the registration page and snapshot its initial DOM"""
+        page.goto(self.url)
+        expect(page.locator('#registrationForm')).to_be_visible()
+        page.evaluate(SNAPSHOT_PAGE_JS)
+    
+    def acquire(self) -> Tuple[BrowserContext, Page]:
+        """Return a clean context and its page, showing the registration form"""
+        if self.idle:
+            context, page = self.idle.pop()
+            context.clear_cookies()
+            if page.url != self.url or not page.evaluate(RESTORE_PAGE_JS):
+                self.load(page)
+            return context, page
+        
+        context = self.browser.new_context(**self.context_args)
+        if self.network_stub is not None:
+            self.network_stub.install(context)
+        page = context.new_page()
+        self.load(page)
+        return context, page
+    
+    def release(self, context: BrowserContext, page: Page, reuse: bool):
+        """Return a context to the pool, or close it"""
+        if reuse and not page.is_closed() and len(self.idle) < self.size:
+            self.idle.append((context, page))
+        else:
+            context.close()
+    
+    def close(self):
+        for context, _ in self.idle:
+            context.close()
+        self.idle.clear()
+
+@pytest.fixture(scope="session")
+def ui_network_stub(api_base_url):
+    """Per-worker network stub, reset for every offline test"""
+    return NetworkStub(api_base_url)
+
+@pytest.fixture(scope="function")
+def network_stub(request, offline):
+    """Network stub for tests marked offline, None for tests using the server"""
+    if not offline:
+        return None
+    stub = request.getfixturevalue("ui_network_stub")
+    stub.reset()
+    return stub
+
+def create_context_pool(request, browser, browser_context_args, api_base_url, network_stub=None):
+    pool = ContextPool(browser, browser_context_args, f"{api_base_url.rstrip('/')}/index.html",
+                       size=request.config.getoption("--ui-context-pool"),
+                       network_stub=network_stub)
+    request.addfinalizer(pool.close)
+    return pool
+
+@pytest.fixture(scope="session")
+def ui_context_pool(request, browser: Browser, browser_context_args, api_base_url):
+    """Per-worker pool of warm browser contexts (--ui-contexts=recycle)"""
+    return create_context_pool(request, browser, browser_context_args, api_base_url)
+
+@pytest.fixture(scope="session")
+def ui_offline_context_pool(request, browser: Browser, browser_context_args, api_base_url,
+                            ui_network_stub):
+    """Warm contexts routed through the network stub, for offline tests"""
+    return create_context_pool(request, browser, browser_context_args, api_base_url,
+                               ui_network_stub)
+
+@pytest.fixture(scope="function")
+def ui_page(request, network_stub):
+    """
+    Page for UI tests
+    
+    A fresh context per test by default (pytest-playwright's page); with
+    --ui-contexts=recycle, a reset page from the worker's context pool.
+    """
+    recorder = get_recorder(request.config)
+    if request.config.getoption("--ui-contexts") != "recycle":
+        page = request.getfixturevalue("page")
+        if recorder:
+            page.on("response", recorder.observe_page_response)
+        yield page
+        return
+    
+    pool = request.getfixturevalue("ui_offline_context_pool" if network_stub else "ui_context_pool")
+    context, page = pool.acquire()
+    if recorder:
+        page.on("response", recorder.observe_page_response)
+    yield page
+    if recorder:
+        page.remove_listener("response", recorder.observe_page_response)
+    
+    report = getattr(request.node, "rep_call", None)
+    pool.release(context, page, reuse=report is not None and report.passed)
 
 @pytest.fixture(scope="function")
-def registration_page(page: Page):
+def registration_page(request, ui_page: Page, api_base_url, network_stub):
     """Provide RegistrationPage instance"""
     from pages.registration_page import RegistrationPage
-    return RegistrationPage(page)
+    # Recycled pages already show the form, the first navigate() is free
+    loaded = request.config.getoption("--ui-contexts") == "recycle"
+    return RegistrationPage(ui_page, api_base_url, loaded=loaded, network_stub=network_stub)
 
 @pytest.fixture(autouse=True)
-def screenshot_on_failure(request, page: Page):
+def screenshot_on_failure(request, ui_page: Page):
     """Take screenshot on test failure"""
     yield
     
     if request.node.rep_call.failed:
-        screenshot = page.screenshot()
+        screenshot = ui_page.screenshot()
         if ALLURE_AVAILABLE:
             allure.attach(
                 screenshot,
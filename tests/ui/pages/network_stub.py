@@ -0,0 +1,115 @@
+"""
+Network stub for offline UI tests
+Playwright 라우팅으로 index.html 과 /api/register 를 서버 없이 응답
+"""
+import itertools
+import json
+import weakref
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from playwright.sync_api import BrowserContext, Route
+
+from validation_oracle import (
+    DUPLICATE_EMAIL, INVALID_EMAIL, SHORT_PASSWORD, WEAK_PASSWORD, RegistrationOracle, js_trim
+)
+
+INDEX_PATH = Path(__file__).resolve().parents[3] / "mock_server" / "public" / "index.html"
+
+# Default message of a queued error response per error code (answers
+# computed by the oracle carry the middleware's message for the exact rule)
+ERROR_MESSAGES = {expected.code: expected.message
+                  for expected in (INVALID_EMAIL, SHORT_PASSWORD, WEAK_PASSWORD, DUPLICATE_EMAIL)}
+
+_page_cache: Dict[Path, bytes] = {}
+
+def load_page(path: Path = INDEX_PATH) -> bytes:
+    """Read a static page once per process"""
+    if path not in _page_cache:
+        _page_cache[path] = path.read_bytes()
+    return _page_cache[path]
+
+class NetworkStub:
+    """
+    Serves the registration page from memory and answers /api/register
+
+    Responses follow the middleware rules (validation_oracle, including the
+    BUG_* flags) unless a response was queued with respond(). Registered
+    emails are remembered until reset(), so duplicate checks work too.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self.oracle = RegistrationOracle()
+        self.queued: List[Tuple[Optional[str], int, Dict[str, Any]]] = []
+        self.requests: List[Dict[str, Any]] = []
+        self.ids = itertools.count(1)
+        self._installed = weakref.WeakSet()
+
+    def install(self, context: BrowserContext):
+        """Route the page and the register endpoint of a context (once)"""
+        if context in self._installed:
+            return
+        # Later routes take precedence: everything else on the server is a 404
+        context.route(f"{self.base_url}/**", lambda route: route.fulfill(status=404, body=""))
+        context.route(f"{self.base_url}/index.html", self.serve_page)
+        context.route(f"{self.base_url}/api/register", self.serve_register)
+        self._installed.add(context)
+
+    def reset(self):
+        """Forget registrations, queued responses and captured requests"""
+        self.oracle.emails.clear()
+        self.queued.clear()
+        self.requests.clear()
+
+    def respond(self, status: int, code: str = None, error: str = None,
+                body: Dict[str, Any] = None, email: str = None):
+        """
+        Queue a response for the next register request
+
+        Args:
+            status: HTTP status to return
+            code: Error code (error message defaults to the middleware's)
+            error: Error message
+            body: Full response body (overrides code/error)
+            email: Only answer requests for this email
+        """
+        if body is None:
+            body = {"code": code, "error": error or ERROR_MESSAGES.get(code, "")} if code else {}
+        self.queued.append((email, status, body))
+
+    def serve_page(self, route: Route):
+        route.fulfill(status=200, content_type="text/html; charset=utf-8", body=load_page())
+
+    def serve_register(self, route: Route):
+        if route.request.method != "POST":
+            route.fulfill(status=404, body="")
+            return
+        try:
+            payload = route.request.post_data_json or {}
+        except ValueError:
+            payload = {}
+        self.requests.append(payload)
+        status, body = self.answer(payload)
+        route.fulfill(status=status, content_type="application/json; charset=utf-8",
+                      body=json.dumps(body, ensure_ascii=False))
+
+    def answer(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Response (status, body) for a register payload"""
+        email = payload.get("email")
+        for index, (queued_email, status, body) in enumerate(self.queued):
+            if queued_email is None or queued_email == email:
+                del self.queued[index]
+                return status, body
+
+        expected = self.oracle.classify(email, payload.get("password"), register=True)
+        if not expected.accepted:
+            # SERVER_ERROR has no code or message (the server's error handler answers)
+            return expected.status, {"error": expected.message or "Internal Server Error",
+                                     "code": expected.code}
+        return 200, {
+            "email": js_trim(email) if isinstance(email, str) else email,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "id": next(self.ids),
+        }
@@ -18,15 +18,19 @@ except ImportError:
 class RegistrationPage:
     """Page Object for the registration form"""
     
-    def __init__(self, page: Page):
+    def __init__(self, page: Page, base_url: str = None, loaded: bool = False,
+                 network_stub=None):
         self.page = page
+        # Page already shows a clean form (recycled context), skip one goto
+        self.loaded = loaded
+        # Serve the page and /api/register without a server (see network_stub.py)
+        self.network_stub = network_stub
+        if network_stub is not None:
+            network_stub.install(page.context)
         import os
-        # Docker 환경에서는 qa-server 사용
-        base_url = os.getenv("API_BASE_URL", "http://localhost:3000")
-        if "qa-server" in base_url:
-            self.url = "http://qa-server:3000/index.html"
-        else:
-            self.url = "http://localhost:3000/index.html"
+        # Docker 환경에서는 qa-server 사용, xdist 워커는 워커별 서버 사용
+        base_url = base_url or os.getenv("API_BASE_URL", "http://localhost:3000")
+        self.url = f"{base_url.rstrip('/')}/index.html"
         
         # Locators
         self.email_input = page.locator('[data-testid="email-input"]')
@@ -47,7 +51,10 @@ class RegistrationPage:
     @allure.step("Navigate to registration page")
     def navigate(self):
         """Navigate to the registration page"""
-        self.page.goto(self.url)
+        if self.loaded:
+            self.loaded = False
+        else:
+            self.page.goto(self.url)
         expect(self.registration_form).to_be_visible()
     
     @allure.step("Fill email: {email}")
@@ -2,7 +2,7 @@
 UI test scenarios for user registration
 """
 import pytest
-from playwright.sync_api import Page, expect
+from playwright.sync_api import expect
 import time
 
 # Allure를 옵셔널하게 import
@@ -68,6 +68,7 @@ class TestRegistrationUI:
     @allure.severity("high")
     @pytest.mark.ui
     @pytest.mark.negative
+    @pytest.mark.offline
     def test_ui_invalid_email_format_error(self, registration_page):
         """Test that invalid email format shows error"""
         registration_page.navigate()
@@ -95,6 +96,7 @@ class TestRegistrationUI:
     @allure.severity("high")
     @pytest.mark.ui
     @pytest.mark.negative
+    @pytest.mark.offline
     def test_ui_short_password_error(self, registration_page):
         """Test that short password shows error"""
         registration_page.navigate()
@@ -121,7 +123,8 @@ class TestRegistrationUI:
     @allure.severity("high")
     @pytest.mark.ui
     @pytest.mark.negative
-    def test_ui_duplicate_email_error(self, registration_page, page: Page):
+    @pytest.mark.offline
+    def test_ui_duplicate_email_error(self, registration_page):
         """Test that duplicate email shows error"""
         registration_page.navigate()
         
@@ -133,7 +136,7 @@ class TestRegistrationUI:
         registration_page.wait_for_success()
         
         # Navigate back to registration page
-        page.reload()
+        registration_page.page.reload()
         registration_page.navigate()
         
         # Try to register with same email
@@ -154,6 +157,7 @@ class TestRegistrationUI:
     @allure.severity("medium")
     @pytest.mark.ui
     @pytest.mark.negative
+    @pytest.mark.offline
     def test_ui_required_fields_validation(self, registration_page):
         """Test that required fields are validated"""
         registration_page.navigate()
@@ -183,6 +187,7 @@ class TestRegistrationUI:
     @allure.severity("low")
     @pytest.mark.ui
     @pytest.mark.positive
+    @pytest.mark.offline
     def test_ui_realtime_validation_feedback(self, registration_page):
         """Test real-time validation feedback"""
         registration_page.navigate()
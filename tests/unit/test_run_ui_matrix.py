@@ -0,0 +1,27 @@
+"""
+Cross-browser UI runner planning tests (no mock server or browser needed)
+"""
+import pytest
+from duration_history import DurationHistory
+import run_ui_matrix
+
+pytestmark = pytest.mark.unit
+
+
+def test_collect_returns_ui_nodeids():
+    """Collection is not affected by the -v in pytest.ini addopts"""
+    nodeids = run_ui_matrix.collect("chromium", [])
+    assert nodeids
+    assert all(nodeid.startswith("tests/ui/") and "::" in nodeid for nodeid in nodeids)
+
+
+def test_plan_shards_real_ui_suite(tmp_path):
+    """Every collected UI test lands in exactly one shard per browser"""
+    history = DurationHistory(tmp_path / "durations.json")
+    shards = run_ui_matrix.plan(["chromium", "firefox"], 2, [], history)
+    assert shards
+    for browser in ("chromium", "firefox"):
+        planned = [nodeid for shard in shards if shard.browser == browser for nodeid in shard.nodeids]
+        assert planned
+        assert sorted(planned) == sorted(run_ui_matrix.collect(browser, []))
+    assert all(shard.nodeids for shard in shards)
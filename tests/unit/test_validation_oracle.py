@@ -0,0 +1,153 @@
+"""
+Validation oracle vs. mock_server/middleware.js on non-string payloads
+and on rules that share an error code
+
+The middleware is run under node with a minimal request/response stand-in
+(no json-server needed); an accepted registration is stored the way the
+router would, so later payloads of a sequence see it as a duplicate.
+"""
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from validation_oracle import RegistrationOracle, js_number_string
+
+pytestmark = pytest.mark.unit
+
+MIDDLEWARE = Path(__file__).parents[2] / "mock_server" / "middleware.js"
+
+# Reads sequences of payloads on stdin, prints one [status, code, message] per payload
+HARNESS = """
+const middleware = require(process.argv[1]);
+const sequences = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const results = sequences.map(payloads => {
+  const state = { users: [] };
+  const db = { getState: () => state };
+  return payloads.map(payload => {
+    let result = null;
+    const req = { path: '/api/register', method: 'POST', body: payload, db, get: () => undefined };
+    const res = {
+      statusCode: 200,
+      status(code) { this.statusCode = code; return this; },
+      json(body) { result = [this.statusCode, body.code || null, body.error || null]; return this; },
+      set() { return this; },
+      send() { return this; },
+    };
+    try {
+      middleware(req, res, () => {
+        state.users = state.users.concat([req.body]);
+        result = [200, null, null];
+      });
+    } catch (error) {
+      result = [500, null, null];
+    }
+    return result;
+  });
+});
+console.log(JSON.stringify(results));
+"""
+
+VALID_EMAIL = "coerce@test.com"
+VALID_PASSWORD = "Test1234!"
+
+PAYLOADS = [
+    # Objects
+    {"email": VALID_EMAIL, "password": {}},
+    {"email": VALID_EMAIL, "password": {"length": 7}},
+    {"email": VALID_EMAIL, "password": {"length": None}},
+    {"email": VALID_EMAIL, "password": {"length": "200"}},
+    {"email": {}, "password": VALID_PASSWORD},
+    {"email": {"email": "a@b.co"}, "password": VALID_PASSWORD},
+    # Arrays
+    {"email": VALID_EMAIL, "password": ["Aa1!aaaa"]},
+    {"email": VALID_EMAIL, "password": ["Aa1!", "a", "a", "a", "a", "a", "a"]},
+    {"email": VALID_EMAIL, "password": ["Aa1!", "a", "a", "a", "a", "a", "a", "a"]},
+    {"email": VALID_EMAIL, "password": []},
+    {"email": ["a@b.co"], "password": VALID_PASSWORD},
+    {"email": [["a@b.co"]], "password": VALID_PASSWORD},
+    {"email": [None, "a@b.co"], "password": VALID_PASSWORD},
+    {"email": ["a@b.co", "'"], "password": VALID_PASSWORD},
+    {"email": ["a@b.co", "x'y"], "password": VALID_PASSWORD},
+    {"email": ["a@b", "co"], "password": VALID_PASSWORD},
+    {"email": [], "password": VALID_PASSWORD},
+    # Booleans
+    {"email": True, "password": VALID_PASSWORD},
+    {"email": False, "password": VALID_PASSWORD},
+    {"email": VALID_EMAIL, "password": True},
+    {"email": VALID_EMAIL, "password": False},
+    # Numbers
+    {"email": 0, "password": VALID_PASSWORD},
+    {"email": 1.5, "password": VALID_PASSWORD},
+    {"email": VALID_EMAIL, "password": 0},
+    {"email": VALID_EMAIL, "password": 12345678},
+    {"email": VALID_EMAIL, "password": 1e21},
+    # null and missing fields
+    {"email": None, "password": VALID_PASSWORD},
+    {"email": VALID_EMAIL, "password": None},
+    {"email": VALID_EMAIL},
+]
+
+
+def run_middleware(sequences):
+    result = subprocess.run(["node", "-e", HARNESS, str(MIDDLEWARE)], input=json.dumps(sequences),
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    # The middleware logs educational bug hits; the results are the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def oracle_results(oracle, payloads):
+    return [list(oracle.classify(payload.get("email"), payload.get("password"), register=True))
+            for payload in payloads]
+
+
+@pytest.fixture(scope="module")
+def node():
+    if shutil.which("node") is None:
+        pytest.skip("node is not installed")
+
+
+def test_oracle_matches_middleware_for_non_string_fields(node):
+    """Each payload on an empty database gets the same status, code and message"""
+    server = run_middleware([[payload] for payload in PAYLOADS])
+    for payload, [actual] in zip(PAYLOADS, server):
+        oracle = RegistrationOracle()
+        assert oracle_results(oracle, [payload]) == [actual], json.dumps(payload)
+
+
+def test_oracle_matches_middleware_duplicates_of_array_emails(node):
+    """An accepted array email is a duplicate of its String() form, and vice versa"""
+    sequence = [
+        {"email": ["a@b.co"], "password": VALID_PASSWORD},
+        {"email": "A@B.CO", "password": VALID_PASSWORD},
+        {"email": ["a@b.co"], "password": VALID_PASSWORD},
+        {"email": ["duplicate@test.com"], "password": VALID_PASSWORD},
+        {"email": "duplicate@test.com", "password": VALID_PASSWORD},
+        {"email": ["duplicate@test.com"], "password": VALID_PASSWORD},
+    ]
+    [server] = run_middleware([sequence])
+    assert oracle_results(RegistrationOracle(), sequence) == server
+
+
+def test_oracle_messages_match_middleware(node):
+    """Rules sharing INVALID_EMAIL / INVALID_PASSWORD answer with their own message"""
+    payloads = [
+        {"email": "not-an-email", "password": VALID_PASSWORD},
+        {"email": "a'b@test.com", "password": VALID_PASSWORD},
+        {"email": VALID_EMAIL, "password": "Aa1!"},
+        {"email": VALID_EMAIL, "password": "Aa1!" + "a" * 125},
+        {"email": VALID_EMAIL, "password": "aaaaaaaa"},
+    ]
+    server = run_middleware([[payload] for payload in payloads])
+    for payload, [actual] in zip(payloads, server):
+        assert oracle_results(RegistrationOracle(), [payload]) == [actual], json.dumps(payload)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (123, "123"), (123.0, "123"), (0.1, "0.1"), (1e21, "1e+21"), (1e17, "100000000000000000"),
+    (1e-7, "1e-7"), (0.000001, "0.000001"), (-2.5, "-2.5"), (2 ** 60, "1152921504606847000"),
+])
+def test_js_number_string(value, expected):
+    assert js_number_string(value) == expected
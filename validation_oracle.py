@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Registration validation oracle
+mock_server/middleware.js 의 /api/register 검증 규칙을 그대로 옮긴 Python 오라클
+
+Predicts the status, error code and error message the middleware returns
+for a payload, including the educational BUG_* flags (read from the same environment
+variables as the server). All patterns are compiled once at import time,
+so single payloads and large generated batches are classified without
+touching the server.
+
+JavaScript semantics are mirrored where they matter: String.prototype.trim
+and regex \\s use the JS whitespace set, \\d is ASCII only, and password
+length counts UTF-16 code units. Non-string fields (numbers, booleans,
+arrays, objects) follow JS truthiness, .length and String() coercion, so
+e.g. ["a@b.co"] is a valid email to the server.
+
+Usage:
+    python3 validation_oracle.py                      # classify tests/fixtures/test_data.json
+    python3 validation_oracle.py payloads.json        # list of {"email", "password"} objects
+    python3 validation_oracle.py --benchmark 1000000  # payloads per second
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+# Whitespace matched by JS \s and stripped by String.prototype.trim
+JS_WHITESPACE = ("\t\n\v\f\r \u00a0\u1680\u2000\u2001\u2002\u2003\u2004\u2005"
+                 "\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000\ufeff")
+_WS = re.escape(JS_WHITESPACE)
+
+# /^[^\s@]+@[^\s@]+\.[^\s@]+$/, used with fullmatch (JS $ does not match before a trailing "\n")
+EMAIL_PATTERN = re.compile(rf"[^{_WS}@]+@[^{_WS}@]+\.[^{_WS}@]+")
+# SQL injection, XSS and path traversal filters, checked in one search
+EMAIL_FILTER_PATTERN = re.compile(r"'|--|;|<|>|script|\.\./|\.\.\\")
+UPPER_PATTERN = re.compile(r"[A-Z]")
+LOWER_PATTERN = re.compile(r"[a-z]")
+DIGIT_PATTERN = re.compile(r"[0-9]")
+SPECIAL_PATTERN = re.compile(r"[@$!%*?&#]")
+
+PASSWORD_MIN_LENGTH = 8
+PASSWORD_MAX_LENGTH = 128
+
+# Inputs that trigger the educational bugs (see middleware.js)
+XSS_BUG_EMAIL = "<script>alert('XSS')</script>@test.com"
+NO_LOWERCASE_BUG_PASSWORD = "NOLOWERCASE123!"
+DUPLICATE_BUG_EMAIL = "duplicate@test.com"
+
+
+class Bugs(NamedTuple):
+    """Educational bug flags of the mock server"""
+    short_password: bool = True    # TC-008
+    no_lowercase: bool = True      # TC-010
+    xss_bypass: bool = True        # TC-020
+    duplicate_allow: bool = True   # TC-024
+
+    @classmethod
+    def from_env(cls, environ: Dict[str, str] = os.environ) -> "Bugs":
+        """Read the flags like the server does (enabled unless set to 'false')"""
+        return cls(*(environ.get(f"BUG_{name.upper()}") != "false" for name in cls._fields))
+
+
+NO_BUGS = Bugs(False, False, False, False)
+
+
+class Expectation(NamedTuple):
+    """Expected /api/register outcome"""
+    status: int
+    code: Optional[str] = None
+    # Error message of the middleware (several rules share a code)
+    message: Optional[str] = None
+
+    @property
+    def accepted(self) -> bool:
+        return self.status == 200
+
+
+ACCEPTED = Expectation(200)
+INVALID_EMAIL = Expectation(400, "INVALID_EMAIL", "잘못된 이메일 형식입니다.")
+UNSAFE_EMAIL = Expectation(400, "INVALID_EMAIL", "이메일에 허용되지 않는 문자가 포함되어 있습니다.")
+SHORT_PASSWORD = Expectation(400, "INVALID_PASSWORD", "비밀번호는 최소 8자 이상이어야 합니다.")
+LONG_PASSWORD = Expectation(400, "INVALID_PASSWORD", "비밀번호는 128자 이하여야 합니다.")
+WEAK_PASSWORD = Expectation(400, "WEAK_PASSWORD", "비밀번호는 대문자, 소문자, 숫자, 특수문자를 포함해야 합니다.")
+DUPLICATE_EMAIL = Expectation(400, "DUPLICATE_EMAIL", "이미 등록된 이메일입니다.")
+# crypto's hash.update() throws on an array password that passed every rule
+SERVER_ERROR = Expectation(500)
+
+# Substrings rejected by the security filters (element matches for arrays)
+EMAIL_FILTER_NEEDLES = ("'", "--", ";", "<", ">", "script", "../", "..\\")
+
+# A property that does not exist (JS undefined, unlike null)
+UNDEFINED = object()
+
+
+def js_trim(value: str) -> str:
+    """String.prototype.trim"""
+    return value.strip(JS_WHITESPACE)
+
+
+def js_length(value: str) -> int:
+    """String length in UTF-16 code units, like JS .length"""
+    if value.isascii():
+        return len(value)
+    return len(value.encode("utf-16-le")) // 2
+
+
+def js_truthy(value: Any) -> bool:
+    """JS ToBoolean of a parsed JSON value (arrays and objects are always truthy)"""
+    if value is UNDEFINED or value is None or isinstance(value, bool):
+        return value is True
+    if isinstance(value, (int, float)):
+        return value == value and value != 0
+    if isinstance(value, str):
+        return value != ""
+    return True
+
+
+def js_number_string(value: float) -> str:
+    """Number.prototype.toString of a JSON number"""
+    if isinstance(value, int) and abs(value) < 2 ** 53:
+        return str(value)
+    value = float(value)
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "Infinity" if value > 0 else "-Infinity"
+    if value == 0:
+        return "0"
+    # repr gives the shortest round-trip digits, like JS; only the layout differs
+    sign, digits, exponent = Decimal(repr(value)).normalize().as_tuple()
+    digits = "".join(map(str, digits))
+    point = exponent + len(digits)
+    if len(digits) <= point <= 21:
+        text = digits + "0" * (point - len(digits))
+    elif 0 < point <= 21:
+        text = f"{digits[:point]}.{digits[point:]}"
+    elif -6 < point <= 0:
+        text = f"0.{'0' * -point}{digits}"
+    else:
+        mantissa = digits[0] + (f".{digits[1:]}" if len(digits) > 1 else "")
+        text = f"{mantissa}e{'+' if point > 0 else '-'}{abs(point - 1)}"
+    return f"-{text}" if sign else text
+
+
+def js_string(value: Any) -> str:
+    """String(value) of a parsed JSON value"""
+    if isinstance(value, str):
+        return value
+    if value is UNDEFINED:
+        return "undefined"
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return js_number_string(value)
+    if isinstance(value, list):
+        # Array.prototype.join: null and undefined elements become ""
+        return ",".join("" if item is None else js_string(item) for item in value)
+    return "[object Object]"
+
+
+def js_to_number(value: Any) -> float:
+    """ToNumber, as used by < and > against a number"""
+    if value is UNDEFINED:
+        return float("nan")
+    if value is None:
+        return 0.0
+    if isinstance(value, (bool, int, float)):
+        return float(value)
+    if isinstance(value, list):
+        return js_to_number(js_string(value))
+    if not isinstance(value, str):
+        return float("nan")
+    text = js_trim(value)
+    if not text:
+        return 0.0
+    if re.fullmatch(r"0[xX][0-9a-fA-F]+|0[oO][0-7]+|0[bB][01]+", text):
+        return float(int(text, 0))
+    if re.fullmatch(r"[+-]?Infinity", text):
+        return float("-inf") if text.startswith("-") else float("inf")
+    if re.fullmatch(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?", text):
+        return float(text)
+    return float("nan")
+
+
+def js_length_of(value: Any) -> Any:
+    """value.length: UTF-16 length of strings, size of arrays, an object's "length" key"""
+    if isinstance(value, str):
+        return js_length(value)
+    if isinstance(value, list):
+        return len(value)
+    if isinstance(value, dict):
+        return value.get("length", UNDEFINED)
+    return UNDEFINED
+
+
+def js_includes(value: Any, needle: str) -> bool:
+    """String.prototype.includes, or Array.prototype.includes (strict element equality)"""
+    if isinstance(value, list):
+        return any(isinstance(item, str) and item == needle for item in value)
+    return needle in value
+
+
+class RegistrationOracle:
+    """Classifies registration payloads with the middleware's rule chain"""
+
+    def __init__(self, bugs: Bugs = None, existing_emails: Iterable[str] = ()):
+        """
+        Args:
+            bugs: Bug flags of the server to mirror (default: from environment)
+            existing_emails: Emails already registered (for the duplicate check)
+        """
+        self.bugs = Bugs.from_env() if bugs is None else bugs
+        self.emails: Set[str] = {email.lower() for email in existing_emails}
+
+    def check_email(self, email: Any) -> Optional[Expectation]:
+        """
+        Apply the email rules to an already trimmed email
+
+        Returns:
+            INVALID_EMAIL / UNSAFE_EMAIL, or None if the email passes
+        """
+        # The format regex tests String(email): only strings and arrays can pass
+        if not js_truthy(email) or not EMAIL_PATTERN.fullmatch(js_string(email)):
+            return INVALID_EMAIL
+        if self.bugs.xss_bypass and email == XSS_BUG_EMAIL:
+            return None
+        if isinstance(email, str):
+            filtered = EMAIL_FILTER_PATTERN.search(email)
+        else:
+            filtered = any(js_includes(email, needle) for needle in EMAIL_FILTER_NEEDLES)
+        if filtered:
+            return UNSAFE_EMAIL
+        return None
+
+    def check_password(self, password: Any) -> Optional[Expectation]:
+        """
+        Apply the length and complexity rules
+
+        Returns:
+            SHORT_PASSWORD / WEAK_PASSWORD / LONG_PASSWORD, or None if the
+            password passes
+        """
+        if not js_truthy(password):
+            return SHORT_PASSWORD
+        # undefined .length (numbers, booleans, most objects) compares false
+        length = js_length_of(password)
+        bug_length = (isinstance(length, (int, float)) and not isinstance(length, bool)
+                      and length == 7)
+        if js_to_number(length) < PASSWORD_MIN_LENGTH and not (self.bugs.short_password and bug_length):
+            return SHORT_PASSWORD
+        if not (self.bugs.no_lowercase and password == NO_LOWERCASE_BUG_PASSWORD):
+            text = js_string(password)
+            if not (UPPER_PATTERN.search(text) and LOWER_PATTERN.search(text)
+                    and DIGIT_PATTERN.search(text) and SPECIAL_PATTERN.search(text)):
+                return WEAK_PASSWORD
+        if js_to_number(length) > PASSWORD_MAX_LENGTH:
+            return LONG_PASSWORD
+        return None
+
+    def classify(self, email: Any, password: Any, register: bool = False) -> Expectation:
+        """
+        Predict the /api/register response for one payload
+
+        Args:
+            email: Email field as sent
+            password: Password field as sent
+            register: Remember accepted emails for later duplicate checks
+
+        Returns:
+            Expected status, error code and error message
+        """
+        if isinstance(email, str):
+            email = js_trim(email)
+        error = self.check_email(email) or self.check_password(password)
+        if error:
+            return error
+
+        key = js_string(email).lower()
+        if key in self.emails and not (self.bugs.duplicate_allow and email == DUPLICATE_BUG_EMAIL):
+            return DUPLICATE_EMAIL
+        if not isinstance(password, str):
+            return SERVER_ERROR
+        if register:
+            self.emails.add(key)
+        return ACCEPTED
+
+    def classify_batch(self, payloads: Iterable[Dict[str, Any]],
+                       register: bool = True) -> List[Expectation]:
+        """
+        Predict the responses for a sequence of payloads in one pass
+
+        Args:
+            payloads: Objects with "email" and "password" keys
+            register: Treat accepted payloads as registered, as if the batch
+                were sent in order (later duplicates are rejected)
+
+        Returns:
+            One expectation per payload
+        """
+        classify = self.classify
+        return [classify(payload.get("email"), payload.get("password"), register)
+                for payload in payloads]
+
+
+def password_checks(password: str) -> Dict[str, bool]:
+    """Per-rule password complexity results (no bug flags)"""
+    checks = {
+        "min_length": js_length(password) >= PASSWORD_MIN_LENGTH,
+        "has_lowercase": LOWER_PATTERN.search(password) is not None,
+        "has_uppercase": UPPER_PATTERN.search(password) is not None,
+        "has_digit": DIGIT_PATTERN.search(password) is not None,
+        "has_special": SPECIAL_PATTERN.search(password) is not None,
+    }
+    checks["is_valid"] = all(checks.values())
+    return checks
+
+
+def is_valid_email(email: str) -> bool:
+    """Email format and security filters (no bug flags)"""
+    return STRICT_ORACLE.check_email(js_trim(email)) is None
+
+
+STRICT_ORACLE = RegistrationOracle(NO_BUGS)
+
+
+def load_payloads(path: Path) -> List[Dict[str, Any]]:
+    """Load a payload list, or every case of a test_data.json style file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return [case for cases in data.values() for case in cases]
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Predict /api/register responses")
+    parser.add_argument("payloads", nargs="?", type=Path,
+                        default=Path(__file__).parent / "tests" / "fixtures" / "test_data.json",
+                        help="JSON list of payloads or a test_data.json style file")
+    parser.add_argument("--no-bugs", action="store_true",
+                        help="Classify as if all BUG_* flags were disabled")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="Classify N payloads (cycling the input) and report throughput")
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.payloads)
+    if not payloads:
+        sys.exit("No payloads")
+    oracle = RegistrationOracle(NO_BUGS if args.no_bugs else None)
+
+    if args.benchmark:
+        batch = [payloads[i % len(payloads)] for i in range(args.benchmark)]
+        started = time.perf_counter()
+        oracle.classify_batch(batch, register=False)
+        elapsed = time.perf_counter() - started
+        print(f"{args.benchmark} payloads in {elapsed:.2f}s "
+              f"({args.benchmark / elapsed:,.0f}/s, {args.benchmark * 60 / elapsed:,.0f}/min)")
+        return
+
+    # Each case is classified against an empty database, like one test
+    for payload, expected in zip(payloads, oracle.classify_batch(payloads, register=False)):
+        print(f"{expected.status} {expected.code or 'OK':<16} "
+              f"{json.dumps(payload.get('email'), ensure_ascii=False)} "
+              f"{json.dumps(payload.get('password'), ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()